@@ -61,6 +61,7 @@ BOLD_MAGENTA = '\033[1;35m'
 BOLD_CYAN = '\033[1;36m'
 
 ERASE_LINE = '\033[2K'
+CLEAR_SCREEN = '\033[2J\033[;H'
 
 
 
@@ -84,7 +85,7 @@ def getCursorTo(row, column):
 
 def doCls():
     ''' Clear the console window. '''
-    print('\033[2J\033[;H', end = '')
+    print(CLEAR_SCREEN, end = '')
 
 
 
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the Autosave class for the BBC Football Manager program.
+The autosave is a snapshot of the whole game and a journal of the weeks since the snapshot.
+Each week only the records that have changed are appended to the journal.
+So the cost of the autosave each week does not depend on the length of the career.
+'''
+
+# System libraries.
+import os
+import struct
+import zlib
+
+# Application Libraries.
+import save_format
+from player import Player
+
+
+
+class Autosave:
+    '''
+    :ivar Game game: The game to save.
+    :ivar string snapshotName: The file for the snapshot.
+    :ivar string journalName: The file for the journal.
+    :ivar int checksum: The CRC32 of the current snapshot or None when there is no snapshot for this game yet.
+    :ivar int season: The season of the current snapshot.
+    :ivar int numWeeks: The number of weeks in the journal since the snapshot.
+    :ivar dict records: The packed records from the last autosave by key.  Only the records that differ from these go into the journal.
+
+    Class to represent the autosave of the BBC Football Manager game.
+    The snapshot is the 'autosave' slot of the :py:class:`SaveSlots` in the format of :py:mod:`save_format`.
+    The journal starts with the CRC32 of the snapshot that it follows.
+    Each week is a frame of records with its length and CRC32.
+    A frame that was not completely written is ignored.
+    '''
+    SLOT_NAME = 'autosave'
+    SNAPSHOT_WEEKS = 10
+    JOURNAL_MAGIC = b'BBCFJ'
+    JOURNAL_HEADER = struct.Struct('<5sI')
+    FRAME = struct.Struct('<II')
+
+
+
+    def __init__(self, game):
+        ''' Class constructor. '''
+        self.game = game
+        self.snapshotName = game.saveSlots.getFileName(Autosave.SLOT_NAME)
+        self.journalName = os.path.splitext(self.snapshotName)[0] + '.journal'
+        self.reset()
+
+
+
+    def reset(self):
+        ''' Forget the current snapshot.  The next autosave writes a new snapshot. '''
+        self.checksum = None
+        self.season = None
+        self.numWeeks = 0
+        self.records = {}
+
+
+
+    def update(self):
+        '''
+        Autosave the game at the end of a week.
+        A new snapshot is written every SNAPSHOT_WEEKS weeks and at the start of each season.
+        Otherwise the changes are appended to the journal.
+        '''
+        if self.checksum == None or self.season != self.game.season or self.numWeeks >= Autosave.SNAPSHOT_WEEKS:
+            self.writeSnapshot()
+        else:
+            self.writeDelta()
+            self.game.saveSlots.setDetails(Autosave.SLOT_NAME, self.game.getSlotDetails())
+
+
+
+    def getRecords(self):
+        ''' Returns the packed records of the parts of the game that go into the journal when they change. '''
+        records = {}
+        for player in self.game.players:
+            writer = save_format.SaveWriter()
+            player.dump(writer)
+            records[('player', player.index)] = writer.getBody()
+        teams = list(self.game.teams)
+        if self.game.world != None:
+            for division in self.game.world.divisions.values():
+                teams += division.teams
+        for team in teams:
+            writer = save_format.SaveWriter()
+            team.dump(writer)
+            records[('team', team.name)] = writer.getBody()
+        writer = save_format.SaveWriter()
+        self.game.faCup.dump(writer)
+        self.game.leagueCup.dump(writer)
+        if self.game.europeanCup != None:
+            self.game.europeanCup.dump(writer)
+        records[('cups',)] = writer.getBody()
+        return records
+
+
+
+    def writeSnapshot(self):
+        ''' Write the whole game into the snapshot and start a new journal. '''
+        data = self.game.getSaveBytes()
+        self.game.saveSlots.write(Autosave.SLOT_NAME, data, self.game.getSlotDetails())
+        self.checksum = save_format.HEADER.unpack_from(data, 0)[2]
+        save_format.writeFile(self.journalName, Autosave.JOURNAL_HEADER.pack(Autosave.JOURNAL_MAGIC, self.checksum))
+        self.season = self.game.season
+        self.numWeeks = 0
+        self.records = self.getRecords()
+
+
+
+    def writeDelta(self):
+        '''
+        Append the changes since the last autosave to the journal.
+        The game record is always written.  The players and teams are only written when they have changed.
+        The cups are written together when any of them have changed.
+        '''
+        records = self.getRecords()
+        writer = save_format.SaveWriter()
+        writer.addObject(save_format.GAME, self.game)
+        for key, body in records.items():
+            if self.records.get(key) != body:
+                writer.addBody(body)
+        body = writer.getBody()
+        with open(self.journalName, 'ab') as outputFile:
+            outputFile.write(Autosave.FRAME.pack(len(body), zlib.crc32(body)) + body)
+        self.numWeeks += 1
+        self.records = records
+
+
+
+    def load(self):
+        '''
+        Load the snapshot and replay the journal.  Returns False if there is no autosave.
+        A new snapshot is written afterwards so that the journal never continues after a damaged frame.
+        '''
+        if not self.game.loadSaveFile(Autosave.SLOT_NAME):
+            return False
+        with open(self.snapshotName, 'rb') as inputFile:
+            snapshotChecksum = save_format.SaveFile(inputFile).checksum
+
+        journal = b''
+        if os.path.exists(self.journalName):
+            with open(self.journalName, 'rb') as inputFile:
+                journal = inputFile.read()
+        if journal[:Autosave.JOURNAL_HEADER.size] == Autosave.JOURNAL_HEADER.pack(Autosave.JOURNAL_MAGIC, snapshotChecksum):
+            offset = Autosave.JOURNAL_HEADER.size
+            while offset + Autosave.FRAME.size <= len(journal):
+                length, checksum = Autosave.FRAME.unpack_from(journal, offset)
+                body = journal[offset + Autosave.FRAME.size:offset + Autosave.FRAME.size + length]
+                if len(body) != length or zlib.crc32(body) != checksum:
+                    break
+                self.applyDelta(save_format.SaveReader(body))
+                offset += Autosave.FRAME.size + length
+            self.restoreTables()
+
+        self.writeSnapshot()
+        return True
+
+
+
+    def applyDelta(self, reader):
+        ''' Apply the records of one week of the journal to the game. '''
+        game = self.game
+        reader.readObject(save_format.GAME, game)
+        while reader.isNext(save_format.PLAYER):
+            player = Player()
+            player.load(reader)
+            game.players[player.index - 1] = player
+        while reader.isNext(save_format.TEAM):
+            values = reader.read(save_format.TEAM)
+            save_format.setFields(save_format.TEAM, game.teamTable.getTeam(values[0]), values)
+        if reader.isNext(save_format.CUP):
+            game.faCup.load(reader)
+            game.leagueCup.load(reader)
+            if game.europeanCup != None:
+                game.europeanCup.load(reader)
+
+
+
+    def restoreTables(self):
+        ''' Put the league tables back into the order of the positions from the journal. '''
+        game = self.game
+        game.teams.sort(key=lambda team: team.position)
+        game.sortDivision(True)
+        if game.world != None:
+            for division in game.world.divisions.values():
+                division.teams.sort(key=lambda team: team.position)
+                division.leagueTable.rebuild(division.teams)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the CareerHistory class for the BBC Football Manager program.
+The history has a record of each season that has finished.
+The seasons from the save file are in the history section of the file.
+That section is memory mapped and only decoded when the history is shown.
+'''
+
+# System libraries.
+import mmap
+
+# Application Libraries.
+import save_format
+from player import Player
+from cup_competition import CupResult, getRoundName
+
+
+
+class CupHistory:
+    '''
+    :ivar string name: The name of the cup.
+    :ivar bool isIn: True if the team was still in the cup at the end of the season.
+    :ivar int round: The round that the team reached.
+    :ivar int mask: The title bit of the cup.
+    :ivar int notMask: The mask to clear the title bits when out of the cup.
+    :ivar list results: The :py:class:`CupResult` objects of the team's matches.
+
+    Class to represent a cup competition in a season that has finished.
+    '''
+
+
+
+    def __init__(self, cup=None):
+        ''' Class constructor.  The values are copied from the optional :py:class:`CupCompetition`. '''
+        self.name = '' if cup == None else cup.name
+        self.isIn = True if cup == None else cup.isIn
+        self.round = 1 if cup == None else cup.round
+        self.mask = 0 if cup == None else cup.mask
+        self.notMask = 0 if cup == None else cup.notMask
+        self.results = [] if cup == None else list(cup.results)
+
+
+
+    def getRoundName(self):
+        ''' Returns the description of the round that the team reached. '''
+        return getRoundName(self.round)
+
+
+
+class SeasonHistory:
+    '''
+    :ivar int season: The number of the season.
+    :ivar int division: The division that the team played in.
+    :ivar string teamName: The name of the team.
+    :ivar int position: The final position in the division.
+    :ivar int pts: The final points.
+    :ivar int money: The money at the end of the season.
+    :ivar list weeks: The results and positions of each week.  The same as Game.weeks.
+    :ivar list cups: The :py:class:`CupHistory` objects.
+    :ivar list players: The :py:class:`Player` objects at the end of the season.
+
+    Class to represent a season that has finished.
+    '''
+
+
+
+    def __init__(self, game=None):
+        ''' Class constructor.  The values are copied from the optional game at the end of a season. '''
+        self.season = 0
+        self.division = 0
+        self.teamName = ''
+        self.position = 0
+        self.pts = 0
+        self.difference = 0
+        for name in ('homeWins', 'homeDraws', 'homeLoses', 'homeFor', 'homeAgainst', 'awayWins', 'awayDraws', 'awayLoses', 'awayFor', 'awayAgainst'):
+            setattr(self, name, 0 if game == None else getattr(game, name))
+        self.money = 0
+        self.debt = 0
+        self.weeks = []
+        self.cups = []
+        self.players = []
+        if game != None:
+            self.season = game.season
+            self.division = game.division
+            self.teamName = game.teamName
+            self.position = game.teamIndex + 1
+            self.pts = game.team.pts
+            self.difference = game.team.difference
+            self.money = game.money
+            self.debt = game.debt
+            self.weeks = list(game.weeks)
+            self.cups = [CupHistory(cup) for cup in (game.faCup, game.leagueCup, game.europeanCup) if cup != None]
+            self.players = list(game.players)
+
+
+
+    def dump(self, writer):
+        ''' Write the season into the specified :py:class:`SaveWriter`. '''
+        writer.addObject(save_format.SEASON, self)
+        for cup in self.cups:
+            writer.addObject(save_format.CUP, cup)
+            for result in cup.results:
+                result.dump(writer)
+        for player in self.players:
+            player.dump(writer)
+
+
+
+    def load(self, reader):
+        ''' Read the season from the specified :py:class:`SaveReader`. '''
+        reader.readObject(save_format.SEASON, self)
+        self.cups = []
+        while reader.isNext(save_format.CUP):
+            cup = CupHistory()
+            reader.readObject(save_format.CUP, cup)
+            while reader.isNext(save_format.CUP_RESULT):
+                result = CupResult('', True, '', 0, 0)
+                result.load(reader)
+                cup.results.append(result)
+            self.cups.append(cup)
+        self.players = []
+        while reader.isNext(save_format.PLAYER):
+            player = Player()
+            player.load(reader)
+            self.players.append(player)
+
+
+
+class CareerHistory:
+    '''
+    :ivar string fileName: The save file with the history section or None.
+    :ivar tuple section: The (offset, length, checksum) of the history section in the save file.
+    :ivar mmap.mmap map: The memory map of the save file while it is open.
+    :ivar bytes body: The records of the history section once they have been copied out of the save file.
+    :ivar list newSeasons: The records of the seasons that have finished since the game was loaded.
+    :ivar list seasons: The :py:class:`SeasonHistory` objects or None until they are asked for.
+
+    Class to represent the history of the career in the BBC Football Manager game.
+    '''
+
+
+
+    def __init__(self, fileName=None, section=None):
+        ''' Class constructor.  The save file is not opened until the history is needed. '''
+        self.fileName = fileName if section != None else None
+        self.section = section
+        self.map = None
+        self.body = b''
+        self.newSeasons = []
+        self.seasons = None
+
+
+
+    def addSeason(self, game):
+        ''' Add the season that has just finished in the specified game. '''
+        season = SeasonHistory(game)
+        writer = save_format.SaveWriter()
+        season.dump(writer)
+        body = writer.getBody()
+        self.newSeasons.append(body)
+        if self.seasons != None:
+            # Decode the records so the history does not share the players with the game.
+            season = SeasonHistory()
+            season.load(save_format.SaveReader(body))
+            self.seasons.append(season)
+
+
+
+    def getSavedBody(self):
+        ''' Returns the records of the history section of the save file.  The save file is memory mapped the first time. '''
+        if self.fileName == None:
+            return self.body
+        if self.map == None:
+            with open(self.fileName, 'rb') as inputFile:
+                self.map = mmap.mmap(inputFile.fileno(), 0, access=mmap.ACCESS_READ)
+        offset, length, checksum = self.section
+        return save_format.checkBody(self.map[offset:offset + length], length, checksum)
+
+
+
+    def getSeasons(self):
+        ''' Returns the list of :py:class:`SeasonHistory` objects.  The records are only decoded the first time. '''
+        if self.seasons == None:
+            self.seasons = []
+            for body in [self.getSavedBody()] + self.newSeasons:
+                reader = save_format.SaveReader(body)
+                while reader.isNext(save_format.SEASON):
+                    season = SeasonHistory()
+                    season.load(reader)
+                    self.seasons.append(season)
+        return self.seasons
+
+
+
+    def getBody(self):
+        '''
+        Returns the records of the whole history for a save file.
+        The records from the save file are copied without being decoded and the save file is closed.
+        So the save file can be replaced.
+        '''
+        self.body = self.getSavedBody()
+        self.close()
+        return self.body + b''.join(self.newSeasons)
+
+
+
+    def close(self):
+        ''' Close the memory map of the save file.  The history section must have been copied into self.body first. '''
+        if self.map != None:
+            self.map.close()
+            self.map = None
+        self.fileName = None
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the club catalog for the BBC Football Manager program.
+The prebuilt clubs from FNGETTEAM() in the BBC Basic version are held in tuples that are built once at import.
+Bigger leagues than the catalog are filled from pools with made up names.
+'''
+
+# System libraries.
+import functools
+
+# Application Libraries.
+import ansi
+
+
+
+# The (name, colour) of the prebuilt clubs.  Divisions 1 to 4 then the European clubs.
+CLUBS = (
+    # Division 1.
+    (
+        ('Liverpool', ansi.RED),
+        ('Man United', ansi.RED),
+        ('Leeds United', ansi.YELLOW),
+        ('Arsenal', ansi.RED),
+        ('Spurs', ansi.WHITE),
+        ('Aston Villa', ansi.MAGENTA),
+        ('Everton', ansi.LIGHT_BLUE),
+        ('Nottm Forest', ansi.RED),
+        ('Millwall', ansi.WHITE),
+        ('Coventry', ansi.CYAN),
+        ('West Ham', ansi.MAGENTA),
+        ('Norwich', ansi.YELLOW),
+        ('Sheff Wed', ansi.YELLOW),
+        ('Derby', ansi.WHITE),
+        ('Chelsea', ansi.LIGHT_BLUE),
+        ('Newcastle', ansi.WHITE),
+    ),
+    # Division 2.
+    (
+        ('Watford', ansi.YELLOW),
+        ('Stoke City', ansi.RED),
+        ('Brighton', ansi.LIGHT_BLUE),
+        ('Barnsley', ansi.RED),
+        ('Plymouth', ansi.LIGHT_BLUE),
+        ('Hull City', ansi.MAGENTA),
+        ('Notts Co', ansi.WHITE),
+        ('Man City', ansi.CYAN),
+        ('Shrewsbury', ansi.RED),
+        ('Burnley', ansi.MAGENTA),
+        ('Charlton', ansi.RED),
+        ('Sunderland', ansi.RED),
+        ('Bradford', ansi.RED),
+        ('Bury', ansi.LIGHT_BLUE),
+        ('Sheff United', ansi.RED),
+        ('Huddersfield', ansi.LIGHT_BLUE),
+    ),
+    # Division 3.
+    (
+        ('Wolves', ansi.YELLOW),
+        ('Oxford', ansi.RED),
+        ('Swindon', ansi.RED),
+        ('Walsall', ansi.RED),
+        ('Newport', ansi.GREEN),
+        ('Wigan', ansi.RED),
+        ('Wimbledon', ansi.RED),
+        ('Mansfield', ansi.GREEN),
+        ('Southend', ansi.RED),
+        ('Grimsby', ansi.GREEN),
+        ('Blackburn', ansi.MAGENTA),
+        ('Reading', ansi.RED),
+        ('Crewe', ansi.YELLOW),
+        ('Darlington', ansi.RED),
+        ('Port Value', ansi.LIGHT_BLUE),
+        ('Stockport', ansi.RED),
+    ),
+    # Division 4.
+    (
+        ('Scunthorpe', ansi.RED),
+        ('York', ansi.GREEN),
+        ('Bournemouth', ansi.LIGHT_BLUE),
+        ('Doncaster', ansi.CYAN),
+        ('Lincoln', ansi.MAGENTA),
+        ('Rochdale', ansi.RED),
+        ('Hereford', ansi.YELLOW),
+        ('Hartlepool', ansi.LIGHT_BLUE),
+        ('Halifax', ansi.RED),
+        ('Tranmere', ansi.RED),
+        ('Aldershot', ansi.YELLOW),
+        ('Bristol', ansi.LIGHT_BLUE),
+        ('Wrexham', ansi.RED),
+        ('Torquay', ansi.GREEN),
+        ('Gillingham', ansi.GREEN),
+        ('Exeter', ansi.RED),
+    ),
+    # European teams.
+    (
+        ('Glasgow Rangers', ansi.BLUE),
+        ('Glasgow Celtic', ansi.GREEN),
+        ('Juventus', ansi.WHITE),
+        ('AC Milan', ansi.RED),
+        ('Inter Milan', ansi.BLUE),
+        ('Roma', ansi.RED),
+        ('Real Madrid', ansi.WHITE),
+        ('Barcelona', ansi.BLUE),
+        ('Bayern Munich', ansi.RED),
+        ('Borussia Dortmund', ansi.RED),
+        ('Hamburg', ansi.RED),
+        ('Ajax', ansi.GREEN),
+        ('PSV Eindhoven', ansi.BLUE),
+        ('Paris SG', ansi.BLUE),
+        ('Monaco', ansi.RED),
+        ('Benfica', ansi.RED),
+    ),
+)
+
+# The number of clubs in each division of the catalog.
+NUM_CLUBS = 16
+
+# The number of the European division.  Any division above 4 is European.
+EUROPEAN_DIVISION = 5
+
+
+
+def getCatalogDivision(division, index):
+    '''
+    :param int division: The division to start in.
+    :param int index: The index of the club from 1.  Beyond 16 the index carries on into another division.
+    :returns: The division and the index in that division of the club.
+
+    This follows the recursion in the BBC Basic version without the recursion.
+    Division 1 carries on into 2, 2 into 3, 3 into 4, 4 back into 3 and Europe into 1.
+    '''
+    steps = (index - 1) // NUM_CLUBS
+    index = (index - 1) % NUM_CLUBS + 1
+    if division >= EUROPEAN_DIVISION:
+        if steps == 0:
+            return EUROPEAN_DIVISION, index
+        division = 1
+        steps -= 1
+    # At most two steps to reach division 3, then it swaps between 3 and 4.
+    while division < 3 and steps > 0:
+        division += 1
+        steps -= 1
+    if steps % 2 == 1:
+        division = 7 - division
+    return division, index
+
+
+
+def getClub(division, index):
+    '''
+    :param int division: The division of the club.  Above 4 is a European club.
+    :param int index: The index of the club from 1.
+    :returns: The (name, colour) of the club or None if the index is less than 1.
+
+    Replacement for FNGETTEAM() in the BBC Basic version.
+    '''
+    if division < 1:
+        # Don't really expect this.
+        return (f'D{division}T{index}', ansi.WHITE)
+    if index < 1:
+        return None
+    division, index = getCatalogDivision(division, index)
+    return CLUBS[division - 1][index - 1]
+
+
+
+@functools.lru_cache(maxsize=None)
+def getClubPool(division):
+    ''' Returns the tuple of the different clubs that :py:func:`getClub` gives for the division in index order. '''
+    pool = []
+    names = set()
+    for index in range(1, 4 * NUM_CLUBS + 1):
+        club = getClub(division, index)
+        if club[0] not in names:
+            names.add(club[0])
+            pool.append(club)
+    return tuple(pool)
+
+
+
+def getPoolClub(division, index):
+    '''
+    :param int division: The division of the club.
+    :param int index: The index of the club from 1.
+    :returns: The (name, colour) of the club.
+
+    The pool is the different prebuilt clubs for the division followed by as many made up clubs as needed.
+    This is for leagues that are bigger than the catalog.
+    '''
+    pool = getClubPool(division)
+    if index <= len(pool):
+        return pool[index - 1]
+    return (f'D{division}T{index}', ansi.WHITE)
+
+
+
+def getUniqueClub(division, index, existingNames):
+    '''
+    :param int division: The division to take the club from.
+    :param int index: The first index to try in :py:func:`getPoolClub`.
+    :param set existingNames: The names that are already used.
+    :returns: The (index, name, colour) of the first club in the division's pool from index onward that is not already used.
+    '''
+    while True:
+        name, colour = getPoolClub(division, index)
+        if name not in existingNames:
+            return index, name, colour
+        index += 1
+
+
+
+@functools.lru_cache(maxsize=None)
+def getTeamOptions():
+    ''' Returns the html options for the clubs in divisions 1 to 3 for the team selection page.  This is rendered once. '''
+    html = ''
+    for division in range(1, 4):
+        for index in range(1, NUM_CLUBS):
+            name, _colour = getClub(division, index)
+            html += '<option value="{}">{}</option>'.format(100 * division + index, name)
+    return html
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the ConsoleFrame class for the BBC Football Manager program.
+The console output is collected into frames and each frame is written to the terminal in one go.
+A screen starts with :py:func:`ansi.doCls` and only the lines that are different from the previous screen are written.
+'''
+
+# System libraries.
+import io
+import re
+import shutil
+
+# Application Libraries.
+import ansi
+
+
+
+# The ANSI colour codes.  These do not move the cursor.
+COLOUR_CODE = re.compile('\033\\[[0-9;]*m')
+
+
+
+def getColourState(text, state=''):
+    ''' Returns the colour codes that are in effect after the text when the specified colour codes were in effect before the text. '''
+    for code in COLOUR_CODE.findall(text):
+        if code in (ansi.RESET_ALL, '\033[0m', '\033[m'):
+            state = ''
+        else:
+            state += code
+    return state
+
+
+
+def getLineStates(lines, state=''):
+    '''
+    :param list lines: The lines of text with ANSI colour codes.
+    :param string state: The colour codes that are in effect before the first line.
+    :returns: The list of the colour codes that are in effect at the start of each line.
+
+    A line that is drawn on its own needs the colour codes from the lines before it.
+    '''
+    states = []
+    for line in lines:
+        states.append(state)
+        state = getColourState(line, state)
+    return states
+
+
+
+def getRegionUpdate(oldLines, newLines):
+    '''
+    :param list oldLines: The lines that are shown in the region.  The cursor is at the start of the line after the region.
+    :param list newLines: The lines to show in the region.
+    :returns: The text to update the region.  Only the lines that have changed are written.
+
+    The region is a block of lines at the bottom of the output, for example the score and the time during a match.
+    The cursor is left at the start of the line after the region.
+    '''
+    oldStates = getLineStates(oldLines)
+    newStates = getLineStates(newLines)
+    output = []
+    if len(oldLines) > 0:
+        output.append(ansi.getCursorUp(len(oldLines)))
+    output.append('\r')
+    moves = 0
+    for row in range(max(len(oldLines), len(newLines))):
+        if row < len(oldLines) and row < len(newLines) and oldStates[row] + oldLines[row] == newStates[row] + newLines[row]:
+            moves += 1
+            continue
+        if moves > 0:
+            output.append(ansi.getCursorDown(moves))
+            moves = 0
+        if row < len(newLines):
+            output.append(f'{ansi.RESET_ALL}{ansi.ERASE_LINE}{newStates[row]}{newLines[row]}{ansi.RESET_ALL}\n')
+        else:
+            output.append(f'{ansi.ERASE_LINE}\n')
+    if moves > 0:
+        output.append(ansi.getCursorDown(moves))
+    if len(oldLines) > len(newLines):
+        output.append(ansi.getCursorUp(len(oldLines) - len(newLines)))
+    return ''.join(output)
+
+
+
+class ConsoleFrame(io.TextIOBase):
+    '''
+    :ivar file stream: The terminal.
+    :ivar list pending: The text that has been written since the last frame.
+    :ivar list lines: The lines on the screen since the last clear screen or None when the screen is not known.
+    :ivar string screenState: The colour codes that were in effect at the start of the screen.
+    :ivar string state: The colour codes that are in effect at the end of the output.
+
+    Class to buffer the console output into frames.
+    This replaces sys.stdout so print() writes into the frame.
+    Each flush() is a frame and is written to the terminal with one write().
+    A frame that clears the screen is compared with the previous screen and only the lines that have changed are written.
+    The screen is not known after the cursor has been moved, after the screen has scrolled and after a prompt that does not end the line.
+    Then the next screen is written in full.
+    '''
+
+
+
+    def __init__(self, stream):
+        ''' Class constructor. '''
+        super().__init__()
+        self.stream = stream
+        self.pending = []
+        self.lines = None
+        self.screenState = ''
+        self.state = ''
+
+
+
+    @property
+    def encoding(self):
+        ''' The encoding of the terminal. '''
+        return self.stream.encoding
+
+
+
+    def isatty(self):
+        ''' Returns True because the frames are only used on a terminal. '''
+        return True
+
+
+
+    def fileno(self):
+        ''' Returns the file number of the terminal. '''
+        return self.stream.fileno()
+
+
+
+    def writable(self):
+        ''' Returns True because the frame can be written. '''
+        return True
+
+
+
+    def write(self, text):
+        ''' Add the text to the frame.  Nothing is written to the terminal until the frame is flushed. '''
+        self.pending.append(text)
+        return len(text)
+
+
+
+    def flush(self):
+        ''' Write the frame to the terminal. '''
+        text = ''.join(self.pending)
+        self.pending = []
+        if text != '':
+            index = text.rfind(ansi.CLEAR_SCREEN)
+            if index >= 0:
+                # The text before the last clear screen would never be seen.
+                screen = text[index + len(ansi.CLEAR_SCREEN):]
+                screenState = getColourState(text[:index], self.state)
+                lines = self.getLines(screen, [''])
+                if self.lines == None or lines == None:
+                    output = screenState + ansi.CLEAR_SCREEN + screen
+                else:
+                    output = self.getScreenUpdate(lines, screenState)
+                self.screenState = screenState
+            else:
+                output = text
+                lines = None if self.lines == None else self.getLines(text, self.lines)
+            self.stream.write(output)
+            self.state = getColourState(text, self.state)
+            # The user might type on the line after a prompt.
+            self.lines = lines if lines != None and lines[-1] == '' else None
+        self.stream.flush()
+
+
+
+    def getLines(self, text, lines):
+        '''
+        Returns the lines on the screen after the text is added to the end of the specified lines.
+        Returns None if the text moves the cursor or the lines do not fit on the screen.
+        '''
+        plainText = COLOUR_CODE.sub('', text)
+        if '\033' in plainText or '\r' in plainText or '\b' in plainText or '\t' in plainText:
+            return None
+        newLines = text.split('\n')
+        lines = lines[:-1] + [lines[-1] + newLines[0]] + newLines[1:]
+        columns, rows = shutil.get_terminal_size()
+        if len(lines) >= rows:
+            return None
+        for line in lines:
+            if len(COLOUR_CODE.sub('', line)) >= columns:
+                return None
+        return lines
+
+
+
+    def getScreenUpdate(self, lines, screenState):
+        '''
+        Returns the text to change the screen from self.lines to the specified lines.  Only the lines that have changed are written.
+        The screenState is the colour codes that are in effect at the start of the new screen.
+        '''
+        oldStates = getLineStates(self.lines, self.screenState)
+        newStates = getLineStates(lines, screenState)
+        output = []
+        for row in range(max(len(self.lines), len(lines))):
+            if row == len(lines) - 1:
+                continue
+            oldLine = oldStates[row] + self.lines[row] if row < len(self.lines) else None
+            newLine = newStates[row] + lines[row] if row < len(lines) else None
+            if oldLine != newLine:
+                output.append(f'{ansi.getCursorTo(row + 1, 1)}{ansi.RESET_ALL}{ansi.ERASE_LINE}{newLine or ""}')
+        # Always write the last line so that the cursor ends in the right place.
+        output.append(f'{ansi.getCursorTo(len(lines), 1)}{ansi.RESET_ALL}{ansi.ERASE_LINE}{newStates[-1]}{lines[-1]}')
+        return ''.join(output)
@@ -6,12 +6,12 @@ Module to implement the CupCompetition class for the the BBC Football Manager pr
 '''
 
 # System libraries.
-import random
 import json
 
 # Application Libraries.
 # import ansi
 from team import Team
+import save_format
 
 
 
@@ -27,7 +27,6 @@ class CupCompetition:
         self.mask = mask
         self.notMask = notMask
         self.newSeason()
-        random.seed()
 
 
 
@@ -36,6 +35,7 @@ class CupCompetition:
         self.isIn = True
         self.round = 1
         self.results = []
+        self.playedOpponents = set()
         if self.game.args.debug:
             self.round = 5
 
@@ -43,19 +43,7 @@ class CupCompetition:
 
     def getRoundName(self):
         ''' Return the string description of the round. '''
-        if self.round == 1:
-            return '1st Round'
-        if self.round == 2:
-            return '2nd Round'
-        if self.round == 3:
-            return 'Quarter Final'
-        if self.round == 4:
-            return 'Semi Final'
-        if self.round == 5:
-            return 'Final'
-        if self.round == 6:
-            return 'Winner'
-        return f'Error {self.round}'
+        return getRoundName(self.round)
 
 
 
@@ -64,50 +52,47 @@ class CupCompetition:
         Return the team to play against for the next match.
         Previously was only returning a team from the current league.
         This should be a weak team and keep the game easy to debug.
+        A team from outside the division is in the game's scratch table.
         '''
         if self.mask >= 32:
             # European team.
-            team = Team()
-            teamIndex = random.randint(1, 16)
+            team = Team(self.game.scratchTable)
+            teamIndex = self.game.rng.cup.randint(1, 16)
             team.getTeam(5, teamIndex)
             # Check not already played this team.
-            while self.isPlayedBefore(self.game.teams[teamIndex]):
-                teamIndex = random.randint(1, 16)
+            while self.isPlayedBefore(team):
+                teamIndex = self.game.rng.cup.randint(1, 16)
                 team.getTeam(5, teamIndex)
             # Return the team.
-            team.initialise(1)
+            team.initialise(1, self.game.rng.cup)
             return team
 
         if division == self.game.division:
             # Team in same division as team.
-            teamIndex = random.randint(0, len(self.game.teams) - 1)
+            teamIndex = self.game.rng.cup.randint(0, len(self.game.teams) - 1)
             # Check not already played this team.
             while teamIndex == self.game.teamIndex or self.isPlayedBefore(self.game.teams[teamIndex]):
-                teamIndex = random.randint(0, len(self.game.teams) - 1)
+                teamIndex = self.game.rng.cup.randint(0, len(self.game.teams) - 1)
             # Return the team.
             return self.game.teams[teamIndex]
 
         # Create a new team for the division.
-        team = Team()
-        teamIndex = random.randint(0, 15)
+        team = Team(self.game.scratchTable)
+        teamIndex = self.game.rng.cup.randint(0, 15)
         team.getTeam(division, teamIndex)
         # Check not already played this team.
-        while self.isPlayedBefore(self.game.teams[teamIndex]):
-            teamIndex = random.randint(0, 15)
+        while self.isPlayedBefore(team):
+            teamIndex = self.game.rng.cup.randint(0, 15)
             team.getTeam(division, teamIndex)
         # Return the team.
-        team.initialise(division)
+        team.initialise(division, self.game.rng.cup)
         return team
 
 
 
     def isPlayedBefore(self, team):
         ''' Returns true if played against this team already in the cup. '''
-        isResult = False
-        for result in self.results:
-            if result.opponent == team.name:
-                isResult = True
-        return isResult
+        return team.name in self.playedOpponents
 
 
 
@@ -115,6 +100,7 @@ class CupCompetition:
         ''' Add a match result to the cup. '''
         cupResult = CupResult(self.getRoundName(), isHomeMatch, opponent.name, homeGoals, awayGoals)
         self.results.append(cupResult)
+        self.playedOpponents.add(opponent.name)
         if isHomeMatch:
             if homeGoals > awayGoals:
                 self.round += 1
@@ -132,37 +118,45 @@ class CupCompetition:
 
 
 
-    def displayResults(self):
-        ''' Show the previous results in this cup. '''
+    def writeResults(self):
+        ''' Print the previous results in this cup. '''
+        for result in self.results:
+            result.writeRow(self.game.teamName)
+
+
+
+    def htmlResults(self):
+        ''' Returns the previous results in this cup as a html table. '''
         html = '<table>'
         for result in self.results:
-            html += result.display(self.game.teamName)
+            html += result.htmlRow(self.game.teamName)
         html += '</table>'
         return html
 
 
 
-    def dump(self, outputFile):
-        ''' Write the cup competition into the specified file. '''
-        json.dump(self.name, outputFile)
-        outputFile.write('\n')
-        json.dump(self.isIn, outputFile)
-        outputFile.write('\n')
-        json.dump(self.round, outputFile)
-        outputFile.write('\n')
-        json.dump(self.mask, outputFile)
-        outputFile.write('\n')
-        json.dump(self.notMask, outputFile)
-        outputFile.write('\n')
-        json.dump(len(self.results), outputFile)
-        outputFile.write('\n')
+    def dump(self, writer):
+        ''' Write the cup competition and its results into the specified :py:class:`SaveWriter`. '''
+        writer.addObject(save_format.CUP, self)
         for result in self.results:
-            result.dump(outputFile)
+            result.dump(writer)
+
+
+
+    def load(self, reader):
+        ''' Read the cup competition and its results from the specified :py:class:`SaveReader`. '''
+        reader.readObject(save_format.CUP, self)
+        self.results = []
+        while reader.isNext(save_format.CUP_RESULT):
+            cupResult = CupResult('', True, '', 0, 0)
+            cupResult.load(reader)
+            self.results.append(cupResult)
+        self.playedOpponents = {result.opponent for result in self.results}
 
 
 
-    def load(self, inputFile):
-        ''' Read the cup competition from the specified file. '''
+    def loadText(self, inputFile):
+        ''' Read the cup competition from the specified json lines file.  This is the format of the older save files. '''
         line = inputFile.readline()
         self.name = json.loads(line)
         line = inputFile.readline()
@@ -178,8 +172,27 @@ class CupCompetition:
         self.results = []
         for _dummy in range(0, numResults):
             cupResult = CupResult('', True, '', 0, 0)
-            cupResult.load(inputFile)
+            cupResult.loadText(inputFile)
             self.results.append(cupResult)
+        self.playedOpponents = {result.opponent for result in self.results}
+
+
+
+def getRoundName(round):
+    ''' Return the string description of the specified round. '''
+    if round == 1:
+        return '1st Round'
+    if round == 2:
+        return '2nd Round'
+    if round == 3:
+        return 'Quarter Final'
+    if round == 4:
+        return 'Semi Final'
+    if round == 5:
+        return 'Final'
+    if round == 6:
+        return 'Winner'
+    return f'Error {round}'
 
 
 
@@ -198,23 +211,20 @@ class CupResult:
 
 
 
-    def dump(self, outputFile):
-        ''' Write these cup settings to the specified output file. '''
-        json.dump(self.stage, outputFile)
-        outputFile.write('\n')
-        json.dump(self.isHomeMatch, outputFile)
-        outputFile.write('\n')
-        json.dump(self.opponent, outputFile)
-        outputFile.write('\n')
-        json.dump(self.homeGoals, outputFile)
-        outputFile.write('\n')
-        json.dump(self.awayGoals, outputFile)
-        outputFile.write('\n')
+    def dump(self, writer):
+        ''' Write the cup result into the specified :py:class:`SaveWriter`. '''
+        writer.addObject(save_format.CUP_RESULT, self)
+
+
+
+    def load(self, reader):
+        ''' Read the cup result from the specified :py:class:`SaveReader`. '''
+        reader.readObject(save_format.CUP_RESULT, self)
 
 
 
-    def load(self, inputFile):
-        ''' Load the cup settings from the specified input file. '''
+    def loadText(self, inputFile):
+        ''' Load the cup settings from the specified json lines file.  This is the format of the older save files. '''
         line = inputFile.readline()
         self.stage = json.loads(line)
         line = inputFile.readline()
@@ -228,13 +238,17 @@ class CupResult:
 
 
 
-    def display(self, teamName):
-        ''' Display this result. '''
-        html = '<tr>'
+    def writeRow(self, teamName):
+        ''' Display this result on a row. '''
         if self.isHomeMatch:
             print(f'{self.stage:>5} {teamName:>20}{self.homeGoals:>2} {self.awayGoals:<2}{self.opponent:<20}')
-            html += f'<td>{self.stage}</td><td>{teamName}</td><td>{self.homeGoals}</td><td>{self.awayGoals}</td><td>{self.opponent}</td></tr>'
         else:
             print(f'{self.stage:>5} {self.opponent:>20}{self.homeGoals:>2} {self.awayGoals:<2}{teamName:<20}')
-            html += f'<td>{self.stage}</td><td>{self.opponent}</td><td>{self.homeGoals}</td><td>{self.awayGoals}</td><td>{teamName}</td></tr>'
-        return html
+
+
+
+    def htmlRow(self, teamName):
+        ''' Display this result on a html table row. '''
+        if self.isHomeMatch:
+            return f'<tr><td>{self.stage}</td><td>{teamName}</td><td>{self.homeGoals}</td><td>{self.awayGoals}</td><td>{self.opponent}</td></tr>'
+        return f'<tr><td>{self.stage}</td><td>{self.opponent}</td><td>{self.homeGoals}</td><td>{self.awayGoals}</td><td>{teamName}</td></tr>'
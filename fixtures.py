@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the FixtureSchedule class for the the BBC Football Manager program.
+The whole season of league fixtures is decided at the start of the season.
+'''
+
+# System libraries.
+import random
+import json
+
+# Application Libraries.
+import save_format
+
+
+
+class FixtureSchedule:
+    '''
+    :ivar list rounds: The list of rounds.  Each round is a list of (home team name, away team name) pairs.
+    :ivar list opponents: For each round a dictionary of the (opponent name, is home) of each team by name.  This is kept up to date with the rounds.
+
+    Class to represent the league fixtures for a season in the BBC Football Manager game.
+    '''
+
+
+
+    def __init__(self, rounds=None):
+        ''' Class constructor. '''
+        self.setRounds([] if rounds is None else rounds)
+
+
+
+    def setRounds(self, rounds):
+        ''' Set the rounds of fixtures and index the opponent of each team in each round. '''
+        self.rounds = rounds
+        self.opponents = []
+        for fixtures in rounds:
+            opponents = {}
+            for home, away in fixtures:
+                opponents[home] = (away, True)
+                opponents[away] = (home, False)
+            self.opponents.append(opponents)
+
+
+
+    def create(self, names, fixedName=None, rng=random, numRounds=None):
+        '''
+        :param list names: The names of the teams in the division.  There must be an even number of teams.
+        :param string fixedName: Optional name of the team that plays home and away in alternate weeks starting at home.
+        :param random.Random rng: The random number generator to shuffle the teams.
+        :param int numRounds: Optional number of rounds.  Defaults to a double round robin.  Longer seasons repeat the fixtures.
+
+        Build a double round robin by the circle method.
+        One team is fixed and the others rotate around it.
+        The second half of the season is the first half with home and away swapped.
+        Every team has the same number of home matches.
+        '''
+        others = [name for name in names if name != fixedName]
+        rng.shuffle(others)
+        if fixedName is None:
+            fixedName = others.pop()
+        numRotating = len(others)
+
+        firstHalf = []
+        for index in range(numRotating):
+            # The fixed team is at home in the odd weeks.
+            if index & 1 == 0:
+                fixtures = [(fixedName, others[index])]
+            else:
+                fixtures = [(others[index], fixedName)]
+            for offset in range(1, (numRotating + 1) // 2):
+                first = others[(index + offset) % numRotating]
+                second = others[(index - offset) % numRotating]
+                if offset & 1 == 1:
+                    fixtures.append((first, second))
+                else:
+                    fixtures.append((second, first))
+            firstHalf.append(fixtures)
+
+        secondHalf = [[(away, home) for home, away in fixtures] for fixtures in firstHalf]
+        if numRounds == None:
+            numRounds = 2 * numRotating
+        rounds = []
+        while len(rounds) < numRounds:
+            rounds += firstHalf if (len(rounds) // numRotating) % 2 == 0 else secondHalf
+        del rounds[numRounds:]
+        self.setRounds(rounds)
+
+
+
+    def getRound(self, week):
+        ''' Returns the list of (home, away) names for the specified week.  The weeks start at 1. '''
+        return self.rounds[week - 1]
+
+
+
+    def getOpponent(self, name, week):
+        '''
+        :param string name: The name of the team.
+        :param int week: The week of the season starting at 1.
+        :returns: The name of the opponent and True if the named team is at home.
+        '''
+        return self.opponents[week - 1].get(name, (None, False))
+
+
+
+    def dump(self, writer):
+        '''
+        Write the fixtures into the specified :py:class:`SaveWriter`.
+        The names are written once and each fixture is a pair of indexes into the names.
+        '''
+        indexes = {}
+        for fixtures in self.rounds:
+            for home, away in fixtures:
+                indexes.setdefault(home, len(indexes))
+                indexes.setdefault(away, len(indexes))
+        rounds = [indexes[name] for fixtures in self.rounds for fixture in fixtures for name in fixture]
+        writer.add(save_format.FIXTURES, '\n'.join(indexes), rounds)
+
+
+
+    def load(self, reader):
+        ''' Load the fixtures from the specified :py:class:`SaveReader`. '''
+        names, rounds = reader.read(save_format.FIXTURES)
+        names = names.split('\n')
+        numPerRound = len(names) // 2
+        if numPerRound == 0:
+            self.setRounds([])
+            return
+        pairs = [(names[rounds[index]], names[rounds[index + 1]]) for index in range(0, len(rounds), 2)]
+        self.setRounds([pairs[index:index + numPerRound] for index in range(0, len(pairs), numPerRound)])
+
+
+
+    def loadText(self, inputFile):
+        ''' Load the fixtures from the specified json lines file.  Returns False if the file has no fixtures.  This is the format of the older save files. '''
+        line = inputFile.readline()
+        if line == '':
+            return False
+        self.setRounds([[tuple(fixture) for fixture in fixtures] for fixtures in json.loads(line)])
+        return True
@@ -17,15 +17,33 @@ import shutil
 import datetime
 import time
 import random
+import tempfile
 
 # Application Libraries.
 import ansi
 from game import Game
+from league_config import LeagueConfig
+from session_recording import SessionReplay
 
 
 
 def run(args):
     ''' Main entry point for the program. '''
+    # Replay the recorded sessions.  The saved games of each replay are in a temporary folder.
+    if args.replay != None:
+        for fileName in args.replay:
+            recording = SessionReplay(fileName)
+            with tempfile.TemporaryDirectory() as saves:
+                game = Game(recording.getArgs(args, saves))
+                game.runReplay(recording)
+        return
+
+    # Serve the games over http.
+    if args.serve > 0:
+        import http_frontend
+        http_frontend.run(args)
+        return
+
     # Default to graphical mode now.
     if args.text:
         args.graphical = False
@@ -38,14 +56,45 @@ def run(args):
 
 
 
-if __name__ == '__main__':
-    # Process the command line arguments.
-    # This might end the program (--help).
+def getNumTeams(text):
+    ''' Returns the number of teams from the --teams argument.  Raises an ArgumentTypeError if the league is not possible. '''
+    try:
+        numTeams = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'{text} is not a whole number.')
+    try:
+        LeagueConfig(numTeams)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+    return numTeams
+
+
+
+def getArgumentParser():
+    ''' Returns the parser for the command line arguments. '''
     argParse = argparse.ArgumentParser(prog='football_manager', description='Convertion of the BBC Basic Football Manager program.')
     argParse.add_argument('-d', '--debug', help='Run the program in debug mode.', action='store_true')
     argParse.add_argument('-g', '--graphical', help='Run the program in a graphical wx window.', action='store_true')
     argParse.add_argument('-t', '--text', help='Run the program at the command line.', action='store_true')
-    args = argParse.parse_args()
+    argParse.add_argument('-s', '--simulate', help='Play the specified number of seasons without a user.', type=int, default=0, metavar='SEASONS')
+    argParse.add_argument('--seed', help='The seed for the random numbers.  The game is reproducible with the same seed.', type=int, default=None)
+    argParse.add_argument('-w', '--world', help='Play all four divisions every week with promotion and relegation between them.', action='store_true')
+    argParse.add_argument('--teams', help='The number of teams in each division.  This must be even and more than the promoted and relegated teams.', type=getNumTeams, default=16)
+    argParse.add_argument('--odds', help='Show the projected odds for the end of the season on the progress page.', action='store_true')
+    argParse.add_argument('--saves', help='The folder for the saved games.', default='saves')
+    argParse.add_argument('-o', '--output', help='The file for the json lines from --simulate.', default='simulation.jsonl')
+    argParse.add_argument('--serve', help='Serve the games over http on the specified local port.', type=int, default=0, metavar='PORT')
+    argParse.add_argument('--record', help='Record the inputs and the seed of the session into the specified file.', default=None, metavar='FILE')
+    argParse.add_argument('--replay', help='Replay the recorded sessions at full speed without a user.', nargs='+', default=None, metavar='FILE')
+    argParse.add_argument('--idle', help='The seconds before an idle game from --serve is saved to disk.', type=float, default=300)
+    return argParse
+
+
+
+if __name__ == '__main__':
+    # Process the command line arguments.
+    # This might end the program (--help).
+    args = getArgumentParser().parse_args()
 
     # Welcome message.
     print('{}BBC Football Manager{} by Steve Walton.'.format(ansi.RED, ansi.RESET_ALL))
@@ -6,21 +6,43 @@ Module to implement the Game class for the the BBC Football Manager program.
 '''
 
 # System libraries.
-import random
-import math
 import json
 import time
 import sys
 from typing import Dict     # This is for type hinting only.
 import codecs
 import os
+import contextlib
+import io
 
 # Application Libraries.
 import ansi
 from inkey import InKey
 from team import Team
+from team_table import TeamTable
+import club_catalog
+import team_table
 from player import Player
+import player_catalog
 from cup_competition import CupCompetition
+from fixtures import FixtureSchedule
+from league_table import LeagueTable
+from world import World
+from league_config import LeagueConfig
+import match_engine
+import projection
+import html_builder
+import page_states
+from html_builder import PageBuilder
+from random_streams import RandomStreams
+import save_format
+from autosave import Autosave
+from save_slots import SaveSlots
+from career_history import CareerHistory
+from console_frame import ConsoleFrame
+import views
+from renderers import AnsiRenderer, HtmlRenderer, NullRenderer
+from session_recording import SessionRecorder, RecordingFinished
 
 
 
@@ -58,10 +80,86 @@ class Game:
         self.faCup = None
         self.leagueCup = None
         self.europeanCup = None
+        self.cupTeam = None
 
         self.status = 0
         self.subStatus = 0
-        self.html = 'Hello World'
+        self.page = PageBuilder('Hello World')
+
+        # The size in bytes of the last page rendered for each status.
+        self.pageWeights = {}
+
+        # The projection of the rest of the season for the progress page or None.
+        self.projection = None
+
+        # The time taken by each state of the wx window.
+        self.stateTrace = page_states.StateTrace()
+
+        # True to play without a user.  No keyboard, no delays and automatic choices.
+        self.isHeadless = False
+
+        # The recorder for the inputs of the user or None.
+        self.recorder = None
+
+        # The recording that is being replayed or None.  The inputs come from the recording instead of the user.
+        self.replay = None
+
+        # The renderer for the views.  The frontend replaces this.
+        self.renderer = AnsiRenderer()
+
+        # The random number generators.  Seasons are counted from 1.
+        self.rng = RandomStreams(self.args.seed)
+        self.season = 1
+
+        # The cached poisson distribution for the number of goals.
+        self.poissonSampler = match_engine.PoissonSampler()
+
+        # The size of the league and the length of the season.
+        self.league = LeagueConfig(self.args.teams, matchesPerSeason=4 if self.args.debug else None)
+
+        # The league fixtures for the season.
+        self.fixtures = FixtureSchedule()
+
+        # The values of the league teams in columns.
+        self.teamTable = TeamTable()
+
+        # The values of the teams that only last a while, the cup opponents from outside the division.
+        self.scratchTable = TeamTable()
+
+        # The league table for the division.
+        self.leagueTable = LeagueTable()
+
+        # All the divisions when playing in world mode.
+        self.world = World(self) if self.args.world else None
+        # The saved games.
+        self.saveSlots = SaveSlots(self.args.saves)
+        self.slotName = 'save'
+        self.autosave = Autosave(self)
+
+        # The seasons that have finished.
+        self.history = CareerHistory()
+
+
+
+    @property
+    def html(self):
+        ''' The :py:class:`PageBuilder` for the current page.  Use self.html += to add to the page. '''
+        return self.page
+
+
+
+    @html.setter
+    def html(self, value):
+        ''' Start a new page with the specified text.  Assigning the page builder back after += keeps the page. '''
+        if value is not self.page:
+            self.page = PageBuilder(value)
+
+
+
+    @property
+    def isFullSpeed(self):
+        ''' True to play without the delays for the user.  This is without a user or when replaying a recording. '''
+        return self.isHeadless or self.replay != None
 
 
 
@@ -72,32 +170,125 @@ class Game:
             print('Switch stdout to utf-8')
             sys.stdout.reconfigure(encoding='utf-8')
 
+        if self.args.simulate > 0:
+            self.runSimulation()
+            return
+
+        if self.args.record != None:
+            self.recorder = SessionRecorder(self.args.record, 'graphical' if self.args.graphical else 'console', self)
         if self.args.graphical:
             self.runGraphical()
         else:
             self.runConsole()
+        if self.recorder != None:
+            self.recorder.close()
 
 
 
     def runGraphical(self):
         ''' Execute the football manager game in a wx window. '''
         import main_window
+        self.renderer = HtmlRenderer(self)
         graphical = main_window.WxApp(self)
         graphical.runMainLoop()
 
 
 
+    def runSimulation(self):
+        '''
+        Execute the football manager game without a user for the number of seasons in args.simulate.
+        Write one json line per week into the args.output file.
+        '''
+        self.isHeadless = True
+        self.renderer = NullRenderer()
+        numSeasons = self.args.simulate
+        startTime = time.time()
+        with open(self.args.output, 'w', encoding='utf-8') as outputFile:
+            # The pages are not wanted.  The NullRenderer ignores them.
+            self.newGame()
+            self.newSeason()
+            for season in range(1, numSeasons + 1):
+                while self.numMatches < self.league.matchesPerSeason:
+                    self.playWeek()
+                    outputFile.write(json.dumps(self.getWeekSummary(season)))
+                    outputFile.write('\n')
+                self.endSeason()
+            seconds = time.time() - startTime
+            summary = {'seed': self.rng.seed, 'seasons': numSeasons, 'seconds': round(seconds, 3), 'seasonsPerSecond': round(numSeasons / seconds, 3), 'poisson': self.poissonSampler.getStatistics()}
+            outputFile.write(json.dumps(summary))
+            outputFile.write('\n')
+        print(f'Seed {self.rng.seed}.  Simulated {numSeasons} seasons in {seconds:.3f}s.  {numSeasons / seconds:.3f} seasons per second.')
+
+
+
+    def getWeekSummary(self, season):
+        ''' Returns a dictionary that describes the week that has just been played. '''
+        summary = {
+            'season': season,
+            'week': self.numMatches,
+            'team': self.teamName,
+            'division': self.division,
+            'position': self.teamIndex + 1,
+            'pts': self.team.pts,
+            'difference': self.team.difference,
+            'isHome': self.isHomeMatch,
+            'opponent': self.fixtures.getOpponent(self.teamName, self.numMatches)[0],
+            'homeScore': self.homeScore,
+            'awayScore': self.awayScore,
+            'money': self.money,
+            'debt': self.debt,
+            'numSquad': self.numSquad,
+            'numInjured': self.numInjured
+        }
+        if self.activeCup != None:
+            summary['cup'] = self.activeCup.name
+            summary['cupRound'] = self.activeCup.getRoundName()
+        return summary
+
+
+
+    def runReplay(self, recording):
+        '''
+        Replay the inputs of a :py:class:`SessionReplay` at full speed without the wx window or the terminal.
+        The pages are still rendered, so this measures the rendering and the state changes of a real session.
+        '''
+        self.replay = recording
+        startTime = time.time()
+        with open(os.devnull, 'w', encoding='utf-8') as nullFile:
+            # The output is not wanted.
+            with contextlib.redirect_stdout(nullFile):
+                try:
+                    if recording.frontend == 'graphical':
+                        self.renderer = HtmlRenderer(self)
+                        while True:
+                            self.getNextPage(recording.getInput('response'))
+                    else:
+                        self.runConsole()
+                except RecordingFinished:
+                    pass
+        seconds = max(time.time() - startTime, 1e-6)
+        print(f'{recording.fileName}: Replayed {recording.index} inputs in {seconds:.3f}s.  {recording.index / seconds:.1f} inputs per second.')
+        if recording.frontend == 'graphical':
+            for status, name, count, totalSeconds, averageSeconds in self.stateTrace.getSummary()[:5]:
+                print(f'{status:6} {name:22} {count:5} pages {totalSeconds:8.3f}s {averageSeconds * 1000:8.3f}ms')
+
+
+
     def runConsole(self):
         ''' Execute the football manager game in the console. '''
-        self.keyboard = InKey()
-        random.seed()
+        if self.replay == None:
+            self.keyboard = InKey()
+
+        # Write the output to the terminal in frames.
+        if sys.stdout.isatty():
+            sys.stdout = ConsoleFrame(sys.stdout)
 
         ansi.doCls()
         self.football()
 
         # Get the player settings.
         print()
-        self.playerName = input('Please enter your name: ')
+        self.playerName = self.enterText('Please enter your name: ')
         if self.playerName == '':
             self.playerName = 'Steve'
 
@@ -107,13 +298,16 @@ class Game:
         print(f'Level {self.level} was selected')
 
         # Load a game.
+        isLoaded = False
         print('Do you want to load a game?')
         if self.getYesNo():
             print('Yes')
-            self.load()
-            self.sortDivision()
+            slotName = self.selectSlot()
+            if slotName != None:
+                isLoaded = self.load(slotName)
         else:
             print('No')
+        if not isLoaded:
             self.newGame()
             self.newSeason()
 
@@ -121,7 +315,7 @@ class Game:
         nYear = 0
         while True:
             # Play a season.
-            while self.numMatches < self.MATCHES_PER_SEASON:
+            while self.numMatches < self.league.matchesPerSeason:
                 ansi.doCls()
                 print(f'{self.team.getColouredName()} MANAGER: {self.playerName}')
                 print(f'LEVEL: {self.level}')
@@ -148,9 +342,15 @@ class Game:
                 elif keyPress == '4':
                     # Continue.
                     self.playWeek()
+                    self.autosave.update()
                 elif keyPress == '5':
+                    name = self.enterText(f'Enter a name for the saved game [{self.slotName}]: ')
+                    if name != '':
+                        self.slotName = self.saveSlots.getSlotName(name)
                     self.save(True)
-                    time.sleep(5)
+                    sys.stdout.flush()
+                    if not self.isFullSpeed:
+                        time.sleep(5)
                 elif keyPress == '6':
                     # PROCRESTART
                     pass
@@ -173,9 +373,9 @@ class Game:
 
     def endSeason(self, isGraphical=False):
         ''' End the season and initialise for the next season. '''
-        ansi.doCls()
-        print('Season has finished.')
-        self.html = '<h1>Season has finished</h1>'
+        self.rng.setPosition(self.season, self.league.matchesPerSeason + 1)
+        self.history.addSeason(self)
+        self.renderer.render(views.Page('Season has finished'))
         self.displayLeague()
         if not isGraphical:
             self.wait()
@@ -183,31 +383,16 @@ class Game:
         europeanCup = 0
         self.titles = self.titles & ~7
         if self.teamIndex == 0:
-            print(f'{self.teamName} are division {self.division} champions')
-            self.html += f'<p>{self.teamName} are division {self.division} champions</p>'
+            self.renderer.render(views.Message(f'{self.teamName} are division {self.division} champions'))
             self.titles += self.division
             if self.division == 1:
                 europeanCup = 3
-        elif self.teamIndex <= 2 and self.division == 1:
+        elif self.teamIndex < self.league.numPromoted and self.division == 1:
             europeanCup = 1
 
-        if self.division == 1:
-            print('Qualify for Europe')
-            self.html += '<h2>Qualify for Europe</h2><p>'
-        else:
-            print('Promotion')
-            self.html += '<h2>Promotion</h2><p>'
-        for index in range(0, 3):
-            print(self.teams[index].getColouredName())
-            self.html += f'{self.teams[index].name}<br />'
-        self.html += '</p>'
+        self.renderer.render(views.TeamList('Qualify for Europe' if self.division == 1 else 'Promotion', self.teams[:self.league.numPromoted]))
         if self.division != 4:
-            print('Relegation')
-            self.html += '<h2>Relegation</h2><p>'
-            for index in range(13, 16):
-                print(self.teams[index].getColouredName())
-                self.html += f'{self.teams[index].name}<br />'
-            self.html += '</p>'
+            self.renderer.render(views.TeamList('Relegation', self.teams[self.league.getFirstRelegated():self.league.numTeams]))
 
         if self.titles & 8 == 8:
             if europeanCup == 0:
@@ -225,51 +410,49 @@ class Game:
                 europeanCup = 1
 
         if europeanCup == 3:
-            print(f'{self.teamName} qualify for the European Cup.')
-            self.html += f'{self.teamName} qualify for the European Cup.'
+            self.renderer.render(views.Message(f'{self.teamName} qualify for the European Cup.'))
             self.europeanCup = CupCompetition(self, 'European Cup', 32, ~(32|64|128))
         elif europeanCup == 2:
-            print(f'{self.teamName} qualify for the European Cup Winners Cup.')
-            self.html += f'{self.teamName} qualify for the European Cup Winners Cup.'
+            self.renderer.render(views.Message(f'{self.teamName} qualify for the European Cup Winners Cup.'))
             self.europeanCup = CupCompetition(self, 'European Cup Winners Cup', 64, ~(32|64|128))
         elif europeanCup == 1:
-            print(f'{self.teamName} qualify for the UEFA Cup.')
-            self.html += f'{self.teamName} qualify for the UEFA Cup.'
+            self.renderer.render(views.Message(f'{self.teamName} qualify for the UEFA Cup.'))
             self.europeanCup = CupCompetition(self, 'UEFA Cup', 128, ~(32|64|128))
         else:
             self.europeanCup = None
 
         # Rebuild the new league.
+        oldDivision = self.division
         exclued = []
-        if self.division != 1 and self.teamIndex <= 2:
+        if self.division != 1 and self.teamIndex < self.league.numPromoted:
             # Promotion.
             self.division -= 1
-            print(f'{self.teams[self.teamIndex].getColouredName()} are promoted to division {self.division}')
-            self.html += f'<p>{self.teams[self.teamIndex].name} are promoted to division {self.division}</p>'
-            for index in range(3, 13):
+            self.renderer.render(views.Message(f' are promoted to division {self.division}', self.teams[self.teamIndex]))
+            for index in range(self.league.numPromoted, self.league.getFirstRelegated()):
                 exclued.append(self.teams[index].name)
-                self.teams[index].name = ''
-        elif self.division != 4 and self.teamIndex >= 13:
+        elif self.division != 4 and self.teamIndex >= self.league.getFirstRelegated():
             # Relegation.
             self.division += 1
-            print(f'{self.teams[self.teamIndex].getColouredName()} are relegated to division {self.division}')
-            self.html += f'<p>{self.teams[self.teamIndex].name} are relegated to division {self.division}</p>'
-            for index in range(0, 13):
+            self.renderer.render(views.Message(f' are relegated to division {self.division}', self.teams[self.teamIndex]))
+            for index in range(0, self.league.getFirstRelegated()):
                 exclued.append(self.teams[index].name)
-                self.teams[index].name = ''
         else:
             # Same division.
-            print(f'{self.teams[self.teamIndex].getColouredName()} stay in division {self.division}')
-            self.html += f'<p>{self.teams[self.teamIndex].name} stay in division {self.division}</p>'
+            self.renderer.render(views.Message(f' stay in division {self.division}', self.teams[self.teamIndex]))
             if self.division != 1:
-                for index in range(0, 3):
+                for index in range(0, self.league.numPromoted):
                     exclued.append(self.teams[index].name)
-                    self.teams[index].name = ''
             if self.division != 4:
-                for index in range(13, 16):
+                for index in range(self.league.getFirstRelegated(), self.league.numTeams):
                     exclued.append(self.teams[index].name)
-                    self.teams[index].name = ''
-        self.setTeamsForDivision(exclued)
+        if self.world == None:
+            for team in self.teams:
+                if team.name in exclued:
+                    team.name = ''
+            self.setTeamsForDivision(exclued)
+        else:
+            # Promote and relegate the teams in every division.
+            self.world.endSeason(oldDivision)
 
         # Reskill the players.
         self.numTeam = 0
@@ -277,16 +460,17 @@ class Game:
         self.formation = [0, 0, 0]
         skillBonus = 1 if self.division <= 2 else 0
         for player in self.players:
-            player.skill = random.randint(1, 5) + skillBonus
-            player.energy = random.randint(1, 20)
+            player.skill = self.rng.team.randint(1, 5) + skillBonus
+            player.energy = self.rng.team.randint(1, 20)
             player.inTeam = False
             player.injured = False
             player.caps = 0
             player.goals = 0
         for index in range(4):
-            player = random.randint(0, 25)
+            player = self.rng.team.randint(0, 25)
             self.players[player].skill = 5 + skillBonus
 
+        self.season += 1
         self.newSeason()
 
         self.wait(isGraphical)
@@ -296,13 +480,17 @@ class Game:
     def newSeason(self):
         ''' This is called by endSeason() and before the first season. '''
         self.moneyStart = self.money - self.debt
-        self.moneyMessage = ''
+        self.moneyItems = []
 
         self.faCup = CupCompetition(self, 'FA Cup', 16, ~16)
         self.leagueCup = CupCompetition(self, 'League Cup', 8, ~8)
 
         self.numMatches = 0
         self.weeks = []
+        self.sortDivision(True)
+        self.createFixtures()
+        if self.world != None:
+            self.world.newSeason()
 
         self.homeWins = 0
         self.homeDraws = 0
@@ -315,6 +503,9 @@ class Game:
         self.awayFor = 0
         self.awayAgainst = 0
 
+        # The draws at the menu are the same after the game is saved and loaded.
+        self.rng.setPosition(self.season, self.numMatches, True)
+
 
 
     def decodeParameters(self, parameters: str) -> Dict[str, str]:
@@ -348,410 +539,49 @@ class Game:
             parameters = self.decodeParameters(response[1:])
         else:
             parameters = []
+        if self.recorder != None:
+            self.recorder.add('response', response)
+
+        # Apply the response with the handler of the current state.
+        fromStatus = self.status
+        startTime = time.perf_counter()
+        page_states.getState(self.status).onResponse(self, parameters, response)
+        responseTime = time.perf_counter() - startTime
+
+        # Render the next page with the handler of the new state.
+        startTime = time.perf_counter()
+        responseOptions = page_states.getState(self.status).render(self)
+        renderTime = time.perf_counter() - startTime
+        self.stateTrace.add(fromStatus, self.status, responseTime, renderTime)
+
+        # Join the page once and record the page weight.
+        self.pageWeights[self.status] = self.html.getByteSize()
+        return responseOptions
 
-        # Deal with the response.
-        if self.status == 0:
-            # Enter player details.
-            if response != '':
-                if 'name' in parameters:
-                    self.playerName = parameters['name']
-                    self.playerName = self.playerName.replace('+', ' ')
-                    if self.playerName == '':
-                        self.playerName = 'Steve'
-                    self.status = 1
-                self.level = 1
-                if 'level' in parameters:
-                    self.level = parameters['level']
-                if 'load' in parameters:
-                    if parameters['load'] == '2':
-                        if self.load():
-                            self.sortDivision()
-                            self.status = 100
-        elif self.status == 1:
-            # Select team.
-            if 'team' in parameters:
-                teamIndex = int(parameters['team'])
-                if teamIndex == 0:
-                    self.status = 2
-                else:
-                    team = Team()
-                    team.getTeam(teamIndex // 100, teamIndex % 100)
-                    self.teamName = team.name
-                    self.teamColour = team.colour
-                    self.status = 100
-                    self.newGame(True)
-                    self.newSeason()
-
-        elif self.status == 2:
-            # Enter own team name.
-            if 'name' in parameters:
-                self.teamName = parameters['name']
-                self.teamName = self.teamName.replace('+', ' ')
-                if self.teamName == '':
-                    self.teamName = 'Racing Warwick'
-                self.teamColour = ansi.CYAN
-                self.status = 100
-                self.newGame(True)
-                self.newSeason()
-
-        elif self.status == 100:
-            if 'response' in parameters:
-                response = int(parameters['response'])
-                # print(response)
-                if response == 1:
-                    # Sell Player
-                    self.status = 110
-                if response == 2:
-                    # Bank
-                    self.status = 120
-                elif response == 4:
-                    self.numMatches += 1
-
-                    # Decide if a cup match.
-                    if self.numMatches % 6 == 2:
-                        # League Cup.
-                        if self.leagueCup.isIn:
-                            self.activeCup = self.leagueCup
-                            self.status = 200
-                            self.subStatus = -1
-                    if self.numMatches % 6 == 4:
-                        # FA Cup.
-                        if self.faCup.isIn:
-                            self.activeCup = self.faCup
-                            self.status = 200
-                            self.subStatus = -1
-                    if self.numMatches % 6 == 0 or (self.numMatches % 6 == 3 and self.args.debug):
-                        # European Cup.
-                        if self.europeanCup != None:
-                            if self.europeanCup.isIn:
-                                self.activeCup = self.europeanCup
-                                self.status = 200
-                                self.subStatus = -1
-
-                    # League match.
-                    if self.status == 100:
-                        self.status = 300
-                        self.subStatus = -1
-                elif response == 5:
-                    # Save game.
-                    self.save(True)
-                    self.status = 150
-                elif response == 7:
-                    # Show League.
-                    self.status = 170
-        elif self.status == 110:
-            # Sell Player.
-            if 'player' in parameters:
-                player = int(parameters['player'])
-                self.subStatus = player
-                self.status = 115
-            if 'response' in parameters:
-                if parameters['response'] == 'c':
-                    self.status = 100
-        elif self.status == 115:
-            if 'response' in parameters:
-                if parameters['response'] == 'y':
-                    self.htmlSellPlayerPart3()
-                    self.status = 100
-                if parameters['response'] == 'n':
-                    self.status = 100
-        elif self.status == 120:
-            # Bank.
-            if 'amount' in parameters:
-                try:
-                    amountString = parameters['amount']
-                    amountString = amountString.replace('k', '000')
-                    amount = int(amountString)
-                except:
-                    amount = 0
-                if amount != 0:
-                    self.subStatus = amount
-                    self.status = 125
-            if 'sign' in parameters:
-                # print('sign = {}'.format(parameters['sign']))
-                if parameters['sign'] == '1':
-                    self.subStatus = -self.subStatus
-            if 'response' in parameters:
-                if parameters['response'] == 'c':
-                    self.status = 100
-        elif self.status == 125:
-            self.status = 100
-        elif self.status == 150:
-            self.status = 100
-        elif self.status == 170:
-            self.status = 100
-        elif self.status == 200:
-            # Cup Match.
-            if 'response' in parameters:
-                if parameters['response'] == 'c':
-                    self.status = 210
-                if parameters['response'] == 't':
-                    self.status = 220
-                    self.subStatus = 0
-        elif self.status == 210:
-            if 'player' in parameters:
-                playerIndex = int(parameters['player']) - 1
-                if self.players[playerIndex].inSquad:
-                    if self.players[playerIndex].inTeam:
-                        self.dropPlayer(playerIndex)
-                    else:
-                        self.addPlayer(playerIndex)
-            if 'response' in parameters:
-                if parameters['response'] == 'b':
-                    self.status = 200
-        elif self.status == 220:
-            if 'response' in parameters:
-                if parameters['response'] == 'c':
-                    self.status = 230
-        elif self.status == 230:
-            if 'response' in parameters:
-                if parameters['response'] == 'c':
-                    if self.homeScore == self.awayScore:
-                        # Replay
-                        self.status = 200
-                        self.subStatus = 0
-                    else:
-                        # Next step, league match.
-                        self.status = 300
-                        self.subStatus = -1
-        elif self.status == 300:
-            # League Match.
-            if 'response' in parameters:
-                if parameters['response'] == 'c':
-                    self.status = 310
-                if parameters['response'] == 't':
-                    self.status = 400
-                    self.subStatus = 0
-        elif self.status == 310:
-            if 'player' in parameters:
-                playerIndex = int(parameters['player']) - 1
-                if self.players[playerIndex].inSquad:
-                    if self.players[playerIndex].inTeam:
-                        self.dropPlayer(playerIndex)
-                    else:
-                        self.addPlayer(playerIndex)
-            if 'response' in parameters:
-                if parameters['response'] == 'b':
-                    self.status = 300
-        elif self.status == 400:
-            if 'response' in parameters:
-                if parameters['response'] == 'c':
-                    self.status = 410
-        elif self.status == 410:
-            if 'response' in parameters:
-                if parameters['response'] == 'c':
-                    self.status = 430
-        elif self.status == 430:
-            if 'response' in parameters:
-                if parameters['response'] == 'c':
-                    self.status = 440
-        elif self.status == 440:
-            # Player Market.
-            self.status = 450
-            if 'bid' in parameters:
-                try:
-                    bidAmount = parameters['bid']
-                    bidAmount = bidAmount.replace('k', '000')
-                    bid = int(bidAmount)
-                except:
-                    bid = 0
-                if bid > 0:
-                    self.status = 445
-                    self.subStatus2 = bid
-        elif self.status == 445:
-            self.status = 450
-        elif self.status == 450:
-            self.status = 460
-        elif self.status == 460:
-            self.status = 470
-        elif self.status == 470:
-            # Back to start of week or end of season.
-            if self.numMatches < self.MATCHES_PER_SEASON:
-                self.status = 100
-            else:
-                self.status = 1000
-        elif self.status == 1000:
-            self.status = 100
-
-
-        # Defaults.
-        responseOptions = ''
-
-        # Render the next page.
-        if self.status == 0:
-            # Initial page.  Get player name and level.
-            self.html = ''
-            self.football()
-            self.html += '<form action="app:" method="get"><p>Please enter your name <input type="text" name="name" /></p>'
-            self.html += '<p>Please select your level <select name="level"><option value="1">1</option><option value="2">2</option><option value="3">3</option><option value="4">4</option></select></p>'
-            self.html += '<p>Do you want to load a game <select name="load"><option value="1">No</option><option value="2">Yes</option></select></p>'
-            self.html += '<p><input type="submit" name="ok" value="OK" /></p>'
-            self.html += '</form>'
-        elif self.status == 1:
-            # Second initial page.  Get the players team.
-            self.html = '<form action="app:" method="get">'
-            self.html += '<p>Please select your team <select name="team">'
-            self.html += '<option value="0">Own Team</option>'
-            for division in range(1, 4):
-                for index in range(1, 16):
-                    team = Team()
-                    team.getTeam(division, index)
-                    self.html += '<option value="{}">{}</option>'.format(100 * division + index, team.name)
-            self.html += '</select>'
-            self.html += '<p><input type="submit" name="ok" value="OK" /></p>'
-            self.html += '</form>'
-        elif self.status == 2:
-            # Optional initialise, name own team.
-            self.html = '<form action="app:" method="get">'
-            self.html += '<p>Please enter your team name <input type="text" name="name"></p>'
-            self.html += '<p><input type="submit" name="ok" value="OK" /></p>'
-            self.html += '</form>'
-        elif self.status == 100:
-            self.html = '<h1 style="display: inline">{} </h1><p style="display: inline">Manager {}</p>'.format(self.teamName, self.playerName)
-            self.html += '<p>Level {}</p>'.format(self.level)
-            self.displayCupStatus()
-            self.displayTitles()
-            self.html += '<p style="margin-top:10px;"><a href="app:?response=1">1 .. Sell Players / View Squad</a><br />'
-            self.html += '<a href="app:?response=2">2 .. Bank</a><br />'
-            self.html += '<a href="app:?response=3">3 .. Rename Player</a><br />'
-            self.html += '<a href="app:?response=4">4 .. Continue</a><br />'
-            self.html += '<a href="app:?response=5">5 .. Save Game</a><br />'
-            self.html += '<a href="app:?response=6">6 .. Restart</a><br />'
-            self.html += '<a href="app:?response=7">7 .. League Table</a><br />'
-        elif self.status == 110:
-            self.htmlSellPlayerPart1()
-        elif self.status == 115:
-            self.htmlSellPlayerPart2()
-        elif self.status == 120:
-            self.htmlBankPart1()
-        elif self.status == 125:
-            self.htmlBankPart2()
-        elif self.status == 150:
-            self.html += '<p>Saving game.</p>'
-            responseOptions = 'delay: 2000'
-        elif self.status == 170:
-            self.html = ''
-            self.displayLeague()
-            self.wait(True)
-        elif self.status == 200:
-            # Cup Match.
-            self.playCupMatch()
-        elif self.status == 220:
-            if self.isHomeMatch:
-                responseOptions = self.htmlPlayMatch(self.teams[self.teamIndex], self.cupTeam)
-            else:
-                responseOptions = self.htmlPlayMatch(self.cupTeam, self.teams[self.teamIndex])
-        elif self.status == 230:
-            self.reportCupMatch()
-        elif self.status == 300:
-            # print('status = {}, subStatus = {}'.format(self.status, self.subStatus))
-            if self.subStatus == -1:
-                self.findLeagueOpponent()
-                self.subStatus = 0
-            # League Match.
-            self.html = '<h1>Division {}</h1>'.format(self.division)
-            if self.isHomeMatch:
-                self.displayMatch(True, self.teams[self.teamIndex], self.teams[self.opponentIndex])
-            else:
-                self.displayMatch(True, self.teams[self.opponentIndex], self.teams[self.teamIndex])
-        elif self.status == 210 or self.status == 310:
-            self.pickPlayers(True)
-        elif self.status == 400:
-            if self.isHomeMatch:
-                responseOptions = self.htmlPlayMatch(self.teams[self.teamIndex], self.teams[self.opponentIndex])
-            else:
-                responseOptions = self.htmlPlayMatch(self.teams[self.opponentIndex], self.teams[self.teamIndex])
-            # print('responseOptions {}'.format(responseOptions))
-        elif self.status == 410:
-            if self.isHomeMatch:
-                self.applyPoints(self.teams[self.teamIndex], self.teams[self.opponentIndex], self.homeScore, self.awayScore)
-            else:
-                self.applyPoints(self.teams[self.opponentIndex], self.teams[self.teamIndex], self.homeScore, self.awayScore)
 
-            # Calculate the gate money.
-            if self.isHomeMatch:
-                self.gateMoney = (9000 + (15 - self.teamIndex - self.opponentIndex) * 500) * (5 - self.division) + random.randint(0, 1000)
-                if abs(self.teams[self.teamIndex].pts - self.teams[self.opponentIndex].pts) < 4:
-                    self.gateMoney += (5 - self.division) * 3000
-            else:
-                self.gateMoney = 0
 
-            # Decided the fixtures for the league was at half time of the playmatch.
-            self.decideFixtures(self.opponentIndex)
+    def createFixtures(self):
+        ''' Decide the league fixtures for the whole season.  The player's team is at home in the odd weeks. '''
+        self.fixtures.create([team.name for team in self.teams], self.teamName, self.rng.getStream('fixtures', self.season), self.league.matchesPerSeason)
 
-            self.rest()
-            self.sortDivision()
 
-            # Store the data for progress.
-            if self.isHomeMatch:
-                week = 0
-                if self.homeScore == self.awayScore:
-                    self.homeDraws += 1
-                elif self.homeScore > self.awayScore:
-                    self.homeWins += 1
-                else:
-                    self.homeLoses += 1
-                self.homeFor += self.homeScore
-                self.homeAgainst += self.awayScore
-            else:
-                week = 256
-                if self.homeScore == self.awayScore:
-                    self.awayDraws += 1
-                elif self.awayScore > self.homeScore:
-                    self.awayWins += 1
-                else:
-                    self.awayLoses += 1
-                self.awayFor += self.awayScore
-                self.awayAgainst += self.homeScore
-            if self.homeScore == self.awayScore:
-                week |= 64
-            elif (self.isHomeMatch and self.homeScore > self.awayScore) or (not self.isHomeMatch and self.homeScore < self.awayScore):
-                week |= 128
-            week += self.teamIndex
-            self.weeks.append(week)
-            self.wait(True)
-        elif self.status == 430:
-            self.html = ''
-            self.displayLeague()
-            self.wait(True)
-        elif self.status == 440:
-            self.htmlMarketPart1()
-        elif self.status == 445:
-            self.htmlMarketPart2()
-        elif self.status == 450:
-            self.report()
-            self.wait(True)
-        elif self.status == 460:
-            self.progress()
-            self.wait(True)
-        elif self.status == 470:
-            self.playerCaps()
-            self.wait(True)
-        elif self.status == 1000:
-            self.endSeason(True)
-        else:
-            self.html = f'<p>Error Help.</p><p>status = {self.status}</p>'
 
-        return responseOptions
+    def getTeamIndex(self, name):
+        ''' Returns the index in the division of the team with the specified name. '''
+        return self.leagueTable.getIndex(name)
 
 
 
     def findLeagueOpponent(self):
-        ''' Find the opponent for the next league match. '''
-        print('findLeagueOpponent()')
+        ''' Find the opponent for the next league match from the fixtures. '''
         self.team.isPlayedHome = True
         self.team.isPlayedAway = True
-        while True:
-            self.opponentIndex = random.randint(0, 15)
-            self.isHomeMatch = (self.numMatches & 1) == 1
-            if self.isHomeMatch:
-                if self.teams[self.opponentIndex].isPlayedHome == False:
-                    self.teams[self.opponentIndex].isPlayedHome = True
-                    break
-            else:
-                if self.teams[self.opponentIndex].isPlayedAway == False:
-                    self.teams[self.opponentIndex].isPlayedAway = True
-                    break
+        opponentName, self.isHomeMatch = self.fixtures.getOpponent(self.teamName, self.numMatches)
+        self.opponentIndex = self.getTeamIndex(opponentName)
+        if self.isHomeMatch:
+            self.teams[self.opponentIndex].isPlayedHome = True
+        else:
+            self.teams[self.opponentIndex].isPlayedAway = True
         # Debugging only.
         #if self.isHomeMatch:
         #    print('Home match against {}'.format(self.teams[self.opponentIndex].name))
@@ -763,6 +593,7 @@ class Game:
     def playWeek(self):
         ''' This is the block of code that was after the menu in the week loop of the BBC Basic version. Line 740 onward.'''
         self.numMatches += 1
+        self.rng.setPosition(self.season, self.numMatches)
 
         # Decide and play any cup matches.
         self.activeCup = None
@@ -787,9 +618,10 @@ class Game:
                     self.subStatus = -1
 
         if self.activeCup != None:
+            if self.isHeadless:
+                self.autoPickPlayers()
             while True:
                 while True:
-                    ansi.doCls()
                     self.playCupMatch()
                     keyPress = self.getKeyboardCharacter(['c', '\t'])
                     if keyPress == '\t':
@@ -811,11 +643,12 @@ class Game:
 
         # Choose an opponent for the league match.
         self.findLeagueOpponent()
+        if self.isHeadless:
+            self.autoPickPlayers()
 
         # Let the player select the players for the team.
         while True:
-            ansi.doCls()
-            print('Division {}'.format(self.division))
+            self.renderer.render(views.Page('Division {}'.format(self.division)))
             if self.isHomeMatch:
                 self.displayMatch(True, self.teams[self.teamIndex], self.teams[self.opponentIndex])
             else:
@@ -826,25 +659,18 @@ class Game:
             # Pick the player.
             self.pickPlayers()
 
-        ansi.doCursorUp(2)
-        print(ansi.ERASE_LINE)
-        print(ansi.ERASE_LINE)
+        self.renderer.render(views.KickOff())
 
         # Play the match.
         if self.isHomeMatch:
-            playerGoals, opponentGoals = self.playMatch(self.teams[self.teamIndex], self.teams[self.opponentIndex], 0.5, 0)
+            playerGoals, opponentGoals = self.playMatch(self.teams[self.teamIndex], self.teams[self.opponentIndex], 0.5, 0, rng=self.getFixtureRandom(0))
             self.applyPoints(self.teams[self.teamIndex], self.teams[self.opponentIndex], playerGoals, opponentGoals)
         else:
-            opponentGoals, playerGoals = self.playMatch(self.teams[self.opponentIndex], self.teams[self.teamIndex], 0.5, 0)
+            opponentGoals, playerGoals = self.playMatch(self.teams[self.opponentIndex], self.teams[self.teamIndex], 0.5, 0, rng=self.getFixtureRandom(0))
             self.applyPoints(self.teams[self.opponentIndex], self.teams[self.teamIndex], opponentGoals, playerGoals)
 
         # Calculate the gate money.
-        if self.isHomeMatch:
-            self.gateMoney = (9000 + (15 - self.teamIndex - self.opponentIndex) * 500) * (5 - self.division) + random.randint(0, 1000)
-            if abs(self.teams[self.teamIndex].pts - self.teams[self.opponentIndex].pts) < 4:
-                self.gateMoney += (5 - self.division) * 3000
-        else:
-            self.gateMoney = 0
+        self.decideGateMoney()
 
         # PROCPLAYERS
         self.playerEngergy()
@@ -856,6 +682,7 @@ class Game:
 
         self.rest()
         self.sortDivision()
+        self.startProjection()
 
         # Store the data for progress.
         if self.isHomeMatch:
@@ -882,12 +709,13 @@ class Game:
             week |= 64
         elif playerGoals > opponentGoals:
             week |= 128
-        week += self.teamIndex
+        # The position only has 6 bits.
+        week += min(self.teamIndex, 63)
         self.weeks.append(week)
 
         self.wait()
 
-        ansi.doCls()
+        self.renderer.render(views.Page(None))
         self.displayLeague()
         self.wait()
 
@@ -896,14 +724,39 @@ class Game:
         self.wait()
         self.progress()
         self.wait()
-        ansi.doCls()
+        self.renderer.render(views.Page(None))
         self.playerCaps()
         self.wait()
 
+        # The draws at the menu are the same after the game is saved and loaded.
+        self.rng.setPosition(self.season, self.numMatches, True)
+
+
+
+    def decideGateMoney(self):
+        '''
+        Decide the gate money for the player's match.  There is only gate money for a home match.
+        The positions of the two teams move the gate by up to £7,000 either way.
+        This is scaled to the number of teams so the gate is never negative in a bigger league.
+        '''
+        if self.isHomeMatch:
+            numTeams = self.league.numTeams
+            self.gateMoney = (9000 + (numTeams - 1 - self.teamIndex - self.opponentIndex) * 7500 // (numTeams - 1)) * (5 - self.division) + self.rng.market.randint(0, 1000)
+            if abs(self.teams[self.teamIndex].pts - self.teams[self.opponentIndex].pts) < 4:
+                self.gateMoney += (5 - self.division) * 3000
+        else:
+            self.gateMoney = 0
+
+
 
+    def applyPoints(self, home, away, homeGoals, awayGoals, leagueTable=None):
+        '''
+        Apply the points to the league.
 
-    def applyPoints(self, home, away, homeGoals, awayGoals):
-        ''' Apply the points to the league. '''
+        :param LeagueTable leagueTable: Optional league table of the teams.  Defaults to the player's division.
+        '''
+        if leagueTable == None:
+            leagueTable = self.leagueTable
         home.numHomeGames += 1
         if homeGoals == awayGoals:
             home.pts += 1
@@ -921,6 +774,8 @@ class Game:
                 away.win += 1
             home.difference += homeGoals - awayGoals
             away.difference += awayGoals - homeGoals
+        leagueTable.setChanged(home)
+        leagueTable.setChanged(away)
 
 
 
@@ -930,13 +785,13 @@ class Game:
         for player in self.players:
             if player.inSquad:
                 if player.inTeam:
-                    player.energy -= random.randint(1, 2)
+                    player.energy -= self.rng.injury.randint(1, 2)
                     if player.energy < 1:
                         player.energy = 1
                     self.teams[self.teamIndex].energy += player.energy
                     player.caps += 1
                 else:
-                    player.energy += 5 + random.randint(0, 4)
+                    player.energy += 5 + self.rng.injury.randint(0, 4)
                     if player.energy > 20:
                         player.energy = 20
 
@@ -947,65 +802,50 @@ class Game:
         Replacement for PROCINJ (line 5100) in the BBC Basic version.
         This gives players an injury.
         '''
-        player = random.randint(0, 25)
+        player = self.rng.injury.randint(0, 25)
         if self.players[player].injured:
-            print('{}No injuries.{}'.format(ansi.GREEN, ansi.RESET_ALL))
-            self.html += 'No injuries.'
+            self.renderer.render(views.Injury(None))
             return
         self.dropPlayer(player)
         self.players[player].injured = True
         if self.players[player].inSquad:
-            print('{}{} has been injured.{}'.format(ansi.RED, self.players[player].name, ansi.RESET_ALL))
-            self.html += '{} has been injured.'.format(self.players[player].name)
+            self.renderer.render(views.Injury(self.players[player]))
             self.numInjured += 1
         else:
-            print('{}No injuries.{}'.format(ansi.GREEN, ansi.RESET_ALL))
-            self.html += 'No injuries.'
+            self.renderer.render(views.Injury(None))
 
 
 
     def playerFit(self):
-        ''' This was part of PROCPROGRESS in the BBC Basic version. '''
-        extraStyle = ' border-top: 3px solid purple; padding-top: 15px;'
+        '''
+        This was part of PROCPROGRESS in the BBC Basic version.
+        Returns the :py:class:`views.Fitness` of the injured players in the squad.
+        '''
+        rows = []
         count = 0
         numInjured = self.numInjured
         for player in self.players:
             if player.injured:
                 if player.inSquad:
                     count += 1
-                    if count == numInjured:
-                        extraStyle += ' border-bottom: 3px solid purple; padding-bottom: 15px;'
-                        # print('extraStyle = {}'.format(extraStyle))
-                if random.randint(1, 3) == 1:
+                if self.rng.injury.randint(1, 3) == 1:
                     player.injured = False
                     if player.inSquad:
-                        message = '{} is fit.'.format(player.name)
-                        print('{}┃{}{:>2}{} {:<35}{}┃{}'.format(ansi.MAGENTA, ansi.WHITE, count, ansi.GREEN, message, ansi.MAGENTA, ansi.RESET_ALL))
-                        self.html += '<tr><td style="text-align: right; border-left: 3px solid purple;{}";>{}</td><td colspan="4" style="color: green; border-right: 3px solid purple;{}";>{}</td></tr>'.format(extraStyle, count, extraStyle, message)
-                        extraStyle = ''
+                        rows.append((count, player.name, True))
                         self.numInjured -= 1
                         if self.numInjured < 0:
                             self.numInjured = 0
                 else:
                     if player.inSquad:
-                        message = '{} is injured.'.format(player.name)
-                        print('{}┃{}{:>2}{} {:<35}{}┃{}'.format(ansi.MAGENTA, ansi.WHITE, count, ansi.RED, message, ansi.MAGENTA, ansi.RESET_ALL))
-                        self.html += '<tr><td style="text-align: right; border-left: 3px solid purple;{}";>{}</td><td colspan="4" style="color: red; border-right: 3px solid purple;{}";>{}</td></tr>'.format(extraStyle, count, extraStyle, message)
-                        extraStyle = ''
-        print('{}┗━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┛{}'.format(ansi.MAGENTA, ansi.RESET_ALL))
+                        rows.append((count, player.name, False))
+        return views.Fitness(rows, numInjured)
 
 
 
     def displaySquad(self):
-        ''' Replacement for PROCPTEAM (line 2130) in the BBC Basic version. '''
-        print('   Player        Skill Energy')
-        self.html = '<table>'
-        self.html += '<tr><td colspan="2">Player</td><td>Skill</td><td>Energy</td>'
-        for player in self.players:
-            if player.inSquad:
-                player.writeRow()
-                self.html += player.htmlRow()
-        self.html += '</table>'
+        ''' Replacement for PROCPTEAM (line 2130) in the BBC Basic version.  Start a new page with the squad. '''
+        self.renderer.render(views.Page(None))
+        self.renderer.render(views.Squad([player for player in self.players if player.inSquad]))
 
 
 
@@ -1013,15 +853,11 @@ class Game:
         ''' Replacement for PROCPICK (line 2260) in the BBC Basic version. '''
         if isGraphical:
             self.displaySquad()
-            if self.numTeam <= 11:
-                self.html += '<p>{} Picked, {} Squad, {} Injured.</p>'.format(self.numTeam, self.numSquad, self.numInjured)
-                self.html += '<p><a href="app:?response=b">Back to Match</a></p>'
-            else:
-                self.html += '<p>Select Player to drop.</a>'
+            self.renderer.render(views.PickTeam(self.numTeam, self.numSquad, self.numInjured))
         else:
             while True:
-                ansi.doCls()
                 self.displaySquad()
+                self.renderer.render(views.PickTeam(self.numTeam, self.numSquad, self.numInjured))
                 if self.numTeam <= 11:
                     number = self.enterNumber('>')
                     if number == 0:
@@ -1040,6 +876,19 @@ class Game:
 
 
 
+    def autoPickPlayers(self):
+        ''' Pick the team without a user.  Fill the team with the most skillful fit players in the squad. '''
+        if self.numTeam >= 11:
+            return
+        candidates = [index for index, player in enumerate(self.players) if player.inSquad and not player.inTeam and not player.injured]
+        candidates.sort(key=lambda index: self.players[index].skill, reverse=True)
+        for index in candidates:
+            if self.numTeam >= 11:
+                break
+            self.addPlayer(index)
+
+
+
     def dropPlayer(self, index):
         ''' Replacement for PROCDROP (line 1630) in the BBC Basic version. '''
         player = self.players[index]
@@ -1082,44 +931,38 @@ class Game:
 
     def sellPlayer(self):
         ''' Replacement for PROCSELL (line 1950) in the BBC Basic version. '''
-        ansi.doCls()
         self.displaySquad()
-        print('Enter <RETURN> to return to menu.')
-        print('Else enter player number to be sold')
+        self.renderer.render(views.SellPlayer())
         playerNumber = self.enterNumber('>')
         if playerNumber >= 1 and playerNumber <= 26:
             playerNumber -= 1
             if self.players[playerNumber].inSquad:
-                price = int((self.players[playerNumber].skill + random.uniform(0, 1)) * 5000 * (5 - self.division))
-                print('You are offered £{:,.2f}'.format(price))
-                print('Do you accept (Y/N)?')
+                price = int((self.players[playerNumber].skill + self.rng.market.uniform(0, 1)) * 5000 * (5 - self.division))
+                self.renderer.render(views.Offer(self.players[playerNumber], price))
                 if self.getYesNo():
                     self.numSquad -= 1
                     self.dropPlayer(playerNumber)
                     self.players[playerNumber].inSquad = False
                     self.money += price
-                    self.moneyMessage += self.financialLine(self.players[playerNumber].name + ' sold', price, 0) + "\n"
+                    self.moneyItems.append((self.players[playerNumber].name + ' sold', price, 0))
             else:
-                print('On range')
+                self.renderer.render(views.Message('On range'))
             self.wait()
 
 
 
     def htmlSellPlayerPart1(self):
         self.displaySquad()
-        self.html += '<p><a href="app:?response=c">Click Here to return to main menu.</a></p>'
-        self.html += '<p>Otherwise click player to be sold.</p>'
+        self.renderer.render(views.SellPlayer())
 
 
 
     def htmlSellPlayerPart2(self):
         playerNumber = self.subStatus - 1
         if self.players[playerNumber].inSquad:
-            self.html += '<p>{}</p>'.format(self.players[playerNumber].name)
-            price = int((self.players[playerNumber].skill + random.uniform(0, 1)) * 5000 * (5 - self.division))
+            price = int((self.players[playerNumber].skill + self.rng.market.uniform(0, 1)) * 5000 * (5 - self.division))
             self.subStatus2 = price
-            self.html += '<p>You are offered £{:,.2f}</p>'.format(price)
-            self.html += 'Do you accept ( <a href="app:?response=y">Yes</a> / <a href="app?response=n">No</a> ) ?'
+            self.renderer.render(views.Offer(self.players[playerNumber], price))
 
 
 
@@ -1133,374 +976,211 @@ class Game:
         if self.players[playerNumber].injured:
             self.numInjured -= 1
         self.money += price
-        self.moneyMessage += self.financialLine(self.players[playerNumber].name + ' sold', price, 0) + "\n"
+        self.moneyItems.append((self.players[playerNumber].name + ' sold', price, 0))
 
 
 
     def market(self):
         ''' Replacement for PROCMARKET (line 3330) in the BBC Basic version. '''
         if self.numSquad >= 18:
-            # ansi.doCls()
-            print('{}F.A. rules state that one team may not have more that 18 players. You already have 18 players therefore you may not buy another.{}'.format(ansi.RED, ansi.RESET_ALL))
+            self.renderer.render(views.Market(None, 0, self.money))
         else:
             while True:
-                player = random.randint(0, 25)
+                player = self.rng.market.randint(0, 25)
                 if self.players[player].inSquad == False:
                     break
-            # ansi.doCls()
             # Skill Boost.  This made the game too easy.
-            if random.randint(1, 5) == 1:
-                self.players[player].skill = max(self.players[player].skill, random.randint(1, 5) + (1 if self.division <= 2 else 0))
-            print(self.players[player].getPosition())
-            self.players[player].writeRow(5000 * (5 - self.division))
-            print('You have £{:,.2f}'.format(self.money))
+            if self.rng.market.randint(1, 5) == 1:
+                self.players[player].skill = max(self.players[player].skill, self.rng.market.randint(1, 5) + (1 if self.division <= 2 else 0))
+            self.renderer.render(views.Market(self.players[player], 5000 * (5 - self.division), self.money))
             bid = self.enterNumber('Enter your bid: ')
             if bid <= 0:
                 return
-            price = self.players[player].skill * (5000 * (5 - self.division)) + random.randint(1, 10000) - 5000
-            if bid > self.money:
-                print('{}You do not have enough money{}'.format(ansi.RED, ansi.RESET_ALL))
-            elif bid > price:
-                print('{}{} is added to your squad.{}'.format(ansi.GREEN, self.players[player].name, ansi.RESET_ALL))
-                self.numSquad += 1
-                self.players[player].inSquad = True
-                self.money -= bid
-                self.moneyMessage += self.financialLine(self.players[player].name + ' bought', 0, bid) + "\n"
-                if self.players[player].injured:
-                    self.numInjured += 1
-            else:
-                if bid > 0:
-                    print('{}Your bid of £{:,.2f} is turned down.{}'.format(ansi.RED, bid, ansi.RESET_ALL))
+            self.bid(player, bid)
         self.wait()
 
 
 
     def htmlMarketPart1(self):
         if self.numSquad >= 18:
-            self.html = '<p>F.A. rules state that one team may not have more that 18 players. You already have 18 players therefore you may not buy another.</p>'
+            self.renderer.render(views.Market(None, 0, self.money))
             self.wait(True)
         else:
             while True:
-                player = random.randint(0, 25)
+                player = self.rng.market.randint(0, 25)
                 if self.players[player].inSquad == False:
                     break
             # Skill Boost.  This made the game too easy.
-            if random.randint(1, 5) == 1:
-                self.players[player].skill = max(self.players[player].skill, random.randint(1, 5) + (1 if self.division <= 2 else 0))
-            self.html = '<p>{}</p>'.format(self.players[player].getPosition())
-            self.html += '<table>'
-            self.html += self.players[player].htmlRow(5000 * (5 - self.division))
-            self.html += '</table>'
-            self.html += '<p>You have £{:,.2f}</p>'.format(self.money)
-            self.html += '<form action="app:" method="get">'
-            self.html += '<p>Enter your bid <input type="text" name="bid" /></p>'
-            self.html += '<p><input type="submit" name="button" value="Bid" /></p>'
-            self.html += '</form>'
-            # self.wait(True)
+            if self.rng.market.randint(1, 5) == 1:
+                self.players[player].skill = max(self.players[player].skill, self.rng.market.randint(1, 5) + (1 if self.division <= 2 else 0))
+            self.renderer.render(views.Market(self.players[player], 5000 * (5 - self.division), self.money))
             self.subStatus = player
 
 
 
     def htmlMarketPart2(self):
-        player = self.subStatus
-        bid = self.subStatus2
-        price = self.players[player].skill * (5000 * (5 - self.division)) + random.randint(1, 10000) - 5000
-        if bid > self.money:
-            self.html += '<p>You do not have enough money</p>'
-            print('You do not have enough money.')
-        elif bid > price:
-            self.html += '<p>{} is added to your squad.'.format(self.players[player].name)
-            print('{} is added to your squad.'.format(self.players[player].name))
+        self.bid(self.subStatus, self.subStatus2)
+        self.wait(True)
+
+
 
+    def bid(self, player, bid):
+        ''' Decide if the bid for the specified player in the market is accepted.  The player is added to the squad when the bid is accepted. '''
+        price = self.players[player].skill * (5000 * (5 - self.division)) + self.rng.market.randint(1, 10000) - 5000
+        isEnoughMoney = bid <= self.money
+        isAccepted = isEnoughMoney and bid > price
+        if isAccepted:
             self.numSquad += 1
             self.players[player].inSquad = True
             self.money -= bid
-            self.moneyMessage += self.financialLine(self.players[player].name + ' bought', 0, bid) + "\n"
+            self.moneyItems.append((self.players[player].name + ' bought', 0, bid))
             if self.players[player].injured:
                 self.numInjured += 1
-        else:
-            if bid > 0:
-                self.html += '<p>Your bid of £{:,.2f} is turned down.</p>'.format(bid)
-                print('Your bid is turned down.')
-            else:
-                print('No bid.')
-        self.wait(True)
+        self.renderer.render(views.Bid(self.players[player], bid, isEnoughMoney, isAccepted))
 
 
 
     def report(self):
         ''' Replacement for PROCREPORT ( line 3970 ) in the BBC Basic version. '''
-        self.html = '<h1>Financial Report</h1>'
-        self.html += '<table>'
+        items = []
         if self.gateMoney > 0:
-            print(self.financialLine('Gate Money', self.gateMoney, 0))
-            self.html += '<tr style="color: green;"><td>Gate Money</td><td style="text-align: right;">£{:,.0f}</td><tr>'.format(self.gateMoney)
+            items.append(('Gate Money', self.gateMoney, 0))
             self.money += self.gateMoney
-        print(self.financialLine('Paid to Squad', 0, self.numSquad * 500 * (5 - self.division)))
-        self.html += '<tr style="color: red;"><td>Paid to Squad</td><td style="text-align: right;">(£{:,.0f})</td><tr>'.format(self.numSquad * 500 * (5 - self.division))
+        items.append(('Paid to Squad', 0, self.numSquad * 500 * (5 - self.division)))
         self.money -= self.numSquad * 500 * (5 - self.division)
-        if self.moneyMessage != '':
-            print(self.moneyMessage, end = '')
-            messages = self.moneyMessage.split('\n')
-            for message in messages:
-                if len(message) >= 39:
-                    if message[:5] == ansi.GREEN:
-                        self.html += '<tr style="color: green">'
-                    else:
-                        self.html += '<tr style="color: red">'
-                    self.html += '<td>{}</td><td style="text-align: right;">{}</td></tr>'.format(message[5:30], message[34:45])
+        items += self.moneyItems
         if self.debt > 0:
             nInterest = int (self.debt * 0.005)
-            print(self.financialLine('Interest', 0, nInterest))
-            self.html += '<tr style="color: red;"><td>Interest</td><td style="text-align: right;">(£{:,.0f})</td><tr>'.format(nInterest)
+            items.append(('Interest', 0, nInterest))
             self.money = self.money - nInterest
-        print('━' * 40)
-        self.html += '<tr><td colspan="2"><hr /><td></tr>'
         if self.money - self.debt >= self.moneyStart:
-            print(self.financialLine('Profit', self.money - self.debt - self.moneyStart, 0))
-            self.html += '<tr style="color: green;"><td>Profit</td><td style="text-align: right;">£{:,.0f}</td><tr>'.format(self.money - self.debt - self.moneyStart)
+            balance = ('Profit', self.money - self.debt - self.moneyStart, 0)
         else:
-            print(self.financialLine('Loss', 0, self.moneyStart - self.money + self.debt))
-            self.html += '<tr style="color: red;"><td>Loss</td><td style="text-align: right;">(£{:,.0f})</td><tr>'.format(self.moneyStart - self.money + self.debt)
-        print('━' * 40)
-        self.html += '<tr><td colspan="2"><hr /><td></tr>'
+            balance = ('Loss', 0, self.moneyStart - self.money + self.debt)
 
         if self.money < 0:
             self.debt -= self.money
             self.money = 0
-        print(self.financialLine('Cash', self.money, 0))
-        print(self.financialLine('Debt', 0, self.debt))
-        self.html += '<tr style="color: green;"><td>Cash</td><td style="text-align: right;">£{:,.0f}</td><tr>'.format(self.money)
-        self.html += '<tr style="color: red;"><td>Debt</td><td style="text-align: right;">£{:,.0f}</td><tr>'.format(self.debt)
-        self.html += '</table>'
+        self.renderer.render(views.FinancialReport(items, balance, self.money, self.debt))
 
         # Reset the counters.
         self.moneyStart = self.money - self.debt
-        self.moneyMessage = ''
-
-
-
-    def financialLine(self, title, profit, loss):
-        ''' Build a line of financial information. '''
-        if profit - loss >= 0:
-            description = '£{:,.0f}'.format(profit - loss)
-            return '{}{:<25} {:>13} {}'.format(ansi.GREEN, title, description, ansi.RESET_ALL)
-        description = '(£{:,.0f})'.format(loss - profit)
-        return '{}{:<25}{:>15}{}'.format(ansi.RED, title, description, ansi.RESET_ALL)
+        self.moneyItems = []
 
 
 
     def bank(self):
         ''' Replacement for PROCLEND ( line 4170 ) in the BBC Basic version. '''
-        ansi.doCls()
-        print('Bank')
-        print('You have £{:,.2f}'.format(self.money))
-        if self.debt > 0:
-            print('You owe £{:,.2f}'.format(self.debt))
-        else:
-            print('In Bank £{:,.2f}'.format(-self.debt))
-        print('Do you want to Deposit, Withdraw or Exit (D/W/E)?')
+        self.renderer.render(views.Page('Bank'))
+        self.renderer.render(views.Balance(self.money, self.debt))
+        self.renderer.render(views.Transaction())
         keyPress = self.getKeyboardCharacter(['d', 'w', 'e'])
         if keyPress == 'e':
             return
         if keyPress == 'd':
-            print('Deposit')
+            self.renderer.render(views.Message('Deposit'))
         else:
-            print('Withdraw')
+            self.renderer.render(views.Message('Withdraw'))
         amount = self.enterNumber('Enter the amount >')
         if keyPress == 'd':
             amount = -amount
-        self.money += amount
-        self.debt += amount
-        MAX_DEBT = 2e6 # 1e6
-        if self.debt > MAX_DEBT:
-            print('You can not have that much')
-            self.money -= self.debt - MAX_DEBT
-            self.debt = MAX_DEBT
-        if self.money < 0:
-            self.debt -= self.money
-            self.money = 0
-        print('You have £{:,.2f}'.format(self.money))
-        if self.debt > 0:
-            print('You owe £{:,.2f}'.format(self.debt))
-        else:
-            print('In Bank £{:,.2f}'.format(-self.debt))
+        self.transact(amount)
         self.wait()
 
 
 
     def htmlBankPart1(self):
-        self.html = '<h1>Bank</h1>'
-        self.html += '<form action="app:" method="get">'
-        self.html += '<p>You have £{:,.2f}</p>'.format(self.money)
-        if self.debt > 0:
-            self.html += '<p>You owe £{:,.2f}</p>'.format(self.debt)
-        else:
-            self.html += '<p>In Bank £{:,.2f}</p>'.format(-self.debt)
-        self.html += '<p>Do you want to Deposit or Withdraw? <select name="sign"><option value="0">Withdraw</option><option value="1">Deposit</option></select></p>'
-        self.html += '<p>Enter the amount <input type="text" name="amount" /></p>'
-        self.html += '<p><input type="submit" name="transact" value="Transact" /></p>'
+        self.renderer.render(views.Page('Bank'))
+        self.renderer.render(views.Balance(self.money, self.debt))
+        self.renderer.render(views.Transaction())
         self.wait(True)
 
 
 
     def htmlBankPart2(self):
-        amount = self.subStatus
+        self.transact(self.subStatus)
+        self.wait(True)
+
+
+
+    def transact(self, amount):
+        ''' Take the specified amount from the bank.  A negative amount is paid into the bank. '''
         self.money += amount
         self.debt += amount
-        MAX_DEBT = 2e6 # 1e6
+        MAX_DEBT = 2000000 # 1e6
         if self.debt > MAX_DEBT:
-            self.html += '<p>You can not have that much.</p>'
+            self.renderer.render(views.Message('You can not have that much.'))
             self.money -= self.debt - MAX_DEBT
             self.debt = MAX_DEBT
         if self.money < 0:
             self.debt -= self.money
             self.money = 0
-        self.html += '<p>You have £{:,.2f}</p>'.format(self.money)
-        if self.debt > 0:
-            self.html += '<p>You owe £{:,.2f}</p>'.format(self.debt)
-        else:
-            self.html += '<p>In Bank £{:,.2f}</p>'.format(-self.debt)
-        self.wait(True)
+        self.renderer.render(views.Balance(self.money, self.debt))
 
 
 
     def playerCaps(self):
         ''' This was part of PROCPROGRESS (line 6190) in the BBC Basic version. '''
         playersByCaps = sorted(self.players, key=lambda Player: Player.caps, reverse=True)
-        print('{}┏━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┓{}'.format(ansi.MAGENTA, ansi.RESET_ALL))
-        print('{}┃{}   Player        Position  Caps Goals {}┃{}'.format(ansi.MAGENTA, ansi.RESET_ALL, ansi.MAGENTA, ansi.RESET_ALL))
-        self.html = '<h1>Player Appearances</h1>'
-        self.html += '<table>'
-        self.html += '<tr><td style="border-top: 3px solid purple; border-left: 3px solid purple;"></td><td style="border-top: 3px solid purple;">Player</td><td style="border-top: 3px solid purple;">Position</td><td style="border-top: 3px solid purple;">Apperances</td><td style="border-top: 3px solid purple; border-right: 3px solid purple;">Goals</td></tr>'
-        for index in range(11):
-            player = playersByCaps[index]
-            if index == 10:
-                extraStyle = ' border-bottom: 3px solid purple; padding-bottom: 15px;'
-            else:
-                extraStyle = ''
-            if player.injured:
-                playerColour = ansi.RED
-                htmlColour = ' color: red;'
-            elif player.inTeam:
-                playerColour = ansi.GREEN
-                htmlColour = ' color: green;'
-            else:
-                playerColour = ansi.RESET_ALL
-                htmlColour = ''
-            print('{}┃{}{:>2}{} {:<14}{:<9}{:>5}{:>6} {}┃{}'.format(ansi.MAGENTA, ansi.WHITE, index + 1, playerColour, player.name, player.getPosition(), player.caps, player.goals, ansi.MAGENTA, ansi.RESET_ALL))
-            self.html += '<tr><td style="text-align: right; border-left: 3px solid purple;{}">{}</td><td style="{}{}">{}</td><td style="{}{}">{}</td><td style="text-align: right;{}{}">{}</td><td style="text-align: right; border-right: 3px solid purple;{}{}">{}</td></tr>'.format(extraStyle, index + 1, extraStyle, htmlColour, player.name, extraStyle, htmlColour, player.getPosition(), extraStyle, htmlColour, player.caps, extraStyle, htmlColour, player.goals)
-
-        # Top Scorers.
         playersByGoals = sorted(self.players, key=lambda Player: Player.goals, reverse=True)
-        print('{}┣━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┫{}'.format(ansi.MAGENTA, ansi.RESET_ALL))
-        print('{}┃{}   Player        Position  Caps Goals {}┃{}'.format(ansi.MAGENTA, ansi.RESET_ALL, ansi.MAGENTA, ansi.RESET_ALL))
-        for index in range(5):
-            player = playersByGoals[index]
-            if index == 0:
-                extraStyle = ' border-top: 3px solid purple; padding-top: 15px;'
-            elif index == 4:
-                extraStyle = ' border-bottom: 3px solid purple; padding-bottom: 15px;'
-            else:
-                extraStyle = ''
-            if player.injured:
-                playerColour = ansi.RED
-                htmlColour = ' color: red;'
-            elif player.inTeam:
-                playerColour = ansi.GREEN
-                htmlColour = ' color: green;'
-            else:
-                playerColour = ansi.RESET_ALL
-                htmlColour = ''
-            if player.goals > 0:
-                print('{}┃{}{:>2}{} {:<14}{:<9}{:>5}{:>6} {}┃{}'.format(ansi.MAGENTA, ansi.WHITE, index + 1, playerColour, player.name, player.getPosition(), player.caps, player.goals, ansi.MAGENTA, ansi.RESET_ALL))
-                self.html += '<tr><td style="text-align: right; border-left: 3px solid purple;{}">{}</td><td style="{}{}">{}</td><td style="{}{}">{}</td><td style="text-align: right;{}{}">{}</td><td style="text-align: right; border-right: 3px solid purple;{}{}">{}</td></tr>'.format(extraStyle, index + 1, extraStyle, htmlColour, player.name, extraStyle, htmlColour, player.getPosition(), extraStyle, htmlColour, player.caps, extraStyle, htmlColour, player.goals)
-        print('{}┣━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┫{}'.format(ansi.MAGENTA, ansi.RESET_ALL))
-
-        self.playerFit()
-
-        self.html += '</table>'
+        self.renderer.render(views.Appearances(playersByCaps[:11], playersByGoals[:5]))
+        self.renderer.render(self.playerFit())
 
 
 
     def displayMatch(self, isLeague, homeTeam, awayTeam):
         ''' Replacement for PROCDISPLAY in the BBC Basic version. '''
-        print('   {}{:^18}{}{:^18}{}'.format(homeTeam.colour, homeTeam.name, awayTeam.colour, awayTeam.name, ansi.RESET_ALL))
-        if isLeague:
-            print('Pos{:^18}{:^18}'.format(homeTeam.position, awayTeam.position))
-        print('Eng{:^18}{:^18}'.format(homeTeam.energy // 10, awayTeam.energy // 10))
-        print('Mor{:^18}{:^18}'.format(homeTeam.moral, awayTeam.moral))
-        print('For{:^18}{:^18}'.format(homeTeam.formation, awayTeam.formation))
-        print('Def{:^18}{:^18}'.format(homeTeam.defence, awayTeam.defence))
-        print('Mid{:^18}{:^18}'.format(homeTeam.midfield, awayTeam.midfield))
-        print('Att{:^18}{:^18}'.format(homeTeam.attack, awayTeam.attack))
-        print()
-        print('{} Picked, {} Squad, {} Injured.'.format(self.numTeam, self.numSquad, self.numInjured))
-        print('Press C to change team')
-        print('Press TAB to play match.')
-
-        self.html += '<table>'
-        self.html += '<tr><td style="text-align: center;"></td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.name, awayTeam.name)
-        if isLeague:
-            self.html += '<tr><td style="text-align: center;">Position</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.position, awayTeam.position)
-        self.html += '<tr><td style="text-align: center;">Energy</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.energy // 10, awayTeam.energy // 10)
-        self.html += '<tr><td style="text-align: center;">Moral</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.moral, awayTeam.moral)
-        self.html += '<tr><td style="text-align: center;">Formation</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.formation, awayTeam.formation)
-        self.html += '<tr><td style="text-align: center;">Defence</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.defence, awayTeam.defence)
-        self.html += '<tr><td style="text-align: center;">Midfield</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.midfield, awayTeam.midfield)
-        self.html += '<tr><td style="text-align: center;">Attack</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.attack, awayTeam.attack)
-        self.html += '</table>'
-        self.html += '<p>{} Picked, {} Squad, {} Injured.</p>'.format(self.numTeam, self.numSquad, self.numInjured)
-        self.html += '<p style="color: yellow; background-color: green;"><a href="app:?response=c">Press C to change team.</a></p>'
-        self.html += '<p style="color: yellow; background-color: green;"><a href="app:?response=t">Press TAB to play match.</a></p>'
+        self.renderer.render(views.Match(isLeague, homeTeam, awayTeam, self.numTeam, self.numSquad, self.numInjured))
 
 
 
     def wait(self, isGraphical=False):
-        ''' Replacement for PROCWAIT in the BBC Basic version. '''
-        if isGraphical:
-            self.html += '<p style="color: yellow; background-color: blue;"><a href="app:?response=c">Click to continue</a></p>'
-        else:
-            print('{}{}{} Press SPACE to continue {}{}'.format(ansi.BACKGROUND_BLUE, ansi.YELLOW, '━' * 7, '━' * 8, ansi.RESET_ALL))
+        '''
+        Replacement for PROCWAIT in the BBC Basic version.
+
+        :param bool isGraphical: True when the user continues from the page.  Otherwise wait for the user to press SPACE.
+        '''
+        if self.isHeadless:
+            return
+        self.renderer.render(views.Wait())
+        if not isGraphical:
             self.getKeyboardCharacter([' '])
-            print('{}{}'.format(ansi.getCursorUp(1), ansi.ERASE_LINE), end = '\r')
+            self.renderer.render(views.Wait(False))
 
 
 
     def displayLeague(self):
         ''' Replacement for PROCLEAGUE in the BBC Basic version. '''
-        print('Division {}'.format(self.division))
-        print('   Team             W  D  L Pts Dif')
-        self.html += '<h1>Division {}</h1>'.format(self.division)
-        self.html += '<table>'
-        self.html += '<tr><td></td><td>Team</td><td>Won</td><td>Draw</td><td>Lost</td><td>Pts</td><td>Dif</td><tr>'
-        for team in self.teams:
-            team.writeTableRow(self.args.debug)
-            self.html += team.htmlTableRow(self.args.debug)
-        print('Matches Played: {}'.format(self.numMatches))
-        print('{} position: {}'.format(self.team.getColouredName(), self.teamIndex+1))
-        self.html += '</table>'
-        self.html += '<p style="margin-bottom: 0px;">Matches Played: {}</p>'.format(self.numMatches)
-        self.html += '<p style="margin-top: 0px;">{} position: {}</p>'.format(self.team.name, self.teamIndex+1)
+        self.renderer.render(views.LeagueTable(self.division, self.teams, self.numMatches, self.team, self.teamIndex + 1, self.args.debug))
 
 
 
-    def sortDivision(self):
-        ''' Replacement for PROCSORT in the BBC Basic version. '''
-        self.teams = sorted(self.teams, key=lambda Team: (Team.pts, Team.difference), reverse=True)
-        position = 1
-        for team in self.teams:
-            team.position = position
-            if team.name == self.teamName:
-                self.teamIndex = position - 1
-                self.team = team
-            position += 1
+    def sortDivision(self, isRebuild=False):
+        '''
+        Replacement for PROCSORT in the BBC Basic version.
+        Only the teams with new results move in the league table.
+
+        :param bool isRebuild: True to sort the whole table.  This is needed when the teams in the division have changed.
+        '''
+        if isRebuild:
+            self.leagueTable.rebuild(self.teams)
+        else:
+            self.leagueTable.update()
+        self.teams = self.leagueTable.teams
+        self.teamIndex = self.leagueTable.getIndex(self.teamName)
+        self.team = self.teams[self.teamIndex]
 
 
 
     def newGame(self, isGraphical=False):
         ''' Initialise a new game. '''
-        if isGraphical == False:
+        self.rng.setPosition(0, 0)
+        self.season = 1
+        self.autosave.reset()
+        self.history = CareerHistory()
+        if self.isHeadless:
+            self.autoPickTeam()
+        elif isGraphical == False:
             self.pickTeam()
 
         # Initialise variables.
@@ -1508,35 +1188,35 @@ class Game:
         self.money = 50000
         self.debt = 200000
         self.weeks = []
-        self.MATCHES_PER_SEASON = 30
-        if self.args.debug:
-            self.MATCHES_PER_SEASON = 4
 
         # Initialise the players.
         self.players = []
-        for index in range(1, 27):
-            player = Player()
-            player.getPlayer(index)
-            player.skill = random.randint(1, 5)
-            player.energy = random.randint(1, 20)
+        for index in range(1, player_catalog.NUM_PLAYERS + 1):
+            player = player_catalog.getRosterPlayer(index)
+            player.skill = self.rng.team.randint(1, 5)
+            player.energy = self.rng.team.randint(1, 20)
             self.players.append(player)
         for index in range(4):
-            player = random.randint(0, 25)
+            player = self.rng.team.randint(0, 25)
             self.players[player].skill = 5
 
         # Pick 12 players.
         self.numSquad = 12
         for index in range(self.numSquad):
-            player = random.randint(0, 25)
+            player = self.rng.team.randint(0, 25)
             while self.players[player].inSquad:
-                player = random.randint(0, 25)
+                player = self.rng.team.randint(0, 25)
             self.players[player].inSquad = True
 
         # Initialise the teams.
         self.teams = None
+        self.teamTable = TeamTable()
         self.division = 4
-        self.setTeamsForDivision([])
-        self.sortDivision()
+        if self.world == None:
+            self.setTeamsForDivision([])
+        else:
+            self.world.newGame()
+        self.sortDivision(True)
 
         # Pick a default selection of players.
         self.numTeam = 0
@@ -1552,8 +1232,8 @@ class Game:
         ''' Replacement for PROCDIVISON (line 3520) in the BBC Basic version. '''
         if self.teams == None:
             self.teams = []
-            for nTeam in range(16):
-                team = Team()
+            for nTeam in range(self.league.numTeams):
+                team = Team(self.teamTable)
                 team.name = ''
                 self.teams.append(team)
             self.teams[0].name = self.teamName
@@ -1562,20 +1242,18 @@ class Game:
         division = self.division
 
         # Record the existing team names.
+        existingNames = set(existingNames)
         for team in self.teams:
             if team.name != '':
-                existingNames.append(team.name)
+                existingNames.add(team.name)
 
         newTeam = 1
         for team in self.teams:
             if team.name == '':
-                team.getTeam(division, newTeam)
                 # Check that this team is unique.
-                while team.name in existingNames:
-                    newTeam += 1
-                    team.getTeam(division, newTeam)
+                newTeam = team.getUniqueTeam(division, newTeam, existingNames)
 
-                existingNames.append(team.name)
+                existingNames.add(team.name)
                 newTeam += 1
 
             if team.name == self.teamName:
@@ -1583,24 +1261,28 @@ class Game:
                 team.zero()
             else:
                 # Initialise the opponent team.
-                team.initialise(self.division)
+                team.initialise(self.division, self.rng.team)
 
 
 
-    def multiRandomInt(self, rndRange, rndNumber):
+    def multiRandomInt(self, rndRange, rndNumber, rng=None):
         ''' Replacement for FNRND() (Line 6640) in the BBC Basic version. '''
+        if rng is None:
+            rng = self.rng.team
         numTotal = 0
         for count in range(rndNumber):
-            numTotal += random.randint(1, rndRange)
+            numTotal += rng.randint(1, rndRange)
         return numTotal
 
 
 
-    def multiRandom(self, rndRange, rndNumber):
+    def multiRandom(self, rndRange, rndNumber, rng=None):
         ''' Replacement of FNRND (Line 6640) in the BBC Basic version. This gives a floating point result.  It is usually expected that rndRange will be '1.0'.'''
+        if rng is None:
+            rng = self.rng.match
         numTotal = 0
         for count in range(rndNumber):
-            numTotal += random.uniform(0, rndRange)
+            numTotal += rng.uniform(0, rndRange)
         return numTotal
 
 
@@ -1613,17 +1295,14 @@ class Game:
             print(' 0 More Teams')
             print(' 1 Own Team')
             for index in range(2, 17):
-                team = Team()
-                team.getTeam(division, index - 1)
-                print('{:2} {}'.format(index, team.getColouredName()))
+                name, colour = club_catalog.getClub(division, index - 1)
+                print('{:2} {}{}{}'.format(index, colour, name, ansi.RESET_ALL))
             selectedNumber = self.enterNumber('Enter Team Number ')
             if selectedNumber >= 2 and selectedNumber <= 17:
-                team.getTeam(division, selectedNumber - 1)
-                self.teamName = team.name
-                self.teamColour = team.colour
+                self.teamName, self.teamColour = club_catalog.getClub(division, selectedNumber - 1)
                 break
             if selectedNumber == 1:
-                self.teamName = input('Enter Team name ')
+                self.teamName = self.enterText('Enter Team name ')
                 if self.teamName == '':
                     self.teamName = 'Morley Town'
                 self.teamColour = ansi.CYAN
@@ -1633,19 +1312,43 @@ class Game:
 
 
 
+    def autoPickTeam(self):
+        ''' Select a team to manage without a user. '''
+        self.teamName, self.teamColour = club_catalog.getClub(self.rng.team.randint(1, 4), self.rng.team.randint(1, 16))
+
+
+
     def enterNumber(self, message):
         ''' Enter a number at the keyboard. '''
+        if self.isHeadless:
+            # Never bid or buy without a user.
+            return 0
         number = 0
         try:
-            message = input(message)
+            message = self.enterText(message)
             message = message.replace('k', '000')
             number = int(message)
+        except RecordingFinished:
+            raise
         except:
             number = 0
         return number
 
 
 
+    def enterText(self, message):
+        ''' Enter a line of text at the keyboard.  When replaying the text comes from the recording. '''
+        if self.replay != None:
+            text = self.replay.getInput('text')
+            print(message + text)
+            return text
+        text = input(message)
+        if self.recorder != None:
+            self.recorder.add('text', text)
+        return text
+
+
+
     def getYesNo(self):
         ''' Replacement for FNYES in the BBC Basic version.  Returns True if 'Y' is pressed or False if 'N' is pressed. '''
         character = self.getKeyboardCharacter(['y', 'n'])
@@ -1657,6 +1360,20 @@ class Game:
 
     def getKeyboardCharacter(self, allowed):
         ''' Return a keyboard character from the allowed characters. '''
+        if self.isHeadless:
+            # Play the match, continue and answer no to questions.
+            for character in ['\t', ' ', 'n']:
+                if character in allowed:
+                    return character
+            return allowed[0]
+        if self.replay != None:
+            character = self.replay.getInput('key')
+            if not character in allowed:
+                raise ValueError(f'{self.replay.fileName} has {character!r} at input {self.replay.index} but the game allowed {allowed}.')
+            return character
+        # Show the frame before waiting for the user.
+        sys.stdout.flush()
+
         # No Repeat Until in Python.
         # character = modInkey.getwch()
         character = self.keyboard.getKey()
@@ -1664,6 +1381,8 @@ class Game:
             # character = modInkey.getwch()
             character = self.keyboard.getKey()
         self.keyboard.stop()
+        if self.recorder != None:
+            self.recorder.add('key', character)
         return character
 
 
@@ -1672,116 +1391,208 @@ class Game:
         '''
         Implementation of DEFPROCfootball().
         Display a title.
-        This is using 'Box-drawing characters' or 'Line-drawing characters.'
         '''
-        print('┏━━             ┃       ┃ ┃   ┏━┳━┓')
-        print('┃            ┃  ┃       ┃ ┃   ┃ ┃ ┃' )
-        print('┣━━ ┏━┓ ┏━┓ ━╋━ ┣━┓ ━━┓ ┃ ┃   ┃   ┃ ━━┓ ━┳━┓ ━━┓ ┏━┓ ┏━┓ ┏━')
-        print('┃   ┃ ┃ ┃ ┃  ┃  ┃ ┃ ┏━┫ ┃ ┃   ┃   ┃ ┏━┃  ┃ ┃ ┏━┫ ┃ ┃ ┣━┛ ┃')
-        print('┃   ┗━┛ ┗━┛  ┃  ┗━┛ ┗━┛ ┃ ┃   ┃   ┃ ┗━┛  ┃ ┃ ┗━┛ ┗━┫ ┗━━ ┃')
-        print('                                                   ┃')
-        print('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┛')
-        print('By Steve Walton BBC BASIC 1982-1989, 2000, Python 2018-2021.')
-
-        self.html += '<pre>'
-        self.html += '┏━━             ┃       ┃ ┃   ┏━┳━┓\n'
-        self.html += '┃            ┃  ┃       ┃ ┃   ┃ ┃ ┃\n'
-        self.html += '┣━━ ┏━┓ ┏━┓ ━╋━ ┣━┓ ━━┓ ┃ ┃   ┃   ┃ ━━┓ ━┳━┓ ━━┓ ┏━┓ ┏━┓ ┏━\n'
-        self.html += '┃   ┃ ┃ ┃ ┃  ┃  ┃ ┃ ┏━┫ ┃ ┃   ┃   ┃ ┏━┃  ┃ ┃ ┏━┫ ┃ ┃ ┣━┛ ┃\n'
-        self.html += '┃   ┗━┛ ┗━┛  ┃  ┗━┛ ┗━┛ ┃ ┃   ┃   ┃ ┗━┛  ┃ ┃ ┗━┛ ┗━┫ ┗━━ ┃\n'
-        self.html += '                                                   ┃\n'
-        self.html += '━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┛\n'
-        self.html += 'By Steve Walton BBC BASIC 1982-1989, 2000, Python 2018-2021.\n'
-        self.html += '</pre>'
+        self.renderer.render(views.Banner())
 
 
 
     def save(self, isInteractive):
-        ''' Implementation of DEFPROCSAVE (5420) from the BBC Basic version. '''
-        outputFile = open('save.game', 'w')
-
-        json.dump(self.numMatches, outputFile)
-        outputFile.write('\n')
-        json.dump(self.money, outputFile)
-        outputFile.write('\n')
-        json.dump(self.debt, outputFile)
-        outputFile.write('\n')
-        json.dump(self.numSquad, outputFile)
-        outputFile.write('\n')
-        json.dump(self.numTeam, outputFile)
-        outputFile.write('\n')
-        json.dump(self.numInjured, outputFile)
-        outputFile.write('\n')
-        json.dump(self.division, outputFile)
-        outputFile.write('\n')
-        json.dump(self.teamName, outputFile)
-        outputFile.write('\n')
-        json.dump(self.teamColour, outputFile)
-        outputFile.write('\n')
-        json.dump(self.formation, outputFile)
-        outputFile.write('\n')
-        json.dump(self.homeWins, outputFile)
-        outputFile.write('\n')
-        json.dump(self.homeDraws, outputFile)
-        outputFile.write('\n')
-        json.dump(self.homeLoses, outputFile)
-        outputFile.write('\n')
-        json.dump(self.homeFor, outputFile)
-        outputFile.write('\n')
-        json.dump(self.homeAgainst, outputFile)
-        outputFile.write('\n')
-        json.dump(self.awayWins, outputFile)
-        outputFile.write('\n')
-        json.dump(self.awayDraws, outputFile)
-        outputFile.write('\n')
-        json.dump(self.awayLoses, outputFile)
-        outputFile.write('\n')
-        json.dump(self.awayFor, outputFile)
-        outputFile.write('\n')
-        json.dump(self.awayAgainst, outputFile)
-        outputFile.write('\n')
-        json.dump(self.titles, outputFile)
-        outputFile.write('\n')
-
-        # Save the weeks.
-        json.dump(self.weeks, outputFile)
-        outputFile.write('\n')
+        ''' Implementation of DEFPROCSAVE (5420) from the BBC Basic version.  The game is saved into the slot in self.slotName. '''
+        self.writeSaveFile(self.slotName)
+        print('Game Saved.')
+
+
+
+    def writeSaveFile(self, slotName):
+        '''
+        Write the game into the specified save slot.
+        The records are built in memory by a :py:class:`SaveWriter` and the file is written in one go.
+        '''
+        self.saveSlots.write(slotName, self.getSaveBytes(), self.getSlotDetails())
+
+
+
+    def getSaveBytes(self):
+        ''' Returns the whole save file.  The current season is in the hot section and the seasons that have finished are in the history section. '''
+        writer = save_format.SaveWriter()
+        self.dumpRecords(writer)
+        return save_format.packSections([(save_format.HOT_SECTION, writer.getBody()), (save_format.HISTORY_SECTION, self.history.getBody())])
+
+
+
+    def getSlotDetails(self):
+        ''' Returns the details of the game for the index of the saved games. '''
+        return {'team': self.teamName, 'division': self.division, 'season': self.season, 'week': self.numMatches, 'money': self.money, 'timestamp': time.time()}
+
+
+
+    def selectSlot(self):
+        ''' Ask the user which saved game to load.  Returns the slot name or None. '''
+        slots = self.saveSlots.getSlots()
+        if len(slots) == 0:
+            print('There are no saved games.')
+            return None
+        for index, (slotName, details) in enumerate(slots):
+            print(f'{index + 1:2} .. {self.saveSlots.getDescription(slotName, details)}')
+        try:
+            index = int(self.enterText('Enter the number of the game to load: ')) - 1
+        except ValueError:
+            return None
+        if index < 0 or index >= len(slots):
+            return None
+        return slots[index][0]
+
+
+
+    def dumpRecords(self, writer):
+        ''' Write the whole game into the specified :py:class:`SaveWriter`. '''
+        self.league.dump(writer)
+        writer.addObject(save_format.GAME, self)
 
         # Save the players.
         for player in self.players:
-            player.dump(outputFile)
+            player.dump(writer)
 
         # Save the teams.
         for team in self.teams:
-            team.dump(outputFile)
+            team.dump(writer)
 
-        # Save the cups.
-        self.faCup.dump(outputFile)
-        self.leagueCup.dump(outputFile)
-        if self.europeanCup == None:
-            outputFile.write('No\n')
-        else:
-            outputFile.write('Yes\n')
-            self.europeanCup.dump(outputFile)
+        # Save the cups.  There is no European Cup record when not in the European Cup.
+        self.faCup.dump(writer)
+        self.leagueCup.dump(writer)
+        if self.europeanCup != None:
+            self.europeanCup.dump(writer)
 
-        outputFile.close()
+        # Save the random number seed and the season.  The seed is a string because it can be any size.
+        writer.add(save_format.RANDOM, str(self.rng.seed), self.season)
 
-        print('Game Saved.')
+        # Save the fixtures.
+        self.fixtures.dump(writer)
 
+        # Save the other divisions.
+        if self.world != None:
+            self.world.dump(writer)
 
 
-    def load(self):
-        ''' Implementation of DEFPROCLOAD (line 5530) from the BBC Basic version. '''
-        self.MATCHES_PER_SEASON = 30
 
-        # Check that the load file exists.
-        if not os.path.exists('save.game'):
+    def load(self, slotName='save'):
+        '''
+        Implementation of DEFPROCLOAD (line 5530) from the BBC Basic version.
+        Only the save file of the specified slot is read.
+        The save file from the older versions is moved into the 'save' slot.
+        '''
+        if slotName == Autosave.SLOT_NAME:
+            try:
+                if not self.autosave.load():
+                    return False
+            except ValueError as error:
+                print(f'Error reading the autosave.  {error}')
+                return False
+        else:
+            if not self.loadSaveFile(slotName):
+                return False
+            self.autosave.reset()
+            if slotName == SaveSlots.OLD_SAVE_FILE:
+                slotName = 'save'
+                self.writeSaveFile(slotName)
+            self.slotName = slotName
+
+        # The streams are between the weeks, the same as the game that was saved.
+        self.rng.setPosition(self.season, self.numMatches, True)
+        self.moneyStart = self.money - self.debt
+        self.moneyItems = []
+        return True
+
+
+
+    def loadSaveFile(self, slotName):
+        '''
+        Load the game from the save file of the specified slot.  Returns False if the game was not loaded.
+        Only the hot section is read.  The history section is read when it is needed.
+        Older json lines save files are also loaded.
+        '''
+        fileName = self.saveSlots.getFileName(slotName)
+        if not os.path.exists(fileName):
             return False
 
-        inputFile = open('save.game', 'r')
+        with open(fileName, 'rb') as inputFile:
+            if not save_format.isSaveFile(inputFile.read(len(save_format.MAGIC))):
+                inputFile.seek(0)
+                self.loadText(io.TextIOWrapper(inputFile, encoding='utf-8'))
+                self.history = CareerHistory()
+                return True
+            inputFile.seek(0)
+            try:
+                saveFile = save_format.SaveFile(inputFile)
+                self.loadRecords(saveFile.read(save_format.HOT_SECTION))
+            except ValueError as error:
+                print(f'Error reading {slotName}.  {error}')
+                return False
+        self.history = CareerHistory(fileName, saveFile.getSection(save_format.HISTORY_SECTION))
+        return True
+
+
+
+    def loadRecords(self, reader):
+        ''' Load the game from the records of a binary save file in the specified :py:class:`SaveReader`. '''
+        self.league = LeagueConfig(*reader.read(save_format.CONFIG))
+        reader.readObject(save_format.GAME, self)
+
+        # Load the players.
+        self.players = []
+        while reader.isNext(save_format.PLAYER):
+            player = Player()
+            player.load(reader)
+            self.players.append(player)
+
+        # Load the teams.
+        self.teams = []
+        self.teamTable = TeamTable()
+        while reader.isNext(save_format.TEAM):
+            team = Team(self.teamTable)
+            team.load(reader)
+            self.teams.append(team)
+        self.sortDivision(True)
+
+        # Load the cups.  The European Cup is only there when in the European Cup.
+        self.faCup = CupCompetition(self, 'FA Cup', 16, ~16)
+        self.faCup.load(reader)
+        self.leagueCup = CupCompetition(self, 'League Cup', 8, ~8)
+        self.leagueCup.load(reader)
+        if reader.isNext(save_format.CUP):
+            self.europeanCup = CupCompetition(self, 'European Cup', 32, ~(32|64|128))
+            self.europeanCup.load(reader)
+        else:
+            self.europeanCup = None
+
+        # Load the random number seed and the season.
+        seed, self.season = reader.read(save_format.RANDOM)
+        self.rng = RandomStreams(int(seed))
+
+        # Load the fixtures.
+        self.fixtures.load(reader)
+
+        # Load the other divisions.  The save file decides if this is a world game.
+        if reader.isNext(save_format.DIVISION):
+            self.world = World(self)
+            self.world.load(reader)
+        else:
+            self.world = None
+
 
+
+    def loadText(self, inputFile):
+        ''' Load the game from the specified json lines file.  This is the format of the older save files. '''
+        # Older save files do not have the league configuration and have 16 teams.
         line = inputFile.readline()
-        self.numMatches = json.loads(line)
+        value = json.loads(line)
+        if isinstance(value, dict):
+            self.league = LeagueConfig(**value)
+            line = inputFile.readline()
+            value = json.loads(line)
+        else:
+            self.league = LeagueConfig(matchesPerSeason=4 if self.args.debug else None)
+        self.numMatches = value
         line = inputFile.readline()
         self.money = json.loads(line)
         line = inputFile.readline()
@@ -1831,62 +1642,70 @@ class Game:
         self.players = []
         for index in range(26):
             player = Player()
-            player.load(inputFile)
+            player.loadText(inputFile)
             self.players.append(player)
 
         # Load the teams.
         self.teams = []
-        for index in range(16):
-            team = Team()
-            team.load(inputFile)
+        self.teamTable = TeamTable()
+        for index in range(self.league.numTeams):
+            team = Team(self.teamTable)
+            team.loadText(inputFile)
             self.teams.append(team)
+        self.sortDivision(True)
 
         # Load the cups.
         self.faCup = CupCompetition(self, 'FA Cup', 16, ~16)
-        self.faCup.load(inputFile)
+        self.faCup.loadText(inputFile)
         self.leagueCup = CupCompetition(self, 'League Cup', 8, ~8)
-        self.leagueCup.load(inputFile)
+        self.leagueCup.loadText(inputFile)
         line = inputFile.readline()
         if line[0] == 'N':
             self.europeanCup = None
         elif line[0] == 'Y':
             self.europeanCup = CupCompetition(self, 'European Cup', 32, ~(32|64|128))
-            self.europeanCup.load(inputFile)
+            self.europeanCup.loadText(inputFile)
         else:
             print("Error reading after league cup!  '{}'".format(line))
 
-        inputFile.close()
+        # Load the random number seed and the season.  Older save files do not have these.
+        line = inputFile.readline()
+        if line != '':
+            self.rng = RandomStreams(json.loads(line))
+            line = inputFile.readline()
+            self.season = json.loads(line)
 
-        self.moneyStart = self.money - self.debt
-        self.moneyMessage = ''
-        return True
+        # Load the fixtures.  Older save files do not have the fixtures so decide new fixtures.
+        if not self.fixtures.loadText(inputFile):
+            self.createFixtures()
+
+        # Load the other divisions.  The save file decides if this is a world game.
+        line = inputFile.readline()
+        if line[:1] == 'W':
+            self.world = World(self)
+            self.world.loadText(inputFile)
+        else:
+            self.world = None
 
 
 
     def decideFixtures(self, opponent):
-        ''' Replacement for PROCFIXTURES (line 247) in the BBC Basic version. '''
+        '''
+        Replacement for PROCFIXTURES (line 247) in the BBC Basic version.
+        The other matches this week are taken from the fixtures.
+        '''
         for team in self.teams:
             team.fixture = 0
 
         self.teams[self.teamIndex].fixture = -1
         self.teams[opponent].fixture = -1
-        for match in range(1, 8):
-            while True:
-                home = random.randint(0, 15)
-                if self.teams[home].fixture == 0:
-                    break
-            self.teams[home].fixture = match * 2 - 1
-            while True:
-                away = random.randint(0, 15)
-                if self.teams[away].fixture == 0:
-                    break
-            self.teams[away].fixture = match * 2
-
-            # Swap if the away team has fewer home matches.
-            if self.teams[home].numHomeGames > self.teams[away].numHomeGames:
-                home, away = away, home
-                self.teams[home].fixture = match * 2 - 1
-                self.teams[away].fixture = match * 2
+        match = 0
+        for homeName, awayName in self.fixtures.getRound(self.numMatches):
+            if homeName == self.teamName or awayName == self.teamName:
+                continue
+            match += 1
+            self.teamTable.getTeam(homeName).fixture = match * 2 - 1
+            self.teamTable.getTeam(awayName).fixture = match * 2
 
 
 
@@ -1895,107 +1714,118 @@ class Game:
         Replacement for DEFPROCREST (line 2710) in the BBC Basic version.
         This is play and display the rest of the matches in the league.
         '''
-        self.html = '<table>'
+        # Find the fixtures.  Odd fixture numbers are the home teams and even numbers the away teams.
+        homeTeams = {}
+        awayTeams = {}
+        for team in self.teams:
+            if team.fixture > 0:
+                if team.fixture & 1 == 1:
+                    homeTeams[(team.fixture + 1) // 2] = team
+                else:
+                    awayTeams[team.fixture // 2] = team
+        fixtures = [(homeTeams[match], awayTeams[match]) for match in range(1, self.league.numTeams // 2)]
+
+        # Play all the fixtures in one batch.
+        results = self.matchBatch(fixtures, 0.5, 0)
+        for (home, away), (homeGoals, awayGoals) in zip(fixtures, results):
+            self.applyPoints(home, away, homeGoals, awayGoals)
         if self.isHomeMatch:
-            self.html += '<tr><td style="text-align: right;">{}</td><td style="text-align: center;">{} - {}</td><td>{}</td></tr>'.format(self.teams[self.teamIndex].name, self.homeScore, self.awayScore, self.teams[self.opponentIndex].name)
+            homeTeam, awayTeam = self.teams[self.teamIndex], self.teams[self.opponentIndex]
         else:
-            self.html += '<tr><td style="text-align: right;">{}</td><td style="text-align: center;">{} - {}</td><td>{}</td></tr>'.format(self.teams[self.opponentIndex].name, self.homeScore, self.awayScore, self.teams[self.teamIndex].name)
-        for match in range(1, 8):
-            for index in range(16):
-                if self.teams[index].fixture == 2 * match - 1:
-                    home = index
-                if self.teams[index].fixture == 2 * match:
-                    away = index
-
-            homeGoals, awayGoals = self.match(self.teams[home], self.teams[away], 0.5, 0)
-            print('{}{:>17}{} {} - {} {}'.format(self.teams[home].colour, self.teams[home].name, ansi.RESET_ALL, homeGoals, awayGoals, self.teams[away].getColouredName()))
-            self.html += '<tr><td style="text-align: right;">{}</td><td style="text-align: center;">{} - {}</td><td>{}</td></tr>'.format(self.teams[home].name, homeGoals, awayGoals, self.teams[away].name)
-            self.applyPoints(self.teams[home], self.teams[away], homeGoals, awayGoals)
-        self.html += '</table>'
+            homeTeam, awayTeam = self.teams[self.opponentIndex], self.teams[self.teamIndex]
+        self.renderer.render(views.Results(homeTeam, awayTeam, self.homeScore, self.awayScore, [(home, away, homeGoals, awayGoals) for (home, away), (homeGoals, awayGoals) in zip(fixtures, results)]))
 
+        # Play the other divisions.
+        if self.world != None:
+            self.world.playWeek()
 
 
-    def htmlPlayMatch(self, homeTeam, awayTeam):
-        ''' Display the current match status in html. '''
+
+    def htmlPlayMatch(self, homeTeam, awayTeam, rng=None):
+        '''
+        Display the match in html.
+        The first call plays the match and sends the whole timeline of goals to the page.
+        The page animates the match and responds with ?fulltime=1 at full time or when the user skips to the result.
+        The next call displays the result.
+        '''
         if self.subStatus == 0:
             # Play the match.
-            homeGoals, awayGoals = self.playMatch(homeTeam, awayTeam, 0.5, 0, True)
+            homeGoals, awayGoals = self.playMatch(homeTeam, awayTeam, 0.5, 0, True, rng)
+
+            # Decide the goal scorers in the order of the goals.
+            timeline = []
             self.homeScore = 0
             self.awayScore = 0
             self.homeGoalScorers = ''
             self.awayGoalScorers = ''
-        else:
-            if self.subStatus in self.homeGoalsTimes:
-                self.homeScore += 1
-                if homeTeam.name == self.teamName:
-                    goalScorer = random.randint(0, len(self.goalScorers)-1)
-                    if self.homeGoalScorers == '':
-                        self.homeGoalScorers = '{} {}'.format(self.subStatus, self.goalScorers[goalScorer].name)
-                    else:
-                        self.homeGoalScorers = '{}<br />{} {}'.format(self.homeGoalScorers, self.subStatus, self.goalScorers[goalScorer].name)
-                    self.goalScorers[goalScorer].goals += 1
-                else:
-                    if self.homeGoalScorers == '':
-                        self.homeGoalScorers = '{} Goal'.format(self.subStatus)
-                    else:
-                        self.homeGoalScorers = '{}<br />{} Goal'.format(self.homeGoalScorers, self.subStatus)
-            if self.subStatus in self.awayGoalsTimes:
-                self.awayScore += 1
-                if awayTeam.name == self.teamName:
-                    goalScorer = random.randint(0, len(self.goalScorers)-1)
-                    if self.awayGoalScorers == '':
-                        self.awayGoalScorers = '{} {}'.format(self.subStatus, self.goalScorers[goalScorer].name)
-                    else:
-                        self.awayGoalScorers = '{}<br />{} {}'.format(self.awayGoalScorers, self.subStatus, self.goalScorers[goalScorer].name)
-                    self.goalScorers[goalScorer].goals += 1
-                else:
-                    if self.awayGoalScorers == '':
-                        self.awayGoalScorers = '{} Goal'.format(self.subStatus)
-                    else:
-                        self.awayGoalScorers = '{}<br />{} Goal'.format(self.awayGoalScorers, self.subStatus)
+            for goalTime in range(1, 91):
+                if goalTime in self.homeGoalsTimes:
+                    self.homeScore += 1
+                    goalScorer = self.getGoalScorer(homeTeam, goalTime)
+                    self.homeGoalScorers = goalScorer if self.homeGoalScorers == '' else f'{self.homeGoalScorers}<br />{goalScorer}'
+                    timeline.append((goalTime, 0, goalScorer))
+                if goalTime in self.awayGoalsTimes:
+                    self.awayScore += 1
+                    goalScorer = self.getGoalScorer(awayTeam, goalTime)
+                    self.awayGoalScorers = goalScorer if self.awayGoalScorers == '' else f'{self.awayGoalScorers}<br />{goalScorer}'
+                    timeline.append((goalTime, 1, goalScorer))
+
+            self.html = f'<table{html_builder.getDataAttribute("timeline", timeline)}>'
+            self.html += '<tr><td style="text-align: right;">{}</td><td class="homeScore" style="text-align: center;">0</td><td class="awayScore" style="text-align: center;">0</td><td>{}</td></tr>'.format(homeTeam.name, awayTeam.name)
+            self.html += '<tr><td class="matchTime" colspan="4" style="text-align: center;">Time 0</td></tr>'
+            self.html += '<tr><td class="homeScorers" style="text-align: right; vertical-align: top;"></td><td></td><td></td><td class="awayScorers" style="vertical-align: top;"></td></tr>'
+            self.html += '</table>'
+            self.html += '<p><a href="app:?fulltime=1">Skip to the result</a></p>'
+            self.subStatus = 1
+            return ''
 
+        # Full time.
         self.html = '<table>'
         self.html += '<tr><td style="text-align: right;">{}</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td><td>{}</td></tr>'.format(homeTeam.name, self.homeScore, self.awayScore, awayTeam.name)
-        if self.subStatus == 90:
-            self.subStatus = 1000
-        if self.subStatus == 45:
-            self.html += '<tr><td colspan="4" style="text-align: center;">Half Time</td></tr>'.format(self.subStatus)
-            response = 'delay: 4000'
-        elif self.subStatus >= 1000:
-            self.html += '<tr><td colspan="4" style="text-align: center;">Full Time</td></tr>'.format(self.subStatus)
-            response = ''
-        else:
-            self.html += '<tr><td colspan="4" style="text-align: center;">Time {}</td></tr>'.format(self.subStatus)
-            response = 'delay: 200'
-        self.html += '<td style="text-align: right; vertical-align: top;">{}</td><td></td><td></td><td style="vertical-align: top;">{}</td>'.format(self.homeGoalScorers, self.awayGoalScorers)
+        self.html += '<tr><td colspan="4" style="text-align: center;">Full Time</td></tr>'
+        self.html += '<tr><td style="text-align: right; vertical-align: top;">{}</td><td></td><td></td><td style="vertical-align: top;">{}</td></tr>'.format(self.homeGoalScorers, self.awayGoalScorers)
         self.html += '</table>'
-        self.subStatus += 1
+        self.subStatus = 1000
 
-        if self.subStatus >= 1000:
-            # PROCPLAYERS
-            self.playerEngergy()
-            self.playerInjured()
-            self.wait(True)
+        # PROCPLAYERS
+        self.playerEngergy()
+        self.playerInjured()
+        self.wait(True)
+
+        return ''
 
-        return response
 
 
+    def getGoalScorer(self, team, goalTime):
+        ''' Returns the description of a goal by the specified team.  The scorer is picked when the team is the player's team. '''
+        if team.name != self.teamName:
+            return '{} Goal'.format(goalTime)
+        goalScorer = self.rng.match.randint(0, len(self.goalScorers)-1)
+        self.goalScorers[goalScorer].goals += 1
+        return '{} {}'.format(goalTime, self.goalScorers[goalScorer].name)
 
-    def playMatch(self, homeTeam, awayTeam, homeBonus, awayBonus, isGraphical=False):
-        ''' Replacement for DEFPROCPLAYMATCH (Line 1680) in the BBC Basic version. '''
-        homeGoals, awayGoals = self.match(homeTeam, awayTeam, homeBonus, awayBonus)
+
+
+    def playMatch(self, homeTeam, awayTeam, homeBonus, awayBonus, isGraphical=False, rng=None):
+        '''
+        Replacement for DEFPROCPLAYMATCH (Line 1680) in the BBC Basic version.
+        The optional rng is used for the result, the goal times and the goal scorers.  The default is the match stream.
+        '''
+        if rng is None:
+            rng = self.rng.match
+        homeGoals, awayGoals = self.match(homeTeam, awayTeam, homeBonus, awayBonus, rng)
         # Not implemented yet.
 
         # Decide when the goals are scored.
         self.homeGoalsTimes = []
         for goal in range(homeGoals):
-            goalTime = random.randint(1, 90)
+            goalTime = rng.randint(1, 90)
             while goalTime in self.homeGoalsTimes:
                 goalTime = (goalTime % 90) + 1
             self.homeGoalsTimes.append(goalTime)
         self.awayGoalsTimes = []
         for goal in range(awayGoals):
-            goalTime = random.randint(1, 90)
+            goalTime = rng.randint(1, 90)
             while goalTime in self.awayGoalsTimes:
                 goalTime = (goalTime % 90) + 1
             self.awayGoalsTimes.append(goalTime)
@@ -2014,66 +1844,43 @@ class Game:
                         self.goalScorers.append(player)
 
         if isGraphical == False:
+            # Each minute is a frame of the score, the time and the goals.
+            # Only the lines that have changed are written.
             self.homeScore = 0
             self.awayScore = 0
-            # print('{} {} - {} {}'.format(self.teams[homeTeam].getColouredName(), homeScore, awayScore, self.teams[awayTeam].getColouredName()))
-            print('{}{:>17}{} {} - {} {}'.format(homeTeam.colour, homeTeam.name, ansi.RESET_ALL, self.homeScore, self.awayScore, awayTeam.getColouredName()))
+            goals = []
             for goalTime in range(91):
                 realTime = time.time()
 
                 if goalTime in self.homeGoalsTimes:
                     self.homeScore += 1
-                    ansi.doCursorUp(1)
-                    print('{}{:>17}{} {} - {} {}'.format(homeTeam.colour, homeTeam.name, ansi.RESET_ALL, self.homeScore, self.awayScore, awayTeam.getColouredName()))
-                    totalScore = self.homeScore + self.awayScore
                     if homeTeam.name == self.teamName:
-                        ansi.doCursorDown(totalScore)
-                        goalScorer = random.randint(0, len(self.goalScorers)-1)
-                        print('{} {}'.format(goalTime, self.goalScorers[goalScorer].name), end = '\r')
+                        goalScorer = rng.randint(0, len(self.goalScorers)-1)
+                        goals.append((True, goalTime, self.goalScorers[goalScorer].name))
                         self.goalScorers[goalScorer].goals += 1
-                        ansi.doCursorUp(totalScore)
                     else:
-                        ansi.doCursorDown(totalScore)
-                        print('{} Goal'.format(goalTime), end = '\r')
-                        ansi.doCursorUp(totalScore)
+                        goals.append((True, goalTime, None))
 
                 if goalTime in self.awayGoalsTimes:
                     self.awayScore += 1
-                    ansi.doCursorUp(1)
-                    print('{}{:>17}{} {} - {} {}'.format(homeTeam.colour, homeTeam.name, ansi.RESET_ALL, self.homeScore, self.awayScore, awayTeam.getColouredName()))
-                    totalScore = self.homeScore + self.awayScore
                     if awayTeam.name == self.teamName:
-                        ansi.doCursorDown(totalScore)
-                        goalScorer = random.randint(0, len(self.goalScorers)-1)
-                        print('{}{} {}'.format(' ' * 22, goalTime, self.goalScorers[goalScorer].name), end = '\r')
+                        goalScorer = rng.randint(0, len(self.goalScorers)-1)
+                        goals.append((False, goalTime, self.goalScorers[goalScorer].name))
                         self.goalScorers[goalScorer].goals += 1
-                        ansi.doCursorUp(totalScore)
                     else:
-                        ansi.doCursorDown(totalScore)
-                        print('{}{} Goal'.format(' ' * 22, goalTime), end = '\r')
-                        ansi.doCursorUp(totalScore)
+                        goals.append((False, goalTime, None))
 
-                print('{}Time {}   '.format(' ' * 17, goalTime), end = '\r')
-                sys.stdout.flush()
-                time.sleep(realTime + 0.2 - time.time())
+                self.renderer.render(views.MatchClock(homeTeam, awayTeam, self.homeScore, self.awayScore, goalTime, goals))
+                if not self.isFullSpeed:
+                    time.sleep(max(0, realTime + 0.2 - time.time()))
 
                 if goalTime == 45:
-                    print('{}Half Time.'.format(' ' * 16, goalTime), end = '\r')
-                    sys.stdout.flush()
+                    self.renderer.render(views.MatchClock(homeTeam, awayTeam, self.homeScore, self.awayScore, goalTime, goals, True))
                     # Did the fixture calculations here in the BBC Basic version.
-                    time.sleep(4)
+                    if not self.isFullSpeed:
+                        time.sleep(4)
 
-            # Move down.
-            ansi.doCursorDown(homeGoals + awayGoals + 1)
-            print('Final Score')
-            print('{}{:>17}{} {} - {} {}'.format(homeTeam.colour, homeTeam.name, ansi.RESET_ALL, homeGoals, awayGoals, awayTeam.getColouredName()))
-        else:
-            # Debuging only.
-            print('{}{:>17}{} {} - {} {}'.format(homeTeam.colour, homeTeam.name, ansi.RESET_ALL, homeGoals, awayGoals, awayTeam.getColouredName()))
-            #for goalTime in self.homeGoalsTimes:
-            #    print(goalTime)
-            #for goalT in self.awayGoalsTimes:
-            #    print('                          {}'.format(goalTime))
+            self.renderer.render(views.FinalScore(homeTeam, awayTeam, homeGoals, awayGoals))
         return homeGoals, awayGoals
 
 
@@ -2083,136 +1890,133 @@ class Game:
 
         :param double mean: Specifies the mean value of the poisson distribution.
         :param double probability: Specifies the point on the cumulative distribution function (cdf) to return the value from.
+
+        The cumulative distribution is looked up in the cached tables of the :py:class:`match_engine.PoissonSampler`.
         '''
-        answer = 0
-        # 'pdf' is the probability distribution function at this 'answer'.
-        pdf = math.exp(-mean)
-        if probability < pdf:
-            return answer
-        cdf = pdf
-        while True:
-            answer += 1
-            pdf *= mean / answer
-            cdf += pdf
-            if probability < cdf:
-                break
-        return answer
+        return self.poissonSampler.sample(mean, probability)
 
 
 
-    def match(self, home, away, homeBonus, awayBonus):
+    def match(self, home, away, homeBonus, awayBonus, rng=None):
         ''' Replacement for DEFPROCMATCH (Line 6920) in the BBC Basic version. '''
-        homeAverageGoals = homeBonus + (4.0 * home.attack / away.defence) * home.midfield / (home.midfield + away.midfield) + (home.moral - 10.0) / 40.0 - (away.energy - 100.0) / 400.0
-        awayAverageGoals = awayBonus + (4.0 * away.attack / home.defence) * away.midfield / (away.midfield + home.midfield) + (away.moral - 10.0) / 40.0 - (home.energy - 100.0) / 400.0
-        homeGoals = self.poisson(homeAverageGoals, self.multiRandom(1, 2) / 2)
-        awayGoals = self.poisson(awayAverageGoals, self.multiRandom(1, 2) / 2)
+        homeAverageGoals = match_engine.expectedGoals(homeBonus, home.attack, home.midfield, home.moral, away.defence, away.midfield, away.energy)
+        awayAverageGoals = match_engine.expectedGoals(awayBonus, away.attack, away.midfield, away.moral, home.defence, home.midfield, home.energy)
+        homeGoals = self.poisson(homeAverageGoals, self.multiRandom(1, 2, rng) / 2)
+        awayGoals = self.poisson(awayAverageGoals, self.multiRandom(1, 2, rng) / 2)
 
         # Set the moral for the teams.
-        if homeGoals == awayGoals:
-            home.moral = 10
-            away.moral = 10
-        else:
-            if homeGoals > awayGoals:
-                home.moral = max(home.moral, 10)
-                away.moral = min(away.moral, 10)
-                home.moral = min(home.moral + homeGoals - awayGoals, 20)
-                away.moral = max(away.moral + awayGoals - homeGoals, 1)
-            else:
-                home.moral = min(home.moral, 10)
-                away.moral = max(away.moral, 10)
-                home.moral = max(home.moral + homeGoals - awayGoals, 1)
-                away.moral = min(away.moral + awayGoals - homeGoals, 20)
+        home.moral, away.moral = match_engine.updateMoral(home.moral, away.moral, homeGoals, awayGoals)
         return homeGoals, awayGoals
 
 
 
+    def matchBatch(self, fixtures, homeBonus, awayBonus, firstFixture=1):
+        '''
+        :param list fixtures: The (home, away) pairs of teams to play.
+        :param int firstFixture: The fixture number of the first pair.  Each fixture draws from its own stream.
+        :returns: A list of (homeGoals, awayGoals) for each fixture.
+
+        Batch version of :py:meth:`match`.  Play all the fixtures in a single call to the match engine.
+        '''
+        # The skills come straight from the team table columns.
+        names = ('attack', 'midfield', 'defence', 'moral', 'energy')
+        home = team_table.getColumns([homeTeam for homeTeam, awayTeam in fixtures], names)
+        away = team_table.getColumns([awayTeam for homeTeam, awayTeam in fixtures], names)
+        homeProbabilities = []
+        awayProbabilities = []
+        for fixture in range(firstFixture, firstFixture + len(fixtures)):
+            rng = self.getFixtureRandom(fixture)
+            homeProbabilities.append(self.multiRandom(1, 2, rng) / 2)
+            awayProbabilities.append(self.multiRandom(1, 2, rng) / 2)
+
+        homeGoals, awayGoals, homeMoral, awayMoral = match_engine.matchBatch(home, away, homeBonus, awayBonus, homeProbabilities, awayProbabilities, self.poissonSampler)
+
+        results = []
+        for index, (homeTeam, awayTeam) in enumerate(fixtures):
+            homeTeam.moral = int(homeMoral[index])
+            awayTeam.moral = int(awayMoral[index])
+            results.append((int(homeGoals[index]), int(awayGoals[index])))
+        return results
+
+
+
+    def getFixtureRandom(self, fixture):
+        '''
+        Returns the random number generator for the specified fixture in the current week.
+        Fixture 0 is the league match of the user's team.
+        '''
+        return self.rng.getFixtureStream(self.season, self.numMatches, fixture)
+
+
+
     def progress(self):
         ''' Replacement for DEFPROCPROGRESS (line 5790) in the BBC Basic version. '''
-        ansi.doCls()
-        print("{}'s progress in division {}".format(self.team.getColouredName(), self.division))
+        self.renderer.render(views.Page("'s progress in division {}".format(self.division), self.team))
 
         # Display FA Cup status.
         # Display League Cup status.
         # Display European Cup status.
         self.displayCupStatus()
 
-        # Show league results summary.
-        print(' [--- Home ---] [--- Away ---]')
-        print('  W  D  L  F  A  W  D  L  F  A Pts')
-        print('{:>3}{:>3}{:>3}{:>3}{:>3}{:>3}{:>3}{:>3}{:>3}{:>3}{:>4}'.format(self.homeWins, self.homeDraws, self.homeLoses, self.homeFor, self.homeAgainst, self.awayWins, self.awayDraws, self.awayLoses, self.awayFor, self.awayAgainst, 3 * (self.homeWins + self.awayWins) + self.homeDraws + self.awayDraws))
-        self.html = '<h1>{} progress in division {}</h1>'.format(self.team.name, self.division)
-        self.html += '<table>'
-        self.html += '<tr><td colspan="5" style="text-align: center; border: 2px solid purple;">Home</td><td colspan="5" style="text-align:center; border: 2px solid purple;">Away</td><td style="border-top: 2px solid purple; border-left: 2px solid purple; border-right: 2px solid purple;"></td></tr>'
-        self.html += '<tr><td style="text-align: right; border-left: 2px solid purple; border-bottom: 2px solid purple;">Win</td><td style="text-align: right; border-bottom: 2px solid purple;">Draw</td><td style="text-align: right; border-bottom: 2px solid purple;">Lose</td><td style="text-align: right; border-bottom: 2px solid purple;">For</td><td style="text-align: right; border-bottom: 2px solid purple; border-right: 2px solid purple;">Agn</td><td style="text-align: right; border-bottom: 2px solid purple; border-left: 2px solid purple;">Win</td><td style="text-align: right; border-bottom: 2px solid purple;">Draw</td><td style="text-align: right; border-bottom: 2px solid purple;">Lose</td><td style="text-align: right; border-bottom: 2px solid purple;">For</td><td style="text-align: right; border-bottom: 2px solid purple; border-right: 2px solid purple;">Agn</td><td style="text-align: right; border-bottom: 2px solid purple; border-left: 2px solid purple; border-right: 2px solid purple;">Points</td></tr>'
-        self.html += '<tr><td style="text-align: right; border-left: 2px solid purple; border-bottom: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple; border-right: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple; border-left: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple; border-right: 2px solid purple;">{}</td><td style="text-align: right; border: 2px solid purple; padding-right: 10px;">{}</td></tr>'.format(self.homeWins, self.homeDraws, self.homeLoses, self.homeFor, self.homeAgainst, self.awayWins, self.awayDraws, self.awayLoses, self.awayFor, self.awayAgainst, 3 * (self.homeWins + self.awayWins) + self.homeDraws + self.awayDraws)
-        self.html += '</table>'
+        # Show league results summary and details.
+        home = (self.homeWins, self.homeDraws, self.homeLoses, self.homeFor, self.homeAgainst)
+        away = (self.awayWins, self.awayDraws, self.awayLoses, self.awayFor, self.awayAgainst)
+        pts = 3 * (self.homeWins + self.awayWins) + self.homeDraws + self.awayDraws
+        self.renderer.render(views.Progress(home, away, pts, self.weeks, self.league))
+
+        # Show the seasons that have finished.
+        self.displayHistory()
+
+        # Show the projected odds for the end of the season.
+        self.displayProjection()
+
+
+
+    def displayHistory(self, numSeasons=10):
+        '''
+        :param int numSeasons: The maximum number of seasons to display.
+
+        Display the most recent seasons of the career.
+        This is when the history is read from the save file.
+        '''
+        seasons = self.history.getSeasons()
+        if len(seasons) == 0:
+            return
+        self.renderer.render(views.History(list(reversed(seasons[-numSeasons:]))))
 
-        # Show league results details.
-        count = 0
-        for week in reversed(self.weeks):
-            count += 1
-            if count <= 10:
-                if week & 256 == 0:
-                    homeAway = 'Home'
-                else:
-                    homeAway = 'Away'
-                if week & 192 == 0:
-                    result = ansi.LIGHT_RED + 'Lost ' + ansi.RESET_ALL
-                elif week & 192 == 128:
-                    result = ansi.LIGHT_GREEN + 'Won  ' + ansi.RESET_ALL
-                else:
-                    result = ansi.LIGHT_YELLOW + 'Drawn' + ansi.RESET_ALL
-                # There are positions 1 to 16. 16-14, 13-4, 3-2, 1
-                position = 1 + (week & 63)
-                # The bar is one element short because the number is the final element.
-                bar = ''
-                if position < 14:
-                    bar = ansi.BACKGROUND_LIGHT_RED + '  ' * 3
-                    if position < 4:
-                        bar += ansi.BACKGROUND_LIGHT_MAGENTA + '  ' * 10
-                        if position == 3:
-                            bar += ansi.BACKGROUND_LIGHT_GREEN + ansi.DARK_GRAY
-                        elif position == 2:
-                            bar += ansi.BACKGROUND_LIGHT_GREEN + '  ' + ansi.DARK_GRAY
-                        else:
-                            bar += ansi.BACKGROUND_LIGHT_GREEN + '    ' + ansi.BACKGROUND_YELLOW
-                    else:
-                        bar += ansi.BACKGROUND_LIGHT_MAGENTA + '  ' * (13 - position)
-                else:
-                    bar = ansi.BACKGROUND_LIGHT_RED + '  ' * (16 - position)
-
-                # Add the final element as the number.
-                bar = '{}{:>2}'.format(bar, 1 + week & 63)
-                print('{} {} {}{}'.format(homeAway, result, bar, ansi.RESET_ALL))
-
-        # Show league progress on the html.
-        size = 20
-        width = 30 * size
-        height = 16 * size
-        self.html += '<svg width="{}" height="{}" style="vertical-align:top;" xmlns="http://www.w3.org/2000/svg" version="1.1">'.format(width, height)
-        self.html += '<rect x="0" y="0" width="{}" height="{}" stroke="white" fill="none" />'.format(width-1, height-1)
-        self.html += '<line x1="0" y1="{}" x2="{}" y2="{}" stroke="white" stroke-dasharray="5,5" />'.format(size*3, width, size*3)
-        self.html += '<line x1="0" y1="{}" x2="{}" y2="{}" stroke="white" stroke-dasharray="5,5" />'.format(size*8, width, size*8)
-        self.html += '<line x1="0" y1="{}" x2="{}" y2="{}" stroke="white" stroke-dasharray="5,5" />'.format(size*13, width, size*13)
-        count = -1
-        for week in self.weeks:
-            count += 1
-            position = 0 + (week & 63)
-
-            x = count * size
-            y = position * size
-            if week & 192 == 0:
-                # Lost.
-                colour = 'red'
-            elif week & 192 == 128:
-                # Win.
-                colour = 'green'
-            else:
-                # Draw.
-                colour = 'yellow'
 
-            self.html += '<rect x="{}" y="{}" width="{}" height="{}" stroke="white" fill="{}" />'.format(x, y, size, size, colour)
-        self.html += '</svg>'
+
+    def startProjection(self, maxSamples=2000):
+        '''
+        :param int maxSamples: The maximum number of seasons to simulate.
+
+        Start the projection of the rest of the season in the background when the results of the week are in.
+        The progress page shows it a few pages later.
+        There is no projection without --odds or without a user.
+        '''
+        if self.projection != None:
+            self.projection.cancel()
+        self.projection = None
+        if not self.args.odds or self.isHeadless or isinstance(self.renderer, NullRenderer):
+            return
+        self.projection = projection.SeasonProjection(self)
+        self.projection.start(maxSamples)
+
+
+
+    def displayProjection(self, timeBudget=1.0):
+        '''
+        :param double timeBudget: The maximum time in seconds from the start of the projection so the page stays interactive.
+
+        Display the chance of each team winning the division, promotion and relegation.
+        The projection was started by :py:meth:`startProjection` and is only collected once each week.
+        '''
+        if self.projection == None:
+            return
+        result = self.projection.getResult(timeBudget)
+        if result.numSamples == 0:
+            return
+        self.renderer.render(views.Projection(result, self.team.name, self.division > 1, self.division < 4))
 
 
 
@@ -2220,54 +2024,16 @@ class Game:
         ''' Display the titles held by the team. '''
         if self.titles == 0:
             return
-        # print('titles = {}'.format(self.titles))
-        self.html += '<p>'
-        division = self.titles & 7
-        if division != 0:
-            print('Division {} Champions'.format(division))
-            self.html += 'Division {} Champions<br />'.format(division)
-        if self.titles & 8 == 8:
-            print('League Cup Champions')
-            self.html += 'League Cup Champions<br />'
-        if self.titles & 16 == 16:
-            print('FA Cup Champions')
-            self.html += 'FA Cup Champions<br />'
-        if self.titles & 32 == 32:
-            print('European Cup Champions')
-            self.html += 'European Cup Champions<br />'
-        if self.titles & 64 == 64:
-            print('European Cup Winners Cup Champions')
-            self.html += 'European Cup Winners Cup Champions<br />'
-        if self.titles & 128 == 128:
-            print('UEFA Cup Champions')
-            self.html += 'UEFA Cup Champions<br />'
-        self.html += '</p>'
+        self.renderer.render(views.Titles(self.titles))
 
 
 
     def displayCupStatus(self):
         ''' Display the status of the cup competitions. '''
-        self.html += '<p>'
-        if self.faCup.isIn:
-            print('FA Cup: {}in {}{}.'.format(ansi.GREEN, self.faCup.getRoundName(), ansi.RESET_ALL))
-            self.html += 'FA Cup: <span style="color: green;">in {}</span><br />'.format(self.faCup.getRoundName())
-        else:
-            print('FA Cup: {}out {}{}.'.format(ansi.RED, self.faCup.getRoundName(), ansi.RESET_ALL))
-            self.html += 'FA Cup: <span style="color: red;">out {}</span><br />'.format(self.faCup.getRoundName())
-        if self.leagueCup.isIn:
-            print('League Cup: {}in {}{}.'.format(ansi.GREEN, self.leagueCup.getRoundName(), ansi.RESET_ALL))
-            self.html += 'League Cup: <span style="color: green;">in {}</span><br />'.format(self.leagueCup.getRoundName())
-        else:
-            print('League Cup: {}out {}{}.'.format(ansi.RED, self.leagueCup.getRoundName(), ansi.RESET_ALL))
-            self.html += 'League Cup: <span style="color: red;">out {}</span><br />'.format(self.leagueCup.getRoundName())
+        cups = [self.faCup, self.leagueCup]
         if self.europeanCup != None:
-            if self.europeanCup.isIn:
-                print('{}: {}in {}{}.'.format(self.europeanCup.name, ansi.GREEN, self.europeanCup.getRoundName(), ansi.RESET_ALL))
-                self.html += '{}: <span style="color: green;">in {}</span><br />'.format(self.europeanCup.name, self.europeanCup.getRoundName())
-            else:
-                print('{}: {}out {}{}.'.format(self.europeanCup, ansi.RED, self.europeanCup.getRoundName(), ansi.RESET_ALL))
-                self.html += '{}: <span style="color: red;">out {}</span><br />'.format(self.europeanCup.name, self.europeanCup.getRoundName())
-        self.html += '</p>'
+            cups.append(self.europeanCup)
+        self.renderer.render(views.CupStatus(cups))
 
 
 
@@ -2281,18 +2047,14 @@ class Game:
                 if division < 1:
                     division = 1
                 elif division > 1:
-                    division = random.randint(1, division)
+                    division = self.rng.cup.randint(1, division)
+            if self.cupTeam != None and self.cupTeam.table is self.scratchTable:
+                self.cupTeam.release()
             self.cupTeam = self.activeCup.getTeam(division)
-            self.cupTeam.pos = division
-            self.isHomeMatch = random.randint(1, 2) == 1
+            self.cupDivision = division
+            self.isHomeMatch = self.rng.cup.randint(1, 2) == 1
             self.subStatus = 0
-        division = self.cupTeam.pos
-        print('Cup match aginst team from division {}'.format(division))
-
-        self.html = '<h1 style="display: inline">{} </h1><p style="display: inline">{}</p>'.format(self.activeCup.name, self.activeCup.getRoundName())
-        self.html += self.activeCup.displayResults()
-        print('{} {}'.format(self.activeCup.name, self.activeCup.getRoundName()))
-
+        self.renderer.render(views.CupMatch(self.activeCup, self.cupDivision))
         if self.isHomeMatch:
             self.displayMatch(False, self.teams[self.teamIndex], self.cupTeam)
         else:
@@ -2301,37 +2063,29 @@ class Game:
 
 
     def reportCupMatch(self):
-        division = self.cupTeam.pos
-        print(f'division = {division}')
+        division = self.cupDivision
         self.activeCup.addResult(self.isHomeMatch, self.cupTeam, self.homeScore, self.awayScore)
-        print(self.activeCup.name)
-        self.html = f'<h1>{self.activeCup.name}</h1>'
-        self.html += self.activeCup.displayResults()
+        self.renderer.render(views.CupReport(self.activeCup))
 
         if self.homeScore == self.awayScore:
-            print('Replay')
-            self.html += '<p>Replay</p>'
+            self.renderer.render(views.Message('Replay'))
             self.isHomeMatch = not self.isHomeMatch
         else:
-            cupBonus = 55000 - division * 5000 + random.randint(1, 1000) - random.randint(1, 1000)
+            cupBonus = 55000 - division * 5000 + self.rng.cup.randint(1, 1000) - self.rng.cup.randint(1, 1000)
             if self.activeCup.round == 6:
                 cupBonus += 50000
-            print(f'You made £{cupBonus:,.0f}')
-            self.html += f'<p>You made £{cupBonus:,.0f}</p>'
+            self.renderer.render(views.Message(f'You made £{cupBonus:,.0f}'))
             self.money += cupBonus
-            self.moneyMessage += self.financialLine(self.activeCup.name, cupBonus, 0) + "\n"
+            self.moneyItems.append((self.activeCup.name, cupBonus, 0))
 
             if self.activeCup.isIn:
                 if self.activeCup.round == 6:
-                    print(f'You have won the {self.activeCup.name}')
-                    self.html += f'<p>You have won the {self.activeCup.name}</p>'
+                    self.renderer.render(views.Message(f'You have won the {self.activeCup.name}'))
                 else:
-                    print(f'You qualify for the {self.activeCup.getRoundName()} of the {self.activeCup.name}')
-                    self.html += f'<p>You qualify for the {self.activeCup.getRoundName()} of the {self.activeCup.name}</p>'
+                    self.renderer.render(views.Message(f'You qualify for the {self.activeCup.getRoundName()} of the {self.activeCup.name}'))
                 self.teams[self.teamIndex].moral = min(20, self.teams[self.teamIndex].moral + 3 + self.activeCup.round)
             else:
-                print(f'You are out of the {self.activeCup.name}')
-                self.html += f'<p>You are out of the {self.activeCup.name}</p>'
+                self.renderer.render(views.Message(f'You are out of the {self.activeCup.name}'))
                 self.teams[self.teamIndex].moral = max(1, self.teams[self.teamIndex].moral - 3)
 
         self.wait(True)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the PageBuilder class for the BBC Football Manager program.
+The pages for the wx window are built from fragments that are joined once when the page is finished.
+The wx window loads a shell document once and each page is patched into the shell by :py:data:`SHELL_SCRIPT`.
+The http frontend sends each page in a document with the same script.
+'''
+
+# System libraries.
+import json
+import html
+
+
+
+# The style sheet for every page.  The font size is filled in by :py:func:`getDocument`.
+PAGE_STYLE = 'body {{ font-family: Arial, Helvetica, sans-serif; font-size: {fontSize}px; }} a {{ text-decoration: none; color: inherit; }} a:hover {{ text-decoration: underline; color: inherit; }} a:visited {{ color: inherit; }} h1 {{ padding: 0px 5px 0px 5px; }} p {{ padding: 0px 5px 0px 5px; }} table {{ border-spacing: 0px; border-collapse: collapse; }} td {{ font-family: Arial, Helvetica, sans-serif; font-size: {fontSize}px; padding: 1px 5px 1px 5px; }} '
+
+
+
+def getDocument(body, fontSize=20):
+    ''' Returns the whole html document for the specified body. '''
+    return f'<html><head><style type="text/css" media="screen">{PAGE_STYLE.format(fontSize=fontSize)}</style></head><body style="background: black; color: white;">{body}</body></html>'
+
+
+
+# The script in the shell document.
+# setPage() parses the new page and only changes the parts of the current page that are different.
+# So during a match only the score and the time are changed.
+# The form fields are always replaced so that they do not keep the values from the previous page.
+# A table with a data-timeline attribute is a match.  The script animates the goals and responds with ?fulltime=1 at full time.
+# The responses go to appUrl which is set before the script.
+SHELL_SCRIPT = '''
+var timelineTimer = null;
+
+function patchAttributes(target, source) {
+    for (var index = target.attributes.length - 1; index >= 0; index--) {
+        if (!source.hasAttribute(target.attributes[index].name)) {
+            target.removeAttribute(target.attributes[index].name);
+        }
+    }
+    for (var index = 0; index < source.attributes.length; index++) {
+        var attribute = source.attributes[index];
+        if (target.getAttribute(attribute.name) !== attribute.value) {
+            target.setAttribute(attribute.name, attribute.value);
+        }
+    }
+}
+
+function patchChildren(target, source) {
+    var index = 0;
+    var node = source.firstChild;
+    while (node !== null) {
+        var next = node.nextSibling;
+        var old = target.childNodes[index];
+        if (old === undefined) {
+            target.appendChild(node);
+        } else if (old.nodeType !== node.nodeType || old.nodeName !== node.nodeName || /^(INPUT|SELECT|TEXTAREA)$/.test(node.nodeName)) {
+            target.replaceChild(node, old);
+        } else if (node.nodeType === 1) {
+            patchAttributes(old, node);
+            patchChildren(old, node);
+        } else if (old.nodeValue !== node.nodeValue) {
+            old.nodeValue = node.nodeValue;
+        }
+        node = next;
+        index++;
+    }
+    while (target.childNodes.length > index) {
+        target.removeChild(target.lastChild);
+    }
+}
+
+function startTimeline(table) {
+    var timeline = JSON.parse(table.getAttribute('data-timeline'));
+    var scores = [0, 0];
+    var minute = 0;
+    var next = 0;
+    function getCell(name) {
+        return table.getElementsByClassName(name)[0];
+    }
+    function tick() {
+        minute++;
+        while (next < timeline.length && timeline[next][0] === minute) {
+            var side = timeline[next][1];
+            scores[side]++;
+            getCell(side === 0 ? 'homeScore' : 'awayScore').textContent = scores[side];
+            var scorers = getCell(side === 0 ? 'homeScorers' : 'awayScorers');
+            if (scorers.firstChild !== null) {
+                scorers.appendChild(document.createElement('br'));
+            }
+            scorers.appendChild(document.createTextNode(timeline[next][2]));
+            next++;
+        }
+        if (minute >= 90) {
+            timelineTimer = null;
+            window.location.href = appUrl + '?fulltime=1';
+            return;
+        }
+        getCell('matchTime').textContent = minute === 45 ? 'Half Time' : 'Time ' + minute;
+        timelineTimer = window.setTimeout(tick, minute === 45 ? 4000 : 200);
+    }
+    timelineTimer = window.setTimeout(tick, 200);
+}
+
+function setPage(html, isNewPage) {
+    if (timelineTimer !== null) {
+        window.clearTimeout(timelineTimer);
+        timelineTimer = null;
+    }
+    var page = document.getElementById('page');
+    var template = document.createElement('template');
+    if ('content' in template) {
+        template.innerHTML = html;
+        patchChildren(page, template.content);
+    } else {
+        page.innerHTML = html;
+    }
+    if (isNewPage) {
+        window.scrollTo(0, 0);
+    }
+    var table = page.querySelector('[data-timeline]');
+    if (table !== null) {
+        startTimeline(table);
+    }
+}
+'''
+
+
+
+def getShell(fontSize=20, appUrl='app:', script=''):
+    '''
+    Returns the shell document for the wx window.  The pages are shown in the 'page' element with the setPage() script.
+    The responses from the script go to the appUrl.  The optional script runs after the shell script.
+    '''
+    return getDocument(f'<div id="page"></div><script>var appUrl = {json.dumps(appUrl)};{SHELL_SCRIPT}{script}</script>', fontSize)
+
+
+
+def getScriptString(text):
+    '''
+    Returns the text as a javascript string that is safe inside a script element.
+    The html parser would end the script at </script> or start a comment at <!-- even inside a string.
+    '''
+    return json.dumps(text).replace('</', '<\\/').replace('<!--', '\\u003c!--')
+
+
+
+def getPageScript(body, isNewPage):
+    ''' Returns the script to show the specified page in the shell document. '''
+    return f'setPage({getScriptString(body)}, {"true" if isNewPage else "false"});'
+
+
+
+def getServedPage(body, delay, appUrl, fontSize=20):
+    '''
+    :param string body: The page from the game.
+    :param int delay: The milliseconds before the page responds on its own or None to wait for the user.
+    :param string appUrl: The url for the responses instead of app:.
+    :returns: The whole html document for the page in a shell.
+
+    The links and forms in the page go to the appUrl.
+    '''
+    body = body.replace('="app:', f'="{appUrl}')
+    script = getPageScript(body, True)
+    if delay != None:
+        script += f'window.setTimeout(function () {{ window.location.href = appUrl; }}, {delay});'
+    return getShell(fontSize, appUrl, script)
+
+
+
+def getDataAttribute(name, value):
+    ''' Returns a data attribute for an element with the value encoded as json. '''
+    return f' data-{name}="{html.escape(json.dumps(value))}"'
+
+
+
+class PageBuilder:
+    '''
+    :ivar list fragments: The fragments of the page in order.
+    :ivar string text: The joined page or None when fragments have been added since it was joined.
+
+    Class to build a html page from fragments.
+    Use += to add a fragment.  The fragments are only joined when the page is rendered.
+    '''
+
+
+
+    def __init__(self, text=''):
+        ''' Class constructor.  The page starts with the optional text. '''
+        self.fragments = [text]
+        self.text = text
+
+
+
+    def __iadd__(self, fragment):
+        ''' Add a fragment to the end of the page. '''
+        self.fragments.append(fragment)
+        self.text = None
+        return self
+
+
+
+    def __str__(self):
+        ''' Returns the whole page. '''
+        return self.render()
+
+
+
+    def render(self):
+        ''' Returns the whole page.  The fragments are joined the first time and kept as one fragment. '''
+        if self.text == None:
+            self.text = ''.join(self.fragments)
+            self.fragments = [self.text]
+        return self.text
+
+
+
+    def getByteSize(self):
+        ''' Returns the size of the rendered page in bytes when it is encoded as utf-8. '''
+        return len(self.render().encode('utf-8'))
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the http frontend for the BBC Football Manager program.
+One process serves many games.  Each browser has a session cookie and its own :py:class:`Game`.
+The app: links in the pages become /app requests and the response is passed to Game.getNextPage() like the wx window does.
+A game that is idle at the start of a week is saved to disk and removed from memory.  It is loaded again on the next request.
+'''
+
+# System libraries.
+import asyncio
+import argparse
+import gc
+import http.cookies
+import json
+import os
+import re
+import secrets
+import sys
+import time
+import traceback
+import types
+import urllib.parse
+
+# Application Libraries.
+import html_builder
+from game import Game
+from renderers import HtmlRenderer
+
+
+
+# The objects that are shared by all the games.  These are not counted in the memory of a game.
+SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.CodeType)
+
+# The format of a session id.
+SESSION_ID = re.compile('[0-9a-f]{32}')
+
+
+
+def getObjectSize(root):
+    '''
+    :param object root: The object to measure.
+    :returns: The bytes of memory used by the object and everything that it refers to.
+
+    Each object is only counted once.  Classes, modules and functions are shared so they are not counted.
+    '''
+    seen = set()
+    size = 0
+    pending = [root]
+    while len(pending) > 0:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, SHARED_TYPES):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        pending.extend(gc.get_referents(item))
+    return size
+
+
+
+class Session:
+    '''
+    :ivar string sessionId: The value of the session cookie.
+    :ivar Namespace args: The command line arguments for the game.  Each session has its own save folder.
+    :ivar Game game: The game or None when the game has been saved to disk.
+    :ivar int delay: The milliseconds before the current page responds on its own or None to wait for the user.
+    :ivar float lastTime: The time of the last request.
+    :ivar int numRequests: The number of requests.
+    :ivar int memorySize: The bytes of memory used by the game when it was last measured.
+
+    Class to represent the game of one browser.
+    '''
+
+
+
+    def __init__(self, sessionId, args):
+        ''' Class constructor. '''
+        self.sessionId = sessionId
+        self.args = args
+        self.game = None
+        self.delay = None
+        self.lastTime = time.time()
+        self.numRequests = 0
+        self.memorySize = 0
+
+
+
+    def getNextPage(self, response):
+        ''' Pass the response to the game.  The delay for the next page is kept for when the page is shown. '''
+        self.delay = None
+        responseOptions = self.game.getNextPage(response)
+        if responseOptions[:6] == 'delay:':
+            self.delay = int(responseOptions[7:])
+
+
+
+class SessionPool:
+    '''
+    :ivar Namespace args: The command line arguments.
+    :ivar string directory: The folder for the save folders of the sessions.
+    :ivar float idleSeconds: The seconds without a request before a game is saved to disk.
+    :ivar dict sessions: The :py:class:`Session` objects by session id.
+    :ivar int numEvictions: The number of times a game has been saved to disk.
+    :ivar int numRestores: The number of times a game has been loaded from disk.
+
+    Class to represent the games of all the browsers.
+    '''
+    # The save slot for a game that has been removed from memory.
+    EVICTED_SLOT = 'evicted'
+    # The status of the main menu.  The save file has the whole game at the start of the week.
+    MENU_STATUS = 100
+    # The status of the pages before the game has started.  There is nothing to save.
+    START_STATUS = (0, 1, 2)
+
+
+
+    def __init__(self, args):
+        ''' Class constructor. '''
+        self.args = args
+        self.directory = os.path.join(args.saves, 'sessions')
+        self.idleSeconds = args.idle
+        self.sessions = {}
+        self.numEvictions = 0
+        self.numRestores = 0
+
+
+
+    def getSession(self, sessionId):
+        '''
+        Returns the session for the specified session id with the game in memory.
+        A new session is started when the session id is not known.
+        A session from before the server was restarted is found from its save folder.
+        '''
+        session = None
+        if sessionId != None and SESSION_ID.fullmatch(sessionId):
+            session = self.sessions.get(sessionId)
+            if session == None and os.path.isdir(os.path.join(self.directory, sessionId)):
+                session = Session(sessionId, self.getSessionArgs(sessionId))
+                self.sessions[sessionId] = session
+        if session == None:
+            sessionId = secrets.token_hex(16)
+            session = Session(sessionId, self.getSessionArgs(sessionId))
+            self.sessions[sessionId] = session
+        if session.game == None:
+            if not self.restore(session):
+                session.game = self.newGame(session)
+                session.getNextPage('')
+        session.lastTime = time.time()
+        session.numRequests += 1
+        return session
+
+
+
+    def getSessionArgs(self, sessionId):
+        ''' Returns the command line arguments for the game of the session.  The saved games are in the folder of the session. '''
+        args = argparse.Namespace(**vars(self.args))
+        args.saves = os.path.join(self.directory, sessionId)
+        args.graphical = True
+        return args
+
+
+
+    def newGame(self, session):
+        ''' Returns a new game for the session. '''
+        game = Game(session.args)
+        game.renderer = HtmlRenderer(game)
+        return game
+
+
+
+    def evict(self, session):
+        '''
+        Remove the game of the session from memory.  Returns True if the game was removed.
+        A game at the start of the week is saved to disk.  A game that has not started is forgotten.
+        A game in the middle of the week stays in memory because the save file does not have the match.
+        '''
+        game = session.game
+        if game.status in SessionPool.START_STATUS:
+            del self.sessions[session.sessionId]
+            return True
+        if game.status != SessionPool.MENU_STATUS:
+            return False
+        details = game.getSlotDetails()
+        details['playerName'] = game.playerName
+        details['level'] = game.level
+        details['slotName'] = game.slotName
+        game.saveSlots.write(SessionPool.EVICTED_SLOT, game.getSaveBytes(), details)
+        session.game = None
+        session.delay = None
+        session.memorySize = 0
+        self.numEvictions += 1
+        return True
+
+
+
+    def restore(self, session):
+        ''' Load the game of the session from disk.  Returns False if there is no saved game. '''
+        game = self.newGame(session)
+        details = game.saveSlots.getIndex().get(SessionPool.EVICTED_SLOT)
+        if details == None or not game.load(SessionPool.EVICTED_SLOT):
+            return False
+        game.playerName = details['playerName']
+        game.level = details['level']
+        game.slotName = details['slotName']
+        game.status = SessionPool.MENU_STATUS
+        game.subStatus = 0
+        session.game = game
+        session.getNextPage('')
+        self.numRestores += 1
+        return True
+
+
+
+    def evictIdle(self):
+        '''
+        Remove the games that have been idle for longer than idleSeconds from memory.  Returns the number removed.
+        A game that fails to save is reported and stays in memory until it has been idle again.
+        '''
+        idleTime = time.time() - self.idleSeconds
+        count = 0
+        for session in list(self.sessions.values()):
+            if session.game != None and session.lastTime < idleTime:
+                try:
+                    if self.evict(session):
+                        count += 1
+                except Exception:
+                    print(f'Error evicting session {session.sessionId}.')
+                    traceback.print_exc()
+                    session.lastTime = time.time()
+        return count
+
+
+
+    def measure(self):
+        ''' Measure the memory used by each game in memory. '''
+        for session in self.sessions.values():
+            if session.game != None:
+                session.memorySize = getObjectSize(session.game)
+
+
+
+    def getStatistics(self):
+        ''' Returns a dictionary with the number of sessions and the memory that they use. '''
+        self.measure()
+        now = time.time()
+        sizes = [session.memorySize for session in self.sessions.values() if session.game != None]
+        statistics = {
+            'sessions': len(self.sessions),
+            'inMemory': len(sizes),
+            'onDisk': len(self.sessions) - len(sizes),
+            'memoryBytes': sum(sizes),
+            'averageBytes': sum(sizes) // len(sizes) if len(sizes) > 0 else 0,
+            'largestBytes': max(sizes, default=0),
+            'evictions': self.numEvictions,
+            'restores': self.numRestores,
+            'idleSeconds': self.idleSeconds,
+            'games': [
+                {
+                    'status': None if session.game == None else session.game.status,
+                    'bytes': session.memorySize,
+                    'requests': session.numRequests,
+                    'idleSeconds': round(now - session.lastTime, 1)
+                }
+                for session in self.sessions.values()
+            ]
+        }
+        try:
+            import resource
+            # Kilobytes on Linux.
+            statistics['maxResidentKilobytes'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except ImportError:
+            pass
+        return statistics
+
+
+
+class HttpFrontend:
+    '''
+    :ivar SessionPool pool: The games.
+    :ivar string host: The address to listen on.
+    :ivar int port: The port to listen on.
+
+    Class to serve the games over http.
+    GET / shows the current page of the game.
+    GET /app?... passes the response to the game and redirects back to / so that reloading the page does not repeat the response.
+    GET /status returns the sessions and their memory as json.
+    '''
+    APP_URL = '/app'
+    COOKIE_NAME = 'session'
+
+
+
+    def __init__(self, args, host='127.0.0.1'):
+        ''' Class constructor. '''
+        self.pool = SessionPool(args)
+        self.host = host
+        self.port = args.serve
+
+
+
+    def run(self):
+        ''' Serve the games until the program is stopped. '''
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+
+
+
+    async def serve(self):
+        ''' Listen for requests and evict the idle games. '''
+        server = await asyncio.start_server(self.handleClient, self.host, self.port)
+        print(f'Serving the BBC Football Manager on http://{self.host}:{self.port}/')
+        async with server:
+            evictTask = asyncio.create_task(self.evictLoop())
+            try:
+                await server.serve_forever()
+            finally:
+                evictTask.cancel()
+
+
+
+    async def evictLoop(self):
+        ''' Check for idle games a few times in each idle period.  An error does not stop the checks. '''
+        while True:
+            await asyncio.sleep(max(1, self.pool.idleSeconds / 4))
+            try:
+                self.pool.evictIdle()
+            except Exception:
+                traceback.print_exc()
+
+
+
+    async def handleClient(self, reader, writer):
+        ''' Handle one http request on the connection. '''
+        try:
+            requestLine = await reader.readline()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            parts = requestLine.decode('latin-1').split()
+            if len(parts) != 3:
+                status, extraHeaders, body = 400, [], b'Bad Request'
+            elif parts[0] not in ('GET', 'HEAD'):
+                status, extraHeaders, body = 405, [('Allow', 'GET, HEAD')], b'Method Not Allowed'
+            else:
+                status, extraHeaders, body = self.getResponse(parts[1], headers.get('cookie', ''))
+                if parts[0] == 'HEAD':
+                    body = b''
+            writer.write(self.getHeader(status, extraHeaders, len(body)) + body)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+
+    def getResponse(self, target, cookieHeader):
+        ''' Returns the (status, headers, body) for a GET of the specified target. '''
+        url = urllib.parse.urlsplit(target)
+        if url.path == '/status':
+            return 200, [('Content-Type', 'application/json')], json.dumps(self.pool.getStatistics(), indent=1).encode('utf-8')
+        if url.path not in ('/', HttpFrontend.APP_URL):
+            return 404, [], b'Not Found'
+
+        cookie = http.cookies.SimpleCookie()
+        try:
+            cookie.load(cookieHeader)
+        except http.cookies.CookieError:
+            pass
+        sessionId = cookie[HttpFrontend.COOKIE_NAME].value if HttpFrontend.COOKIE_NAME in cookie else None
+        try:
+            session = self.pool.getSession(sessionId)
+            headers = []
+            if session.sessionId != sessionId:
+                headers.append(('Set-Cookie', f'{HttpFrontend.COOKIE_NAME}={session.sessionId}; Path=/; HttpOnly; SameSite=Lax'))
+            if url.path == HttpFrontend.APP_URL:
+                # The same response as an app: link in the wx window.
+                session.getNextPage('?' + url.query if url.query != '' else '')
+                headers.append(('Location', '/'))
+                return 303, headers, b''
+            headers.append(('Content-Type', 'text/html; charset=utf-8'))
+            headers.append(('Cache-Control', 'no-store'))
+            return 200, headers, html_builder.getServedPage(session.game.html.render(), session.delay, HttpFrontend.APP_URL).encode('utf-8')
+        except Exception:
+            traceback.print_exc()
+            return 500, [], b'Internal Server Error'
+
+
+
+    def getHeader(self, status, headers, contentLength):
+        ''' Returns the status line and the headers of the http response. '''
+        reasons = {200: 'OK', 303: 'See Other', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+        lines = [f'HTTP/1.1 {status} {reasons[status]}']
+        for name, value in headers:
+            lines.append(f'{name}: {value}')
+        lines.append(f'Content-Length: {contentLength}')
+        lines.append('Connection: close')
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+
+def run(args):
+    ''' Serve the games on the port in args.serve. '''
+    HttpFrontend(args).run()
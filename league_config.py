@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the LeagueConfig class for the the BBC Football Manager program.
+This holds the size of the league and the length of the season.
+The BBC Basic version has 16 teams, 3 up, 3 down and 30 matches.
+'''
+
+# Application Libraries.
+import save_format
+
+
+
+class LeagueConfig:
+    '''
+    :ivar int numTeams: The number of teams in each division.  This must be even.
+    :ivar int numPromoted: The number of teams that go up a division at the end of the season.
+    :ivar int numRelegated: The number of teams that go down a division at the end of the season.
+    :ivar int matchesPerSeason: The number of league matches in a season.
+
+    Class to represent the configuration of the league in the BBC Football Manager game.
+    '''
+
+
+
+    def __init__(self, numTeams=16, numPromoted=3, numRelegated=3, matchesPerSeason=None):
+        '''
+        Class constructor.
+        The season defaults to every team playing every other team home and away.
+        '''
+        if numTeams < 2 or numTeams % 2 != 0:
+            raise ValueError(f'The number of teams must be even, not {numTeams}.')
+        if numPromoted + numRelegated >= numTeams:
+            raise ValueError(f'{numTeams} teams is not enough for {numPromoted} up and {numRelegated} down.')
+        self.numTeams = numTeams
+        self.numPromoted = numPromoted
+        self.numRelegated = numRelegated
+        if matchesPerSeason == None:
+            matchesPerSeason = 2 * (numTeams - 1)
+        self.matchesPerSeason = matchesPerSeason
+
+
+
+    def getFirstRelegated(self):
+        ''' Returns the index in the table of the first relegated team. '''
+        return self.numTeams - self.numRelegated
+
+
+
+    def dump(self, writer):
+        ''' Write the configuration into the specified :py:class:`SaveWriter`.  The fields are in the same order as the constructor parameters. '''
+        writer.addObject(save_format.CONFIG, self)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the LeagueTable class for the the BBC Football Manager program.
+The table is kept in order as the results come in rather than sorted again every week.
+'''
+
+# System libraries.
+import bisect
+
+
+
+class LeagueTable:
+    '''
+    :ivar list teams: The teams in table order.
+    :ivar list keys: The sort key of each team.  This is (-pts, -difference, index) so the keys are in ascending order.
+    :ivar dict indexes: The index of each team in the table by name.
+    :ivar set changed: The names of the teams whose points have changed since the last update.
+
+    Class to represent a league table in the BBC Football Manager game.
+    The order is the same as a stable sort on (pts, difference) in reverse.
+    Teams with the same points and goal difference stay in their previous order.
+    '''
+    # When more than this fraction of the teams have changed one sort is quicker than moving each team.
+    SORT_FRACTION = 0.125
+
+
+
+    def __init__(self):
+        ''' Class constructor. '''
+        self.teams = []
+        self.keys = []
+        self.indexes = {}
+        self.changed = set()
+
+
+
+    def rebuild(self, teams):
+        '''
+        :param list teams: The teams in the division.  This list is sorted in place and becomes the table.
+
+        Sort the whole table.  This is needed when the teams in the division change.
+        '''
+        teams.sort(key=lambda team: (team.pts, team.difference), reverse=True)
+        self.teams = teams
+        self.keys = [self.getKey(team, index) for index, team in enumerate(teams)]
+        self.indexes = {team.name: index for index, team in enumerate(teams)}
+        for index, team in enumerate(teams):
+            team.position = index + 1
+        self.changed = set()
+
+
+
+    def getKey(self, team, index):
+        ''' Returns the sort key for the team at the specified index. '''
+        return (-team.pts, -team.difference, index)
+
+
+
+    def setChanged(self, team):
+        ''' Record that the points of the team have changed. '''
+        self.changed.add(team.name)
+
+
+
+    def getIndex(self, name):
+        ''' Returns the index in the table of the team with the specified name. '''
+        return self.indexes.get(name)
+
+
+
+    def update(self):
+        '''
+        Move the changed teams to their new places in the table.
+        When only a few teams have changed they are removed and inserted again with a bisect and only the part of the table between the old and new places is numbered again.
+        Otherwise the whole table is sorted once on the same keys.
+        '''
+        if len(self.changed) == 0:
+            return
+        if len(self.changed) > LeagueTable.SORT_FRACTION * len(self.teams):
+            self.changed = set()
+            # The previous index keeps teams with the same points and difference in the previous order.
+            self.keys = [self.getKey(team, index) for index, team in enumerate(self.teams)]
+            order = sorted(range(len(self.teams)), key=self.keys.__getitem__)
+            # The list is changed in place because the division holds the same list.
+            self.teams[:] = [self.teams[index] for index in order]
+            first = 0
+            last = len(self.teams) - 1
+        else:
+            oldIndexes = sorted(self.indexes[name] for name in self.changed)
+            self.changed = set()
+            movedTeams = []
+            for index in reversed(oldIndexes):
+                movedTeams.append((self.teams.pop(index), index))
+                del self.keys[index]
+
+            # The old index keeps teams with the same points and difference in the previous order.
+            firstInsert = len(self.teams)
+            lastInsert = 0
+            for team, oldIndex in movedTeams:
+                key = self.getKey(team, oldIndex)
+                index = bisect.bisect_left(self.keys, key)
+                self.keys.insert(index, key)
+                self.teams.insert(index, team)
+                firstInsert = min(firstInsert, index)
+                lastInsert = max(lastInsert, index)
+
+            # A team inserted later can push an earlier one down by one place.
+            first = min(oldIndexes[0], firstInsert)
+            last = min(len(self.teams) - 1, max(oldIndexes[-1], lastInsert + len(movedTeams) - 1))
+
+        # Number the teams that might have moved.
+        for index in range(first, last + 1):
+            team = self.teams[index]
+            team.position = index + 1
+            self.keys[index] = self.getKey(team, index)
+            self.indexes[team.name] = index
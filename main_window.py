@@ -13,6 +13,7 @@ import wx           # Try package python3-wxpython4 or python -m pip install wxP
 import wx.html2     # Try package python3-wxpython4-webview
 
 # Application libraries.
+import html_builder
 
 
 
@@ -20,6 +21,9 @@ class WxMainWindow(wx.Frame):
     '''
     :ivar int noEvents: Positive to ignore signals.
     :ivar wx.WebView browser: The WebView object to display the html on the main window.
+    :ivar bool isShellLoaded: True when the shell document has loaded and pages can be patched into it.
+    :ivar string shownPage: The page that is shown in the shell.
+    :ivar int shownStatus: The game status of the page that is shown in the shell.
 
     Class to represent the wxPython main window for the BBC Football Manager program.
     '''
@@ -47,6 +51,9 @@ class WxMainWindow(wx.Frame):
         # Intialise the application.
         self.noEvents = 0
         self.timer = None
+        self.isShellLoaded = False
+        self.shownPage = None
+        self.shownStatus = None
 
         # Build the menu bar.
         menuBar = wx.MenuBar()
@@ -60,10 +67,15 @@ class WxMainWindow(wx.Frame):
         sizer = wx.BoxSizer(wx.VERTICAL)
         self.browser = wx.html2.WebView.New(self)
         self.Bind(wx.html2.EVT_WEBVIEW_NAVIGATING, self._webViewNavigating, self.browser)
+        self.Bind(wx.html2.EVT_WEBVIEW_LOADED, self._webViewLoaded, self.browser)
         sizer.Add(self.browser, 1, wx.EXPAND, 10)
         self.SetSizer(sizer)
         self.SetSize((700, 700))
 
+        # Load the shell document once.  The pages are patched into the shell.
+        fontSize = 20
+        self.browser.SetPage(html_builder.getShell(fontSize), 'file:///')
+
         # Display the current page.
         self.displayNextPage('')
 
@@ -185,6 +197,14 @@ class WxMainWindow(wx.Frame):
 
 
 
+    def _webViewLoaded(self, _event):
+        ''' Signal handler for the loaded event on the wx.html2.WebView control.  The shell is ready for the pages. '''
+        self.isShellLoaded = True
+        self.shownPage = None
+        self.displayCurrentPage()
+
+
+
     def _onTimer(self, _event):
         ''' Signal handler for the timer. '''
         self.timer.Stop()
@@ -223,14 +243,21 @@ class WxMainWindow(wx.Frame):
         #if self.application.database.debug:
         #    print("displayCurrentPage()")
 
+        # The page is shown when the shell has loaded.
+        if not self.isShellLoaded:
+            return
+
         # No events / signals until this finishes.
         self.noEvents += 1
 
-        fontSize = 20
-
-        # Display the html content on the wx.html2.WebView control.
-        html = f'<html><head><style type="text/css" media="screen">body {{ font-family: Arial, Helvetica, sans-serif; font-size: {fontSize}px; }} a {{ text-decoration: none; color: inherit; }} a:hover {{ text-decoration: underline; color: inherit; }} a:visited {{ color: inherit; }} h1 {{ padding: 0px 5px 0px 5px; }} p {{ padding: 0px 5px 0px 5px; }} table {{ border-spacing: 0px; border-collapse: collapse; }} td {{ font-family: Arial, Helvetica, sans-serif; font-size: {fontSize}px; padding: 1px 5px 1px 5px; }} </style></head><body style="background: black; color: white;">{self.game.html}</body></html>'
-        self.browser.SetPage(html, 'file:///')
+        # Patch the html content into the shell on the wx.html2.WebView control.
+        # Only the parts of the page that have changed are updated.
+        html = self.game.html.render()
+        if html != self.shownPage:
+            isNewPage = self.game.status != self.shownStatus
+            self.browser.RunScript(html_builder.getPageScript(html, isNewPage))
+            self.shownPage = html
+            self.shownStatus = self.game.status
 
         # Remove the wait cursor.
 
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the batch match engine for the BBC Football Manager program.
+This plays many fixtures in a single call.
+NumPy is used when it is available, otherwise the fixtures are played one at a time.
+'''
+
+# System libraries.
+import math
+import random
+import bisect
+import collections
+
+# NumPy is optional.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+
+def expectedGoals(bonus, attack, midfield, moral, opponentDefence, opponentMidfield, opponentEnergy):
+    ''' The mean number of goals for a team from DEFPROCMATCH (Line 6920) in the BBC Basic version. '''
+    # A team without any defenders still has a goal keeper.
+    if isinstance(opponentDefence, (int, float)):
+        opponentDefence = max(opponentDefence, 1)
+    else:
+        opponentDefence = numpy.maximum(opponentDefence, 1)
+    return bonus + (4.0 * attack / opponentDefence) * midfield / (midfield + opponentMidfield) + (moral - 10.0) / 40.0 - (opponentEnergy - 100.0) / 400.0
+
+
+
+def poisson(mean, probability):
+    '''
+    :param double mean: Specifies the mean value of the poisson distribution.
+    :param double probability: Specifies the point on the cumulative distribution function (cdf) to return the value from.
+
+    Replacement for DEFNPOIS (Line 7040) in the BBC Basic version.
+    '''
+    answer = 0
+    # 'pdf' is the probability distribution function at this 'answer'.
+    pdf = math.exp(-mean)
+    if probability < pdf:
+        return answer
+    cdf = pdf
+    while True:
+        answer += 1
+        pdf *= mean / answer
+        cdf += pdf
+        if probability < cdf:
+            break
+    return answer
+
+
+
+def buildCdfTable(mean):
+    '''
+    :param double mean: Specifies the mean value of the poisson distribution.
+    :returns: A tuple of the cumulative distribution function (cdf) at 0, 1, 2, ... goals.
+
+    The table stops when the remaining probability is negligible.
+    '''
+    pdf = math.exp(-mean)
+    cdf = pdf
+    table = [cdf]
+    answer = 0
+    while cdf < PoissonSampler.TAIL and (pdf > 0 or answer < mean):
+        answer += 1
+        pdf *= mean / answer
+        cdf += pdf
+        table.append(cdf)
+    return tuple(table)
+
+
+
+class PoissonSampler:
+    '''
+    :ivar double quantum: The means are rounded to a multiple of this value.
+    :ivar int maxTables: The maximum number of tables in the cache.
+    :ivar int hits: The number of samples that used a cached table.
+    :ivar int misses: The number of samples that had to build a table.
+    :ivar int evictions: The number of tables removed from the cache.
+    :ivar int batchSamples: The number of samples with a quantized mean from :py:func:`poissonBatch`.  These do not use the cache.
+
+    Class to represent a poisson sampler with a cache of cumulative distribution tables.
+    The mean is quantized so that the same few tables are used over and over.
+    The sample is a bisect into the cached table.
+    The batch path quantizes the means in the same way so the goals do not depend on NumPy.
+    '''
+    TAIL = 1.0 - 1e-12
+
+
+
+    def __init__(self, quantum=0.01, maxTables=4096):
+        ''' Class constructor. '''
+        self.quantum = quantum
+        self.maxTables = maxTables
+        self.tables = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.batchSamples = 0
+
+
+
+    def getTable(self, mean):
+        ''' Returns the cdf table for the quantized mean.  The least recently used table is evicted when the cache is full. '''
+        key = round(mean / self.quantum)
+        table = self.tables.get(key)
+        if table is None:
+            self.misses += 1
+            table = buildCdfTable(key * self.quantum)
+            self.tables[key] = table
+            if len(self.tables) > self.maxTables:
+                self.tables.popitem(last=False)
+                self.evictions += 1
+        else:
+            self.hits += 1
+            self.tables.move_to_end(key)
+        return table
+
+
+
+    def quantizeBatch(self, means):
+        '''
+        :param array means: The mean value of the poisson distribution for each fixture.
+        :returns: The means rounded in the same way as :py:meth:`getTable`.
+
+        numpy.round() rounds half to even the same as round().
+        '''
+        self.batchSamples += len(means)
+        return numpy.round(means / self.quantum) * self.quantum
+
+
+
+    def sample(self, mean, probability):
+        '''
+        :param double mean: Specifies the mean value of the poisson distribution.
+        :param double probability: Specifies the point on the cdf to return the value from.
+
+        Cached version of :py:func:`poisson`.
+        '''
+        table = self.getTable(mean)
+        return min(bisect.bisect_right(table, probability), len(table) - 1)
+
+
+
+    def getStatistics(self):
+        ''' Returns a dictionary of the cache counters. '''
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'tables': len(self.tables),
+            'batchSamples': self.batchSamples,
+            'hitRate': round(self.hits / total, 4) if total > 0 else 0.0
+        }
+
+
+
+def updateMoral(homeMoral, awayMoral, homeGoals, awayGoals):
+    ''' Returns the moral of the two teams after the match. '''
+    if homeGoals == awayGoals:
+        return 10, 10
+    if homeGoals > awayGoals:
+        homeMoral = min(max(homeMoral, 10) + homeGoals - awayGoals, 20)
+        awayMoral = max(min(awayMoral, 10) + awayGoals - homeGoals, 1)
+    else:
+        homeMoral = max(min(homeMoral, 10) + homeGoals - awayGoals, 1)
+        awayMoral = min(max(awayMoral, 10) + awayGoals - homeGoals, 20)
+    return homeMoral, awayMoral
+
+
+
+def poissonBatch(means, probabilities):
+    '''
+    :param array means: Specifies the mean value of the poisson distribution for each fixture.
+    :param array probabilities: Specifies the point on the cdf for each fixture.
+    :returns: The number of goals for each fixture.
+
+    Inverse cdf of the poisson distribution for many fixtures at once.
+    This loops over the number of goals rather than over the fixtures.
+    '''
+    means = numpy.asarray(means, dtype=numpy.float64)
+    probabilities = numpy.asarray(probabilities, dtype=numpy.float64)
+    # numpy.exp() can differ from math.exp() in the last bit, so the first term is from math.exp() the same as poisson().
+    pdf = numpy.array([math.exp(-mean) for mean in means.tolist()], dtype=numpy.float64)
+    cdf = pdf.copy()
+    answers = numpy.zeros(means.shape, dtype=numpy.int64)
+    isOpen = probabilities >= cdf
+    answer = 0
+    while isOpen.any():
+        answer += 1
+        pdf = pdf * (means / answer)
+        cdf = cdf + pdf
+        answers[isOpen] = answer
+        isOpen &= probabilities >= cdf
+    return answers
+
+
+
+def updateMoralBatch(homeMoral, awayMoral, homeGoals, awayGoals):
+    ''' Returns the moral of the teams after many fixtures.  This follows :py:func:`updateMoral`. '''
+    homeMoral = numpy.asarray(homeMoral)
+    awayMoral = numpy.asarray(awayMoral)
+    difference = homeGoals - awayGoals
+    isHomeWin = difference > 0
+    isAwayWin = difference < 0
+    # A draw sets the moral of both teams to 10.
+    newHomeMoral = numpy.where(isHomeWin, numpy.minimum(numpy.maximum(homeMoral, 10) + difference, 20), 10)
+    newAwayMoral = numpy.where(isHomeWin, numpy.maximum(numpy.minimum(awayMoral, 10) - difference, 1), 10)
+    newHomeMoral = numpy.where(isAwayWin, numpy.maximum(numpy.minimum(homeMoral, 10) + difference, 1), newHomeMoral)
+    newAwayMoral = numpy.where(isAwayWin, numpy.minimum(numpy.maximum(awayMoral, 10) - difference, 20), newAwayMoral)
+    return newHomeMoral, newAwayMoral
+
+
+
+def matchBatch(home, away, homeBonus, awayBonus, homeProbabilities=None, awayProbabilities=None, sampler=None):
+    '''
+    :param dict home: Arrays of 'attack', 'midfield', 'defence', 'moral' and 'energy' for the home teams.
+    :param dict away: Arrays of 'attack', 'midfield', 'defence', 'moral' and 'energy' for the away teams.
+    :param double homeBonus: The bonus for the home teams.
+    :param double awayBonus: The bonus for the away teams.
+    :param array homeProbabilities: Optional points on the cdf for the home goals.  Drawn when not specified.
+    :param array awayProbabilities: Optional points on the cdf for the away goals.  Drawn when not specified.
+    :param PoissonSampler sampler: Optional cached poisson sampler.  The means are quantized by the sampler in both paths.
+    :returns: The home goals, away goals, home moral and away moral for each fixture.
+
+    Batch version of DEFPROCMATCH (Line 6920) in the BBC Basic version.
+    '''
+    numFixtures = len(home['attack'])
+    if homeProbabilities is None or awayProbabilities is None:
+        homeProbabilities, awayProbabilities = drawProbabilities(numFixtures)
+
+    if numpy is None:
+        # Play the fixtures one at a time.
+        samplePoisson = poisson if sampler is None else sampler.sample
+        homeGoals = []
+        awayGoals = []
+        homeMoral = []
+        awayMoral = []
+        for index in range(numFixtures):
+            homeAverageGoals = expectedGoals(homeBonus, home['attack'][index], home['midfield'][index], home['moral'][index], away['defence'][index], away['midfield'][index], away['energy'][index])
+            awayAverageGoals = expectedGoals(awayBonus, away['attack'][index], away['midfield'][index], away['moral'][index], home['defence'][index], home['midfield'][index], home['energy'][index])
+            goals = (samplePoisson(homeAverageGoals, homeProbabilities[index]), samplePoisson(awayAverageGoals, awayProbabilities[index]))
+            moral = updateMoral(home['moral'][index], away['moral'][index], goals[0], goals[1])
+            homeGoals.append(goals[0])
+            awayGoals.append(goals[1])
+            homeMoral.append(moral[0])
+            awayMoral.append(moral[1])
+        return homeGoals, awayGoals, homeMoral, awayMoral
+
+    homeColumns = {key: numpy.asarray(value, dtype=numpy.float64) for key, value in home.items()}
+    awayColumns = {key: numpy.asarray(value, dtype=numpy.float64) for key, value in away.items()}
+    homeAverageGoals = expectedGoals(homeBonus, homeColumns['attack'], homeColumns['midfield'], homeColumns['moral'], awayColumns['defence'], awayColumns['midfield'], awayColumns['energy'])
+    awayAverageGoals = expectedGoals(awayBonus, awayColumns['attack'], awayColumns['midfield'], awayColumns['moral'], homeColumns['defence'], homeColumns['midfield'], homeColumns['energy'])
+    if sampler is not None:
+        homeAverageGoals = sampler.quantizeBatch(homeAverageGoals)
+        awayAverageGoals = sampler.quantizeBatch(awayAverageGoals)
+    homeGoals = poissonBatch(homeAverageGoals, homeProbabilities)
+    awayGoals = poissonBatch(awayAverageGoals, awayProbabilities)
+    homeMoral, awayMoral = updateMoralBatch(numpy.asarray(home['moral']), numpy.asarray(away['moral']), homeGoals, awayGoals)
+    return homeGoals, awayGoals, homeMoral, awayMoral
+
+
+
+def drawProbabilities(numFixtures):
+    '''
+    Returns the points on the cdf for the home and away goals of many fixtures.
+    Each point is the average of two uniform random numbers as multiRandom(1, 2) / 2 in the Game class.
+    '''
+    if numpy is None:
+        homeProbabilities = [(random.uniform(0, 1) + random.uniform(0, 1)) / 2 for _ in range(numFixtures)]
+        awayProbabilities = [(random.uniform(0, 1) + random.uniform(0, 1)) / 2 for _ in range(numFixtures)]
+        return homeProbabilities, awayProbabilities
+    uniform = numpy.random.default_rng().random((2, numFixtures, 2))
+    return uniform[0].sum(axis=1) / 2, uniform[1].sum(axis=1) / 2
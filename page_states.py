@@ -0,0 +1,832 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the page states for the BBC Football Manager program.
+The wx window is a state machine.  Game.status is the current state and each state has a :py:class:`PageState` handler in :py:data:`STATES`.
+The handler applies the response from the previous page and renders the page for the new state.
+The :py:class:`StateTrace` records the time taken by each state.
+'''
+
+# System libraries.
+import collections
+
+# Application Libraries.
+import ansi
+import club_catalog
+
+
+
+class PageState:
+    '''
+    Class to represent a state of the game in the wx window.
+    The base class ignores the response and renders nothing.
+    '''
+
+
+
+    def onResponse(self, game, parameters, response):
+        '''
+        :param Game game: The game.
+        :param dict parameters: The parameters of the response.
+        :param string response: The response from the page of this state.
+
+        Apply the response to the game.  This sets game.status to the next state.
+        '''
+        pass
+
+
+
+    def render(self, game):
+        ''' Render the page for this state into game.html.  Returns the response options for the page. '''
+        return ''
+
+
+
+class AdvanceState(PageState):
+    '''
+    Class to represent a state that moves to NEXT_STATUS whatever the response.
+    '''
+    NEXT_STATUS = 100
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Move to the next state. '''
+        game.status = self.NEXT_STATUS
+
+
+
+class ContinueState(PageState):
+    '''
+    Class to represent a state that moves to NEXT_STATUS when the response is 'c'.
+    '''
+    NEXT_STATUS = 100
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Move to the next state on continue. '''
+        if 'response' in parameters:
+            if parameters['response'] == 'c':
+                game.status = self.NEXT_STATUS
+
+
+
+class UnknownState(PageState):
+    '''
+    Class to represent a status that has no handler.
+    '''
+
+
+
+    def render(self, game):
+        ''' Render the error page. '''
+        game.html = f'<p>Error Help.</p><p>status = {game.status}</p>'
+        return ''
+
+
+
+class EnterNameState(PageState):
+    '''
+    Class to represent the initial page.  Get player name and level.
+    '''
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Enter player details. '''
+        if response != '':
+            if 'name' in parameters:
+                game.playerName = parameters['name']
+                game.playerName = game.playerName.replace('+', ' ')
+                if game.playerName == '':
+                    game.playerName = 'Steve'
+                game.status = 1
+            game.level = 1
+            if 'level' in parameters:
+                game.level = parameters['level']
+            if 'load' in parameters:
+                if parameters['load'] != '':
+                    if game.load(parameters['load']):
+                        game.status = 100
+
+
+
+    def render(self, game):
+        ''' Render the initial page. '''
+        game.html = ''
+        game.football()
+        game.html += '<form action="app:" method="get"><p>Please enter your name <input type="text" name="name" /></p>'
+        game.html += '<p>Please select your level <select name="level"><option value="1">1</option><option value="2">2</option><option value="3">3</option><option value="4">4</option></select></p>'
+        game.html += '<p>Do you want to load a game <select name="load"><option value="">No</option>'
+        for slotName, details in game.saveSlots.getSlots():
+            game.html += f'<option value="{slotName}">{game.saveSlots.getDescription(slotName, details)}</option>'
+        game.html += '</select></p>'
+        game.html += '<p><input type="submit" name="ok" value="OK" /></p>'
+        game.html += '</form>'
+        return ''
+
+
+
+class SelectTeamState(PageState):
+    '''
+    Class to represent the second initial page.  Get the players team.
+    '''
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Select team. '''
+        if 'team' in parameters:
+            teamIndex = int(parameters['team'])
+            if teamIndex == 0:
+                game.status = 2
+            else:
+                game.teamName, game.teamColour = club_catalog.getClub(teamIndex // 100, teamIndex % 100)
+                game.status = 100
+                game.newGame(True)
+                game.newSeason()
+
+
+
+    def render(self, game):
+        ''' Render the list of teams. '''
+        game.html = '<form action="app:" method="get">'
+        game.html += '<p>Please select your team <select name="team">'
+        game.html += '<option value="0">Own Team</option>'
+        game.html += club_catalog.getTeamOptions()
+        game.html += '</select>'
+        game.html += '<p><input type="submit" name="ok" value="OK" /></p>'
+        game.html += '</form>'
+        return ''
+
+
+
+class NameTeamState(PageState):
+    '''
+    Class to represent the optional initial page.  Name own team.
+    '''
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Enter own team name. '''
+        if 'name' in parameters:
+            game.teamName = parameters['name']
+            game.teamName = game.teamName.replace('+', ' ')
+            if game.teamName == '':
+                game.teamName = 'Racing Warwick'
+            game.teamColour = ansi.CYAN
+            game.status = 100
+            game.newGame(True)
+            game.newSeason()
+
+
+
+    def render(self, game):
+        ''' Render the team name form. '''
+        game.html = '<form action="app:" method="get">'
+        game.html += '<p>Please enter your team name <input type="text" name="name"></p>'
+        game.html += '<p><input type="submit" name="ok" value="OK" /></p>'
+        game.html += '</form>'
+        return ''
+
+
+
+class MainMenuState(PageState):
+    '''
+    Class to represent the main menu at the start of each week.
+    '''
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Select an option from the menu. '''
+        if 'response' in parameters:
+            response = int(parameters['response'])
+            if response == 1:
+                # Sell Player
+                game.status = 110
+            if response == 2:
+                # Bank
+                game.status = 120
+            elif response == 4:
+                game.numMatches += 1
+                game.rng.setPosition(game.season, game.numMatches)
+
+                # Decide if a cup match.
+                if game.numMatches % 6 == 2:
+                    # League Cup.
+                    if game.leagueCup.isIn:
+                        game.activeCup = game.leagueCup
+                        game.status = 200
+                        game.subStatus = -1
+                if game.numMatches % 6 == 4:
+                    # FA Cup.
+                    if game.faCup.isIn:
+                        game.activeCup = game.faCup
+                        game.status = 200
+                        game.subStatus = -1
+                if game.numMatches % 6 == 0 or (game.numMatches % 6 == 3 and game.args.debug):
+                    # European Cup.
+                    if game.europeanCup != None:
+                        if game.europeanCup.isIn:
+                            game.activeCup = game.europeanCup
+                            game.status = 200
+                            game.subStatus = -1
+
+                # League match.
+                if game.status == 100:
+                    game.status = 300
+                    game.subStatus = -1
+            elif response == 5:
+                # Save game.
+                game.save(True)
+                game.status = 150
+            elif response == 7:
+                # Show League.
+                game.status = 170
+
+
+
+    def render(self, game):
+        ''' Render the main menu. '''
+        game.html = '<h1 style="display: inline">{} </h1><p style="display: inline">Manager {}</p>'.format(game.teamName, game.playerName)
+        game.html += '<p>Level {}</p>'.format(game.level)
+        game.displayCupStatus()
+        game.displayTitles()
+        game.html += '<p style="margin-top:10px;"><a href="app:?response=1">1 .. Sell Players / View Squad</a><br />'
+        game.html += '<a href="app:?response=2">2 .. Bank</a><br />'
+        game.html += '<a href="app:?response=3">3 .. Rename Player</a><br />'
+        game.html += '<a href="app:?response=4">4 .. Continue</a><br />'
+        game.html += '<a href="app:?response=5">5 .. Save Game</a><br />'
+        game.html += '<a href="app:?response=6">6 .. Restart</a><br />'
+        game.html += '<a href="app:?response=7">7 .. League Table</a><br />'
+        return ''
+
+
+
+class SellPlayerState(PageState):
+    '''
+    Class to represent the list of players to sell.
+    '''
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Select a player to sell. '''
+        if 'player' in parameters:
+            player = int(parameters['player'])
+            game.subStatus = player
+            game.status = 115
+        if 'response' in parameters:
+            if parameters['response'] == 'c':
+                game.status = 100
+
+
+
+    def render(self, game):
+        ''' Render the squad. '''
+        game.htmlSellPlayerPart1()
+        return ''
+
+
+
+class ConfirmSaleState(PageState):
+    '''
+    Class to represent the offer for the selected player.
+    '''
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Accept or reject the offer. '''
+        if 'response' in parameters:
+            if parameters['response'] == 'y':
+                game.htmlSellPlayerPart3()
+                game.status = 100
+            if parameters['response'] == 'n':
+                game.status = 100
+
+
+
+    def render(self, game):
+        ''' Render the offer. '''
+        game.htmlSellPlayerPart2()
+        return ''
+
+
+
+class BankState(PageState):
+    '''
+    Class to represent the bank.
+    '''
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Enter the amount to deposit or borrow. '''
+        if 'amount' in parameters:
+            try:
+                amountString = parameters['amount']
+                amountString = amountString.replace('k', '000')
+                amount = int(amountString)
+            except:
+                amount = 0
+            if amount != 0:
+                game.subStatus = amount
+                game.status = 125
+        if 'sign' in parameters:
+            if parameters['sign'] == '1':
+                game.subStatus = -game.subStatus
+        if 'response' in parameters:
+            if parameters['response'] == 'c':
+                game.status = 100
+
+
+
+    def render(self, game):
+        ''' Render the bank form. '''
+        game.htmlBankPart1()
+        return ''
+
+
+
+class BankResultState(AdvanceState):
+    '''
+    Class to represent the result of the bank transaction.
+    '''
+    NEXT_STATUS = 100
+
+
+
+    def render(self, game):
+        ''' Render the result of the transaction. '''
+        game.htmlBankPart2()
+        return ''
+
+
+
+class SaveGameState(AdvanceState):
+    '''
+    Class to represent saving the game.  The message is added to the menu page.
+    '''
+    NEXT_STATUS = 100
+
+
+
+    def render(self, game):
+        ''' Render the message and return to the menu after a delay. '''
+        game.html += '<p>Saving game.</p>'
+        return 'delay: 2000'
+
+
+
+class LeagueTableState(AdvanceState):
+    '''
+    Class to represent the league table from the main menu.
+    '''
+    NEXT_STATUS = 100
+
+
+
+    def render(self, game):
+        ''' Render the league table. '''
+        game.html = ''
+        game.displayLeague()
+        game.wait(True)
+        return ''
+
+
+
+class CupMatchState(PageState):
+    '''
+    Class to represent the cup match before kick off.
+    '''
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Change the team or play the match. '''
+        if 'response' in parameters:
+            if parameters['response'] == 'c':
+                game.status = 210
+            if parameters['response'] == 't':
+                game.status = 220
+                game.subStatus = 0
+
+
+
+    def render(self, game):
+        ''' Render the cup match. '''
+        game.playCupMatch()
+        return ''
+
+
+
+class PickPlayersState(PageState):
+    '''
+    :ivar int matchStatus: The state of the match to return to.
+
+    Class to represent picking the team for a match.
+    '''
+
+
+
+    def __init__(self, matchStatus):
+        ''' Class constructor. '''
+        self.matchStatus = matchStatus
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Add or drop a player or go back to the match. '''
+        if 'player' in parameters:
+            playerIndex = int(parameters['player']) - 1
+            if game.players[playerIndex].inSquad:
+                if game.players[playerIndex].inTeam:
+                    game.dropPlayer(playerIndex)
+                else:
+                    game.addPlayer(playerIndex)
+        if 'response' in parameters:
+            if parameters['response'] == 'b':
+                game.status = self.matchStatus
+
+
+
+    def render(self, game):
+        ''' Render the squad. '''
+        game.pickPlayers(True)
+        return ''
+
+
+
+class PlayCupMatchState(ContinueState):
+    '''
+    Class to represent playing the cup match.
+    '''
+    NEXT_STATUS = 230
+
+
+
+    def render(self, game):
+        ''' Render the match. '''
+        if game.isHomeMatch:
+            return game.htmlPlayMatch(game.teams[game.teamIndex], game.cupTeam)
+        return game.htmlPlayMatch(game.cupTeam, game.teams[game.teamIndex])
+
+
+
+class CupResultState(PageState):
+    '''
+    Class to represent the result of the cup match.
+    '''
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Replay a draw or move on to the league match. '''
+        if 'response' in parameters:
+            if parameters['response'] == 'c':
+                if game.homeScore == game.awayScore:
+                    # Replay
+                    game.status = 200
+                    game.subStatus = 0
+                else:
+                    # Next step, league match.
+                    game.status = 300
+                    game.subStatus = -1
+
+
+
+    def render(self, game):
+        ''' Render the result. '''
+        game.reportCupMatch()
+        return ''
+
+
+
+class LeagueMatchState(PageState):
+    '''
+    Class to represent the league match before kick off.
+    '''
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Change the team or play the match. '''
+        if 'response' in parameters:
+            if parameters['response'] == 'c':
+                game.status = 310
+            if parameters['response'] == 't':
+                game.status = 400
+                game.subStatus = 0
+
+
+
+    def render(self, game):
+        ''' Render the league match. '''
+        if game.subStatus == -1:
+            game.findLeagueOpponent()
+            game.subStatus = 0
+        game.html = '<h1>Division {}</h1>'.format(game.division)
+        if game.isHomeMatch:
+            game.displayMatch(True, game.teams[game.teamIndex], game.teams[game.opponentIndex])
+        else:
+            game.displayMatch(True, game.teams[game.opponentIndex], game.teams[game.teamIndex])
+        return ''
+
+
+
+class PlayLeagueMatchState(ContinueState):
+    '''
+    Class to represent playing the league match.
+    '''
+    NEXT_STATUS = 410
+
+
+
+    def render(self, game):
+        ''' Render the match. '''
+        if game.isHomeMatch:
+            return game.htmlPlayMatch(game.teams[game.teamIndex], game.teams[game.opponentIndex], game.getFixtureRandom(0))
+        return game.htmlPlayMatch(game.teams[game.opponentIndex], game.teams[game.teamIndex], game.getFixtureRandom(0))
+
+
+
+class LeagueResultState(ContinueState):
+    '''
+    Class to represent the results of the week in the division.
+    '''
+    NEXT_STATUS = 430
+
+
+
+    def render(self, game):
+        ''' Apply the result of the league match and render the results. '''
+        if game.isHomeMatch:
+            game.applyPoints(game.teams[game.teamIndex], game.teams[game.opponentIndex], game.homeScore, game.awayScore)
+        else:
+            game.applyPoints(game.teams[game.opponentIndex], game.teams[game.teamIndex], game.homeScore, game.awayScore)
+
+        # Calculate the gate money.
+        game.decideGateMoney()
+
+        # Decided the fixtures for the league was at half time of the playmatch.
+        game.decideFixtures(game.opponentIndex)
+
+        game.rest()
+        game.sortDivision()
+        game.startProjection()
+
+        # Store the data for progress.
+        if game.isHomeMatch:
+            week = 0
+            if game.homeScore == game.awayScore:
+                game.homeDraws += 1
+            elif game.homeScore > game.awayScore:
+                game.homeWins += 1
+            else:
+                game.homeLoses += 1
+            game.homeFor += game.homeScore
+            game.homeAgainst += game.awayScore
+        else:
+            week = 256
+            if game.homeScore == game.awayScore:
+                game.awayDraws += 1
+            elif game.awayScore > game.homeScore:
+                game.awayWins += 1
+            else:
+                game.awayLoses += 1
+            game.awayFor += game.awayScore
+            game.awayAgainst += game.homeScore
+        if game.homeScore == game.awayScore:
+            week |= 64
+        elif (game.isHomeMatch and game.homeScore > game.awayScore) or (not game.isHomeMatch and game.homeScore < game.awayScore):
+            week |= 128
+        # The position only has 6 bits.
+        week += min(game.teamIndex, 63)
+        game.weeks.append(week)
+        game.wait(True)
+        return ''
+
+
+
+class WeekTableState(ContinueState):
+    '''
+    Class to represent the league table after the league match.
+    '''
+    NEXT_STATUS = 440
+
+
+
+    def render(self, game):
+        ''' Render the league table. '''
+        game.html = ''
+        game.displayLeague()
+        game.wait(True)
+        return ''
+
+
+
+class MarketState(PageState):
+    '''
+    Class to represent the player for sale.
+    '''
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Make a bid for the player or move on. '''
+        game.status = 450
+        if 'bid' in parameters:
+            try:
+                bidAmount = parameters['bid']
+                bidAmount = bidAmount.replace('k', '000')
+                bid = int(bidAmount)
+            except:
+                bid = 0
+            if bid > 0:
+                game.status = 445
+                game.subStatus2 = bid
+
+
+
+    def render(self, game):
+        ''' Render the player for sale. '''
+        game.htmlMarketPart1()
+        return ''
+
+
+
+class MarketResultState(AdvanceState):
+    '''
+    Class to represent the result of the bid.
+    '''
+    NEXT_STATUS = 450
+
+
+
+    def render(self, game):
+        ''' Render the result of the bid. '''
+        game.htmlMarketPart2()
+        return ''
+
+
+
+class ReportState(AdvanceState):
+    '''
+    Class to represent the financial report.
+    '''
+    NEXT_STATUS = 460
+
+
+
+    def render(self, game):
+        ''' Render the financial report. '''
+        game.report()
+        game.wait(True)
+        return ''
+
+
+
+class ProgressState(AdvanceState):
+    '''
+    Class to represent the progress of the season.
+    '''
+    NEXT_STATUS = 470
+
+
+
+    def render(self, game):
+        ''' Render the progress. '''
+        game.progress()
+        game.wait(True)
+        return ''
+
+
+
+class AppearancesState(PageState):
+    '''
+    Class to represent the appearances of the players at the end of the week.
+    '''
+
+
+
+    def onResponse(self, game, parameters, response):
+        ''' Back to start of week or end of season. '''
+        if game.numMatches < game.league.matchesPerSeason:
+            game.status = 100
+        else:
+            game.status = 1000
+
+
+
+    def render(self, game):
+        ''' Render the appearances and update the autosave. '''
+        game.playerCaps()
+        game.rng.setPosition(game.season, game.numMatches, True)
+        game.autosave.update()
+        game.wait(True)
+        return ''
+
+
+
+class EndSeasonState(AdvanceState):
+    '''
+    Class to represent the end of the season.
+    '''
+    NEXT_STATUS = 100
+
+
+
+    def render(self, game):
+        ''' Render the end of the season. '''
+        game.endSeason(True)
+        return ''
+
+
+
+# The handler for each status.
+STATES = {
+    0: EnterNameState(),
+    1: SelectTeamState(),
+    2: NameTeamState(),
+    100: MainMenuState(),
+    110: SellPlayerState(),
+    115: ConfirmSaleState(),
+    120: BankState(),
+    125: BankResultState(),
+    150: SaveGameState(),
+    170: LeagueTableState(),
+    200: CupMatchState(),
+    210: PickPlayersState(200),
+    220: PlayCupMatchState(),
+    230: CupResultState(),
+    300: LeagueMatchState(),
+    310: PickPlayersState(300),
+    400: PlayLeagueMatchState(),
+    410: LeagueResultState(),
+    430: WeekTableState(),
+    440: MarketState(),
+    445: MarketResultState(),
+    450: ReportState(),
+    460: ProgressState(),
+    470: AppearancesState(),
+    1000: EndSeasonState(),
+}
+
+# The handler for a status that is not in STATES.
+UNKNOWN_STATE = UnknownState()
+
+
+
+def getState(status):
+    ''' Returns the handler for the specified status. '''
+    return STATES.get(status, UNKNOWN_STATE)
+
+
+
+class StateTrace:
+    '''
+    :ivar deque transitions: The (from status, to status, response seconds, render seconds) of the most recent transitions.
+    :ivar dict totals: The [count, seconds] of each status.  The time of a status is the time to render its page and the time to apply the response from its page.
+
+    Class to record the time taken by each state.
+    '''
+    # The number of transitions to keep.
+    MAX_TRANSITIONS = 1000
+
+
+
+    def __init__(self):
+        ''' Class constructor. '''
+        self.transitions = collections.deque(maxlen=StateTrace.MAX_TRANSITIONS)
+        self.totals = {}
+
+
+
+    def add(self, fromStatus, toStatus, responseTime, renderTime):
+        ''' Record a transition.  The response time is for the from status and the render time is for the to status. '''
+        self.transitions.append((fromStatus, toStatus, responseTime, renderTime))
+        self.addTime(fromStatus, responseTime, 0)
+        self.addTime(toStatus, renderTime, 1)
+
+
+
+    def addTime(self, status, seconds, count):
+        ''' Add the time to the total of the status.  The count is only increased for the render. '''
+        total = self.totals.setdefault(status, [0, 0.0])
+        total[0] += count
+        total[1] += seconds
+
+
+
+    def getSummary(self):
+        ''' Returns a list of (status, handler name, count, seconds, average seconds) with the slowest status first. '''
+        summary = []
+        for status, (count, seconds) in self.totals.items():
+            summary.append((status, type(getState(status)).__name__, count, seconds, seconds / count if count > 0 else seconds))
+        summary.sort(key=lambda item: item[3], reverse=True)
+        return summary
@@ -10,11 +10,16 @@ import json
 
 # Application Libraries.
 import ansi
+import save_format
 
 
 
 class Player:
-    ''' Class to represent a player in the BBC Football Manager game. '''
+    '''
+    Class to represent a player in the BBC Football Manager game.
+    The prebuilt players are in the :py:mod:`player_catalog` module.
+    '''
+    __slots__ = ('name', 'skill', 'energy', 'position', 'index', 'inSquad', 'inTeam', 'injured', 'caps', 'goals')
     DEFENSE = 0
     MIDFIELD = 1
     ATTACK = 2
@@ -36,94 +41,22 @@ class Player:
 
 
 
-    def getPlayer(self, index):
-        ''' Populate the object with a prebuilt player. '''
-        self.index = index
-        if index <= 10:
-            self.position = Player.DEFENSE
-        elif index <= 20:
-            self.position = Player.MIDFIELD
-        else:
-            self.position = Player.ATTACK
-
-        if index == 1:
-            self.name = 'C Woods'
-        elif index == 2:
-            self.name = 'P Shilton'
-        elif index == 3:
-            self.name = 'A Hansen'
-        elif index == 4:
-            self.name = 'P Neal'
-        elif index == 5:
-            self.name = 'T Butcher'
-        elif index == 6:
-            self.name = 'K Moran'
-        elif index == 7:
-            self.name = 'M Lawrenson'
-        elif index == 8:
-            self.name = 'T Adams'
-        elif index == 9:
-            self.name = 'M Duxbury'
-        elif index == 10:
-            self.name = 'G Stevens'
-        elif index == 11:
-            self.name = 'B Robson'
-        elif index == 12:
-            self.name = 'G Hoddle'
-        elif index == 13:
-            self.name = 'S Hodge'
-        elif index == 14:
-            self.name = 'C Johnston'
-        elif index == 15:
-            self.name = 'R Wilkins'
-        elif index == 16:
-            self.name = 'K Dalglish'
-        elif index == 17:
-            self.name = 'J Barnes'
-        elif index == 18:
-            self.name = 'G Souness'
-        elif index == 19:
-            self.name = 'N Webb'
-        elif index == 20:
-            self.name = 'T Morley'
-        elif index == 21:
-            self.name = 'M Hughes'
-        elif index == 22:
-            self.name = 'M Hateley'
-        elif index == 23:
-            self.name = 'P Beardsley'
-        elif index == 24:
-            self.name = 'I Rush'
-        elif index == 25:
-            self.name = 'G Lineker'
-        elif index == 26:
-            self.name = 'N Whiteside'
-
-
-
     def writeRow(self, exchangeRate=0):
         ''' Display this player on a row. '''
         if self.position == Player.DEFENSE:
-            print(ansi.BACKGROUND_LIGHT_BLUE, end = '')
-            print(ansi.LIGHT_YELLOW, end = '')
+            row = ansi.BACKGROUND_LIGHT_BLUE + ansi.LIGHT_YELLOW
         elif self.position == Player.MIDFIELD:
-            print(ansi.BACKGROUND_LIGHT_YELLOW, end = '')
-            print(ansi.BLUE, end = '')
+            row = ansi.BACKGROUND_LIGHT_YELLOW + ansi.BLUE
         else:
-            print(ansi.BACKGROUND_WHITE, end = '')
-            print(ansi.BLUE, end = '')
-        print(f'{self.index:2} {self.name:<20}{self.skill:>2}{self.energy:>3} ', end = '')
+            row = ansi.BACKGROUND_WHITE + ansi.BLUE
+        row += f'{self.index:2} {self.name:<20}{self.skill:>2}{self.energy:>3} '
         if exchangeRate != 0:
-            print(f'{f"£{self.skill * exchangeRate:,.0f}":>11s}', end = '')
+            row += f'{f"£{self.skill * exchangeRate:,.0f}":>11s}'
         if self.inTeam:
-            print(ansi.BACKGROUND_GREEN, end = '')
-            print(ansi.LIGHT_YELLOW, end = '')
-            print(' P ', end = '')
+            row += ansi.BACKGROUND_GREEN + ansi.LIGHT_YELLOW + ' P '
         if self.injured:
-            print(ansi.BACKGROUND_RED, end = '')
-            print(ansi.LIGHT_YELLOW, end = '')
-            print(' I ', end = '')
-        print(ansi.RESET_ALL)
+            row += ansi.BACKGROUND_RED + ansi.LIGHT_YELLOW + ' I '
+        print(row + ansi.RESET_ALL)
 
 
 
@@ -160,33 +93,20 @@ class Player:
 
 
 
-    def dump(self, outputFile):
-        ''' Write the player into the specified file. '''
-        json.dump(self.name, outputFile)
-        outputFile.write('\n')
-        json.dump(self.skill, outputFile)
-        outputFile.write('\n')
-        json.dump(self.energy, outputFile)
-        outputFile.write('\n')
-        json.dump(self.position, outputFile)
-        outputFile.write('\n')
-        json.dump(self.index, outputFile)
-        outputFile.write('\n')
-        json.dump(self.inSquad, outputFile)
-        outputFile.write('\n')
-        json.dump(self.inTeam, outputFile)
-        outputFile.write('\n')
-        json.dump(self.injured, outputFile)
-        outputFile.write('\n')
-        json.dump(self.caps, outputFile)
-        outputFile.write('\n')
-        json.dump(self.goals, outputFile)
-        outputFile.write('\n')
-
-
-
-    def load(self, inputFile):
-        ''' Read the player from the specified file. '''
+    def dump(self, writer):
+        ''' Write the player into the specified :py:class:`SaveWriter`. '''
+        writer.addObject(save_format.PLAYER, self)
+
+
+
+    def load(self, reader):
+        ''' Read the player from the specified :py:class:`SaveReader`. '''
+        reader.readObject(save_format.PLAYER, self)
+
+
+
+    def loadText(self, inputFile):
+        ''' Read the player from the specified json lines file.  This is the format of the older save files. '''
         line = inputFile.readline()
         self.name = json.loads(line)
         line = inputFile.readline()
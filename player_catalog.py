@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the player catalog for the BBC Football Manager program.
+The prebuilt players from the BBC Basic version are held in a tuple that is built once at import.
+Rosters of any size can be made up for the clubs that the player does not manage.
+'''
+
+# System libraries.
+import random
+
+# Application Libraries.
+from player import Player
+
+
+
+# The names of the prebuilt players.  Players 1 to 10 are defense, 11 to 20 mid-field and 21 to 26 attack.
+ROSTER = (
+    'C Woods', 'P Shilton', 'A Hansen', 'P Neal', 'T Butcher', 'K Moran', 'M Lawrenson', 'T Adams', 'M Duxbury', 'G Stevens',
+    'B Robson', 'G Hoddle', 'S Hodge', 'C Johnston', 'R Wilkins', 'K Dalglish', 'J Barnes', 'G Souness', 'N Webb', 'T Morley',
+    'M Hughes', 'M Hateley', 'P Beardsley', 'I Rush', 'G Lineker', 'N Whiteside'
+)
+
+# The number of prebuilt players.
+NUM_PLAYERS = len(ROSTER)
+
+# The initials and surnames for made up players.
+INITIALS = 'ABCDGJKMNPRST'
+SURNAMES = (
+    'Allen', 'Bailey', 'Barker', 'Bennett', 'Brooks', 'Burns', 'Carter', 'Clarke', 'Cooper', 'Davies',
+    'Dixon', 'Edwards', 'Ellis', 'Fisher', 'Fletcher', 'Foster', 'Gibson', 'Graham', 'Grant', 'Hall',
+    'Harris', 'Hill', 'Holmes', 'Hughes', 'Hunt', 'Jackson', 'James', 'Jones', 'Kelly', 'King',
+    'Lee', 'Lloyd', 'Marsh', 'Mason', 'Mills', 'Moore', 'Morgan', 'Murray', 'Nash', 'Owen',
+    'Palmer', 'Parker', 'Pearce', 'Price', 'Reid', 'Roberts', 'Ross', 'Shaw', 'Smith', 'Stone',
+    'Taylor', 'Thomas', 'Turner', 'Walker', 'Ward', 'Watson', 'Webb', 'White', 'Wood', 'Young'
+)
+
+# The number of each position in a made up squad.  The same shape as the prebuilt roster.
+SQUAD_SHAPE = ((Player.DEFENSE, 6), (Player.MIDFIELD, 6), (Player.ATTACK, 4))
+
+
+
+def getRosterPosition(index):
+    ''' Returns the position of the prebuilt player with the specified index from 1. '''
+    if index <= 10:
+        return Player.DEFENSE
+    if index <= 20:
+        return Player.MIDFIELD
+    return Player.ATTACK
+
+
+
+def getRosterName(index):
+    ''' Returns the name of the prebuilt player with the specified index from 1 or None. '''
+    if index < 1 or index > NUM_PLAYERS:
+        return None
+    return ROSTER[index - 1]
+
+
+
+def getRosterPlayer(index):
+    ''' Returns a new :py:class:`Player` object for the prebuilt player with the specified index from 1.  Replaces getPlayer() in the Player class. '''
+    player = Player()
+    player.index = index
+    player.position = getRosterPosition(index)
+    name = getRosterName(index)
+    if name is not None:
+        player.name = name
+    return player
+
+
+
+def generateName(rng=random):
+    ''' Returns a made up player name. '''
+    return '{} {}'.format(rng.choice(INITIALS), rng.choice(SURNAMES))
+
+
+
+def generateSquad(division, rng=random):
+    '''
+    :param int division: The division of the club.  The top divisions have better players.
+    :param random.Random rng: The random number generator for the squad.
+    :returns: A list of :py:class:`Player` objects.
+
+    Make up a squad for a club that the player does not manage.
+    The same random number generator state always gives the same squad.
+    '''
+    skillBonus = 1 if division <= 2 else 0
+    squad = []
+    for position, count in SQUAD_SHAPE:
+        for _ in range(count):
+            player = Player()
+            player.index = len(squad) + 1
+            player.name = generateName(rng)
+            player.position = position
+            player.skill = rng.randint(1, 5) + skillBonus
+            player.energy = rng.randint(1, 20)
+            player.inSquad = True
+            squad.append(player)
+    return squad
+
+
+
+def generateRoster(numPlayers, rng=random):
+    ''' Returns a list of numPlayers made up :py:class:`Player` objects in the same position order as the prebuilt roster. '''
+    roster = []
+    for index in range(1, numPlayers + 1):
+        player = Player()
+        player.index = index
+        player.name = generateName(rng)
+        player.position = getRosterPosition(1 + (index - 1) * NUM_PLAYERS // numPlayers)
+        player.skill = rng.randint(1, 5)
+        player.energy = rng.randint(1, 20)
+        roster.append(player)
+    return roster
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the Monte Carlo season projection for the BBC Football Manager program.
+The rest of the season is simulated many times to estimate the chance of each club finishing in each position.
+The samples are spread over a pool of processes.
+'''
+
+# System libraries.
+import random
+import time
+import concurrent.futures
+
+# Application Libraries.
+import match_engine
+
+
+
+# The shared pool of worker processes.  This is created when first needed.
+_executor = None
+_executorWorkers = None
+
+
+
+def getExecutor(maxWorkers=None):
+    ''' Returns the shared process pool.  The pool is created on the first call. '''
+    global _executor, _executorWorkers
+    if _executor is None or _executorWorkers != maxWorkers:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = concurrent.futures.ProcessPoolExecutor(max_workers=maxWorkers)
+        _executorWorkers = maxWorkers
+    return _executor
+
+
+
+def shutdownExecutor():
+    ''' Shutdown the shared process pool. '''
+    global _executor, _executorWorkers
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _executorWorkers = None
+
+
+
+def getSnapshot(game):
+    '''
+    :param Game game: The game to take the snapshot of.
+    :returns: A dictionary of plain values that can be sent to another process.
+
+    The teams are in the current league table order.
+    The remaining fixtures are pairs of indexes into the teams.
+    '''
+    indexes = {team.name: index for index, team in enumerate(game.teams)}
+    rounds = game.fixtures.rounds[game.numMatches:game.league.matchesPerSeason]
+    return {
+        'names': [team.name for team in game.teams],
+        'attack': [team.attack for team in game.teams],
+        'midfield': [team.midfield for team in game.teams],
+        'defence': [team.defence for team in game.teams],
+        'moral': [team.moral for team in game.teams],
+        'energy': [team.energy for team in game.teams],
+        'pts': [team.pts for team in game.teams],
+        'difference': [team.difference for team in game.teams],
+        'rounds': [[(indexes[home], indexes[away]) for home, away in fixtures] for fixtures in rounds]
+    }
+
+
+
+def simulateBlock(snapshot, numSamples, seed):
+    '''
+    :param dict snapshot: The state of the league from :py:func:`getSnapshot`.
+    :param int numSamples: The number of seasons to simulate.
+    :param int seed: The seed for the random numbers of this block.
+    :returns: A list for each team of the number of times the team finished in each position.
+
+    Simulate the rest of the season numSamples times.
+    This is a top level function so that it can run in a worker process.
+    '''
+    rng = random.Random(seed)
+    sampler = match_engine.PoissonSampler()
+    numTeams = len(snapshot['names'])
+    attack = snapshot['attack']
+    midfield = snapshot['midfield']
+    defence = snapshot['defence']
+    energy = snapshot['energy']
+    counts = [[0] * numTeams for _ in range(numTeams)]
+    for _ in range(numSamples):
+        pts = list(snapshot['pts'])
+        difference = list(snapshot['difference'])
+        moral = list(snapshot['moral'])
+        for fixtures in snapshot['rounds']:
+            for home, away in fixtures:
+                homeAverageGoals = match_engine.expectedGoals(0.5, attack[home], midfield[home], moral[home], defence[away], midfield[away], energy[away])
+                awayAverageGoals = match_engine.expectedGoals(0, attack[away], midfield[away], moral[away], defence[home], midfield[home], energy[home])
+                homeGoals = sampler.sample(homeAverageGoals, (rng.random() + rng.random()) / 2)
+                awayGoals = sampler.sample(awayAverageGoals, (rng.random() + rng.random()) / 2)
+                moral[home], moral[away] = match_engine.updateMoral(moral[home], moral[away], homeGoals, awayGoals)
+                if homeGoals == awayGoals:
+                    pts[home] += 1
+                    pts[away] += 1
+                else:
+                    if homeGoals > awayGoals:
+                        pts[home] += 3
+                    else:
+                        pts[away] += 3
+                    difference[home] += homeGoals - awayGoals
+                    difference[away] += awayGoals - homeGoals
+
+        # The sort is stable so ties stay in the current table order, the same as Game.sortDivision().
+        table = sorted(range(numTeams), key=lambda team: (pts[team], difference[team]), reverse=True)
+        for position, team in enumerate(table):
+            counts[team][position] += 1
+    return counts
+
+
+
+class ProjectionResult:
+    '''
+    :ivar list names: The names of the teams in the table order when the projection was made.
+    :ivar int numSamples: The number of simulated seasons.
+    :ivar double seconds: The time taken by the projection.
+
+    Class to represent the result of a :py:class:`SeasonProjection`.
+    '''
+
+
+
+    def __init__(self, names, counts, numSamples, seconds, numPromotion=3, numRelegation=3):
+        ''' Class constructor. '''
+        self.names = names
+        self.counts = counts
+        self.numSamples = numSamples
+        self.seconds = seconds
+        self.numPromotion = numPromotion
+        self.numRelegation = numRelegation
+        self.indexes = {name: index for index, name in enumerate(names)}
+
+
+
+    def getPositions(self, name):
+        ''' Returns the list of probabilities of the team finishing in each position. '''
+        if self.numSamples == 0:
+            return [0.0] * len(self.names)
+        return [count / self.numSamples for count in self.counts[self.indexes[name]]]
+
+
+
+    def getPromotion(self, name):
+        ''' Returns the probability of the team finishing in the top positions. '''
+        return sum(self.getPositions(name)[:self.numPromotion])
+
+
+
+    def getRelegation(self, name):
+        ''' Returns the probability of the team finishing in the bottom positions. '''
+        return sum(self.getPositions(name)[len(self.names) - self.numRelegation:])
+
+
+
+class SeasonProjection:
+    '''
+    :ivar dict snapshot: The state of the league when the projection was created.
+    :ivar int seed: The seed for the projection.
+    :ivar float startTime: The time when the samples were started.
+    :ivar dict futures: The number of samples of each job in the pool of processes.
+    :ivar ProjectionResult result: The result once the samples have been collected or None.
+
+    Class to represent a Monte Carlo projection of the rest of the season.
+    The samples can be started with :py:meth:`start` and collected later with :py:meth:`getResult` so the game does not wait for them.
+    '''
+
+
+
+    def __init__(self, game):
+        ''' Class constructor.  Take a snapshot of the league in the game. '''
+        self.snapshot = getSnapshot(game)
+        self.seed = game.rng.deriveSeed('projection', game.season, game.numMatches)
+        self.numPromoted = game.league.numPromoted
+        self.numRelegated = game.league.numRelegated
+        self.startTime = None
+        self.futures = {}
+        self.result = None
+
+
+
+    def run(self, maxSamples=2000, timeBudget=None, maxWorkers=None, blockSize=200):
+        '''
+        :param int maxSamples: The maximum number of seasons to simulate.
+        :param double timeBudget: Optional maximum time in seconds.  The samples finished by then are used.
+        :param int maxWorkers: The number of worker processes.  1 to run in this process.
+        :param int blockSize: The number of samples in each job.
+        :returns: A :py:class:`ProjectionResult` object.
+        '''
+        startTime = time.time()
+        numTeams = len(self.snapshot['names'])
+        counts = [[0] * numTeams for _ in range(numTeams)]
+        numSamples = 0
+        blocks = [min(blockSize, maxSamples - start) for start in range(0, maxSamples, blockSize)]
+
+        if maxWorkers == 1:
+            # Run in this process.
+            for block, size in enumerate(blocks):
+                if timeBudget is not None and time.time() - startTime > timeBudget and numSamples > 0:
+                    break
+                self._addCounts(counts, simulateBlock(self.snapshot, size, self.seed + block))
+                numSamples += size
+        else:
+            self.start(maxSamples, maxWorkers, blockSize)
+            self.startTime = startTime
+            return self.getResult(timeBudget)
+
+        return ProjectionResult(self.snapshot['names'], counts, numSamples, time.time() - startTime, self.numPromoted, self.numRelegated)
+
+
+
+    def start(self, maxSamples=2000, maxWorkers=None, blockSize=200):
+        '''
+        :param int maxSamples: The maximum number of seasons to simulate.
+        :param int maxWorkers: The number of worker processes.
+        :param int blockSize: The number of samples in each job.
+
+        Start the samples in the pool of processes and return without waiting for them.
+        '''
+        self.startTime = time.time()
+        self.result = None
+        blocks = [min(blockSize, maxSamples - start) for start in range(0, maxSamples, blockSize)]
+        executor = getExecutor(maxWorkers)
+        self.futures = {executor.submit(simulateBlock, self.snapshot, size, self.seed + block): size for block, size in enumerate(blocks)}
+
+
+
+    def getResult(self, timeBudget=None):
+        '''
+        :param double timeBudget: Optional maximum time in seconds from the start.  The samples finished by then are used.
+        :returns: A :py:class:`ProjectionResult` object.  The result is kept so later calls do not wait again.
+
+        The jobs that have not started by then are cancelled.
+        '''
+        if self.result != None:
+            return self.result
+        numTeams = len(self.snapshot['names'])
+        counts = [[0] * numTeams for _ in range(numTeams)]
+        numSamples = 0
+        timeout = None if timeBudget is None else max(0, timeBudget - (time.time() - self.startTime))
+        done, notDone = concurrent.futures.wait(self.futures, timeout=timeout)
+        for future in notDone:
+            future.cancel()
+        for future in done:
+            self._addCounts(counts, future.result())
+            numSamples += self.futures[future]
+        self.futures = {}
+        self.result = ProjectionResult(self.snapshot['names'], counts, numSamples, time.time() - self.startTime, self.numPromoted, self.numRelegated)
+        return self.result
+
+
+
+    def cancel(self):
+        ''' Cancel the jobs that have not started. '''
+        for future in self.futures:
+            future.cancel()
+        self.futures = {}
+
+
+
+    def _addCounts(self, counts, blockCounts):
+        ''' Add the counts from a block into the total counts. '''
+        for team, positions in enumerate(blockCounts):
+            for position, count in enumerate(positions):
+                counts[team][position] += count
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the RandomStreams class for the BBC Football Manager program.
+The game owns one :py:class:`RandomStreams` object.
+Each subsystem draws from its own stream so that a change in one subsystem does not change the others.
+Every stream is derived from the game seed and a key so any (season, week, fixture) can be recomputed without replaying the game before it.
+'''
+
+# System libraries.
+import random
+import hashlib
+
+
+
+class RandomStreams:
+    '''
+    :ivar int seed: The seed that all the streams are derived from.
+    :ivar random.Random match: The stream for match outcomes, goal times and goal scorers.
+    :ivar random.Random injury: The stream for injuries and player energy.
+    :ivar random.Random market: The stream for the player market, sales and gate money.
+    :ivar random.Random cup: The stream for cup draws and cup money.
+    :ivar random.Random team: The stream for generating teams and players.
+
+    Class to represent the random number generators for the BBC Football Manager game.
+    '''
+    STREAMS = ('match', 'injury', 'market', 'cup', 'team')
+
+
+
+    def __init__(self, seed=None):
+        ''' Class constructor.  A random seed is chosen when no seed is specified. '''
+        if seed is None:
+            seed = random.SystemRandom().randrange(1 << 32)
+        self.seed = seed
+        self.season = 0
+        self.week = 0
+        for name in RandomStreams.STREAMS:
+            setattr(self, name, random.Random())
+        self.setPosition(0, 0)
+
+
+
+    def deriveSeed(self, *keys):
+        '''
+        :param keys: The keys that identify the stream.  For example ('fixture', season, week, fixture).
+        :returns: A 64 bit seed that depends on the game seed and the keys.
+
+        The derivation is a hash so it is the same in every process and every Python session.
+        '''
+        text = ':'.join(str(key) for key in (self.seed,) + keys)
+        return int.from_bytes(hashlib.sha256(text.encode('utf-8')).digest()[:8], 'little')
+
+
+
+    def getStream(self, *keys):
+        ''' Returns a new independent random number generator for the specified keys. '''
+        return random.Random(self.deriveSeed(*keys))
+
+
+
+    def getFixtureStream(self, season, week, fixture):
+        ''' Returns the random number generator for the specified league fixture. '''
+        return self.getStream('fixture', season, week, fixture)
+
+
+
+    def setPosition(self, season, week, isBetweenWeeks=False):
+        '''
+        Reseed the subsystem streams for the specified season and week.
+        The draws in a week do not depend on the draws in earlier weeks, so a loaded game continues the same way.
+        isBetweenWeeks is for the draws at the menu after the week, for example selling a player.
+        A game is saved and loaded between weeks, so the loaded game draws the same numbers as the game that was saved.
+        '''
+        self.season = season
+        self.week = week
+        for name in RandomStreams.STREAMS:
+            if isBetweenWeeks:
+                getattr(self, name).seed(self.deriveSeed(name, season, week, 'menu'))
+            else:
+                getattr(self, name).seed(self.deriveSeed(name, season, week))
@@ -0,0 +1,852 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the renderers for the BBC Football Manager program.
+A renderer formats the :py:mod:`views` from the game for one frontend.
+The :py:class:`AnsiRenderer` prints to the console, the :py:class:`HtmlRenderer` builds the page for the wx window and the :py:class:`NullRenderer` does nothing for the simulations.
+'''
+
+# System libraries.
+import sys
+
+# Application Libraries.
+import ansi
+import console_frame
+
+
+
+# The title of the game.  This is using 'Box-drawing characters' or 'Line-drawing characters.'
+BANNER = (
+    '┏━━             ┃       ┃ ┃   ┏━┳━┓',
+    '┃            ┃  ┃       ┃ ┃   ┃ ┃ ┃',
+    '┣━━ ┏━┓ ┏━┓ ━╋━ ┣━┓ ━━┓ ┃ ┃   ┃   ┃ ━━┓ ━┳━┓ ━━┓ ┏━┓ ┏━┓ ┏━',
+    '┃   ┃ ┃ ┃ ┃  ┃  ┃ ┃ ┏━┫ ┃ ┃   ┃   ┃ ┏━┃  ┃ ┃ ┏━┫ ┃ ┃ ┣━┛ ┃',
+    '┃   ┗━┛ ┗━┛  ┃  ┗━┛ ┗━┛ ┃ ┃   ┃   ┃ ┗━┛  ┃ ┃ ┗━┛ ┗━┫ ┗━━ ┃',
+    '                                                   ┃',
+    '━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┛',
+    'By Steve Walton BBC BASIC 1982-1989, 2000, Python 2018-2021.'
+)
+
+
+
+def getFinancialLine(title, profit, loss):
+    ''' Returns a line of financial information for the console. '''
+    if profit - loss >= 0:
+        description = '£{:,.0f}'.format(profit - loss)
+        return '{}{:<25} {:>13} {}'.format(ansi.GREEN, title, description, ansi.RESET_ALL)
+    description = '(£{:,.0f})'.format(loss - profit)
+    return '{}{:<25}{:>15}{}'.format(ansi.RED, title, description, ansi.RESET_ALL)
+
+
+
+def getTitles(titles):
+    ''' Returns the names of the titles in the specified bit flags of titles. '''
+    names = []
+    division = titles & 7
+    if division != 0:
+        names.append('Division {} Champions'.format(division))
+    if titles & 8 == 8:
+        names.append('League Cup Champions')
+    if titles & 16 == 16:
+        names.append('FA Cup Champions')
+    if titles & 32 == 32:
+        names.append('European Cup Champions')
+    if titles & 64 == 64:
+        names.append('European Cup Winners Cup Champions')
+    if titles & 128 == 128:
+        names.append('UEFA Cup Champions')
+    return names
+
+
+
+class Renderer:
+    '''
+    Class to represent a renderer.
+    The view is passed to the method called render followed by the name of the class of the view.
+    For example a :py:class:`views.LeagueTable` is passed to renderLeagueTable().
+    '''
+
+
+
+    def render(self, view):
+        ''' Format the specified view. '''
+        getattr(self, 'render' + type(view).__name__)(view)
+
+
+
+class NullRenderer(Renderer):
+    '''
+    Class to represent a renderer that does not show anything.
+    This is used when there is no user, for example in the simulations.
+    '''
+
+
+
+    def render(self, view):
+        ''' Ignore the specified view. '''
+        pass
+
+
+
+class AnsiRenderer(Renderer):
+    '''
+    :ivar list clockLines: The lines of the :py:class:`views.MatchClock` that are shown at the bottom of the console.
+
+    Class to represent a renderer that prints the views to the console with ANSI colour codes.
+    '''
+
+
+
+    def __init__(self):
+        ''' Class constructor. '''
+        self.clockLines = []
+
+
+
+    def renderPage(self, view):
+        ''' Clear the console and print the title. '''
+        ansi.doCls()
+        if view.title == None:
+            return
+        if view.team == None:
+            print(view.title)
+        else:
+            print(f'{view.team.getColouredName()}{view.title}')
+
+
+
+    def renderMessage(self, view):
+        ''' Print the message. '''
+        if view.team == None:
+            print(view.text)
+        else:
+            print(f'{view.team.getColouredName()}{view.text}')
+
+
+
+    def renderBanner(self, view):
+        ''' Implementation of DEFPROCfootball().  Print the title. '''
+        for line in BANNER:
+            print(line)
+
+
+
+    def renderWait(self, view):
+        ''' Replacement for PROCWAIT in the BBC Basic version.  Print the prompt or remove it. '''
+        if view.isPrompt:
+            print('{}{}{} Press SPACE to continue {}{}'.format(ansi.BACKGROUND_BLUE, ansi.YELLOW, '━' * 7, '━' * 8, ansi.RESET_ALL))
+        else:
+            print('{}{}'.format(ansi.getCursorUp(1), ansi.ERASE_LINE), end = '\r')
+
+
+
+    def renderTeamList(self, view):
+        ''' Print the title and the teams. '''
+        print(view.title)
+        for team in view.teams:
+            print(team.getColouredName())
+
+
+
+    def renderLeagueTable(self, view):
+        ''' Replacement for PROCLEAGUE in the BBC Basic version. '''
+        print('Division {}'.format(view.division))
+        print('   Team             W  D  L Pts Dif')
+        for team in view.teams:
+            team.writeTableRow(view.isDebug)
+        print('Matches Played: {}'.format(view.numMatches))
+        print('{} position: {}'.format(view.team.getColouredName(), view.position))
+
+
+
+    def renderResults(self, view):
+        ''' Print the results of the other matches in the division. '''
+        for home, away, homeGoals, awayGoals in view.fixtures:
+            print('{}{:>17}{} {} - {} {}'.format(home.colour, home.name, ansi.RESET_ALL, homeGoals, awayGoals, away.getColouredName()))
+
+
+
+    def renderFinancialReport(self, view):
+        ''' Print the financial report. '''
+        for title, profit, loss in view.items:
+            print(getFinancialLine(title, profit, loss))
+        print('━' * 40)
+        print(getFinancialLine(*view.balance))
+        print('━' * 40)
+        print(getFinancialLine('Cash', view.cash, 0))
+        print(getFinancialLine('Debt', 0, view.debt))
+
+
+
+    def renderInjury(self, view):
+        ''' Print the injury. '''
+        if view.player == None:
+            print('{}No injuries.{}'.format(ansi.GREEN, ansi.RESET_ALL))
+        else:
+            print('{}{} has been injured.{}'.format(ansi.RED, view.player.name, ansi.RESET_ALL))
+
+
+
+    def renderAppearances(self, view):
+        ''' Print the appearances and the top scorers. '''
+        print('{}┏━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┓{}'.format(ansi.MAGENTA, ansi.RESET_ALL))
+        print('{}┃{}   Player        Position  Caps Goals {}┃{}'.format(ansi.MAGENTA, ansi.RESET_ALL, ansi.MAGENTA, ansi.RESET_ALL))
+        for index, player in enumerate(view.byCaps):
+            self.writePlayer(index, player)
+
+        # Top Scorers.
+        print('{}┣━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┫{}'.format(ansi.MAGENTA, ansi.RESET_ALL))
+        print('{}┃{}   Player        Position  Caps Goals {}┃{}'.format(ansi.MAGENTA, ansi.RESET_ALL, ansi.MAGENTA, ansi.RESET_ALL))
+        for index, player in enumerate(view.byGoals):
+            if player.goals > 0:
+                self.writePlayer(index, player)
+        print('{}┣━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┫{}'.format(ansi.MAGENTA, ansi.RESET_ALL))
+
+
+
+    def renderFitness(self, view):
+        ''' Print the injured players and the bottom of the box. '''
+        for count, name, isFit in view.rows:
+            if isFit:
+                message = '{} is fit.'.format(name)
+            else:
+                message = '{} is injured.'.format(name)
+            print('{}┃{}{:>2}{} {:<35}{}┃{}'.format(ansi.MAGENTA, ansi.WHITE, count, ansi.GREEN if isFit else ansi.RED, message, ansi.MAGENTA, ansi.RESET_ALL))
+        print('{}┗━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┛{}'.format(ansi.MAGENTA, ansi.RESET_ALL))
+
+
+
+    def writePlayer(self, index, player):
+        ''' Print a row of the appearances for the player. '''
+        if player.injured:
+            playerColour = ansi.RED
+        elif player.inTeam:
+            playerColour = ansi.GREEN
+        else:
+            playerColour = ansi.RESET_ALL
+        print('{}┃{}{:>2}{} {:<14}{:<9}{:>5}{:>6} {}┃{}'.format(ansi.MAGENTA, ansi.WHITE, index + 1, playerColour, player.name, player.getPosition(), player.caps, player.goals, ansi.MAGENTA, ansi.RESET_ALL))
+
+
+
+    def renderSquad(self, view):
+        ''' Replacement for PROCPTEAM (line 2130) in the BBC Basic version.  Print the players in the squad. '''
+        print('   Player        Skill Energy')
+        for player in view.players:
+            player.writeRow()
+
+
+
+    def renderPickTeam(self, view):
+        ''' Nothing to do.  The console asks for the number of the player. '''
+        pass
+
+
+
+    def renderSellPlayer(self, view):
+        ''' Print how to sell a player. '''
+        print('Enter <RETURN> to return to menu.')
+        print('Else enter player number to be sold')
+
+
+
+    def renderOffer(self, view):
+        ''' Print the offer. '''
+        print('You are offered £{:,.2f}'.format(view.price))
+        print('Do you accept (Y/N)?')
+
+
+
+    def renderCupReport(self, view):
+        ''' Print the name of the cup and the results in the cup. '''
+        print(view.cup.name)
+        view.cup.writeResults()
+
+
+
+    def renderMatch(self, view):
+        ''' Replacement for PROCDISPLAY in the BBC Basic version. '''
+        homeTeam = view.homeTeam
+        awayTeam = view.awayTeam
+        print('   {}{:^18}{}{:^18}{}'.format(homeTeam.colour, homeTeam.name, awayTeam.colour, awayTeam.name, ansi.RESET_ALL))
+        if view.isLeague:
+            print('Pos{:^18}{:^18}'.format(homeTeam.position, awayTeam.position))
+        print('Eng{:^18}{:^18}'.format(homeTeam.energy // 10, awayTeam.energy // 10))
+        print('Mor{:^18}{:^18}'.format(homeTeam.moral, awayTeam.moral))
+        print('For{:^18}{:^18}'.format(homeTeam.formation, awayTeam.formation))
+        print('Def{:^18}{:^18}'.format(homeTeam.defence, awayTeam.defence))
+        print('Mid{:^18}{:^18}'.format(homeTeam.midfield, awayTeam.midfield))
+        print('Att{:^18}{:^18}'.format(homeTeam.attack, awayTeam.attack))
+        print()
+        print('{} Picked, {} Squad, {} Injured.'.format(view.numTeam, view.numSquad, view.numInjured))
+        print('Press C to change team')
+        print('Press TAB to play match.')
+
+
+
+    def renderKickOff(self, view):
+        ''' Remove the two choices at the bottom of the :py:class:`views.Match`. '''
+        ansi.doCursorUp(2)
+        print(ansi.ERASE_LINE)
+        print(ansi.ERASE_LINE)
+
+
+
+    def renderMatchClock(self, view):
+        '''
+        Each minute is a frame of the score, the time and the goals at the bottom of the console.
+        Only the lines that have changed are written.
+        '''
+        if view.minute == 0:
+            self.clockLines = []
+        homeTeam = view.homeTeam
+        lines = ['{}{:>17}{} {} - {} {}'.format(homeTeam.colour, homeTeam.name, ansi.RESET_ALL, view.homeScore, view.awayScore, view.awayTeam.getColouredName())]
+        if view.isHalfTime:
+            lines.append('{}Half Time.'.format(' ' * 16))
+        else:
+            lines.append('{}Time {}'.format(' ' * 17, view.minute))
+        for isHome, minute, scorer in view.goals:
+            goal = '{} {}'.format(minute, 'Goal' if scorer == None else scorer)
+            lines.append(goal if isHome else ' ' * 22 + goal)
+        sys.stdout.write(console_frame.getRegionUpdate(self.clockLines, lines))
+        sys.stdout.flush()
+        self.clockLines = lines
+
+
+
+    def renderFinalScore(self, view):
+        ''' Print the final score. '''
+        print('Final Score')
+        print('{}{:>17}{} {} - {} {}'.format(view.homeTeam.colour, view.homeTeam.name, ansi.RESET_ALL, view.homeGoals, view.awayGoals, view.awayTeam.getColouredName()))
+
+
+
+    def renderCupMatch(self, view):
+        ''' Clear the console and print the round of the cup and the previous results in the cup. '''
+        ansi.doCls()
+        print('Cup match aginst team from division {}'.format(view.division))
+        view.cup.writeResults()
+        print('{} {}'.format(view.cup.name, view.cup.getRoundName()))
+
+
+
+    def renderCupStatus(self, view):
+        ''' Print whether the player's team is in or out of each cup. '''
+        for cup in view.cups:
+            if cup.isIn:
+                print('{}: {}in {}{}.'.format(cup.name, ansi.GREEN, cup.getRoundName(), ansi.RESET_ALL))
+            else:
+                print('{}: {}out {}{}.'.format(cup.name, ansi.RED, cup.getRoundName(), ansi.RESET_ALL))
+
+
+
+    def renderTitles(self, view):
+        ''' Print the titles held by the team. '''
+        for title in getTitles(view.titles):
+            print(title)
+
+
+
+    def renderMarket(self, view):
+        ''' Replacement for PROCMARKET (line 3330) in the BBC Basic version.  Print the player for sale. '''
+        if view.player == None:
+            print('{}F.A. rules state that one team may not have more that 18 players. You already have 18 players therefore you may not buy another.{}'.format(ansi.RED, ansi.RESET_ALL))
+            return
+        print(view.player.getPosition())
+        view.player.writeRow(view.price)
+        print('You have £{:,.2f}'.format(view.money))
+
+
+
+    def renderBid(self, view):
+        ''' Print the result of the bid. '''
+        if not view.isEnoughMoney:
+            print('{}You do not have enough money{}'.format(ansi.RED, ansi.RESET_ALL))
+        elif view.isAccepted:
+            print('{}{} is added to your squad.{}'.format(ansi.GREEN, view.player.name, ansi.RESET_ALL))
+        elif view.bid > 0:
+            print('{}Your bid of £{:,.2f} is turned down.{}'.format(ansi.RED, view.bid, ansi.RESET_ALL))
+
+
+
+    def renderBalance(self, view):
+        ''' Print the money and the debt. '''
+        print('You have £{:,.2f}'.format(view.money))
+        if view.debt > 0:
+            print('You owe £{:,.2f}'.format(view.debt))
+        else:
+            print('In Bank £{:,.2f}'.format(-view.debt))
+
+
+
+    def renderTransaction(self, view):
+        ''' Print the choices in the bank. '''
+        print('Do you want to Deposit, Withdraw or Exit (D/W/E)?')
+
+
+
+    def renderProgress(self, view):
+        ''' Replacement for DEFPROCPROGRESS (line 5790) in the BBC Basic version.  Print the results summary and the last 10 results. '''
+        print(' [--- Home ---] [--- Away ---]')
+        print('  W  D  L  F  A  W  D  L  F  A Pts')
+        print('{:>3}{:>3}{:>3}{:>3}{:>3}{:>3}{:>3}{:>3}{:>3}{:>3}{:>4}'.format(*view.home, *view.away, view.pts))
+
+        # Show league results details.
+        league = view.league
+        for week in reversed(view.weeks[-10:]):
+            if week & 256 == 0:
+                homeAway = 'Home'
+            else:
+                homeAway = 'Away'
+            if week & 192 == 0:
+                result = ansi.LIGHT_RED + 'Lost ' + ansi.RESET_ALL
+            elif week & 192 == 128:
+                result = ansi.LIGHT_GREEN + 'Won  ' + ansi.RESET_ALL
+            else:
+                result = ansi.LIGHT_YELLOW + 'Drawn' + ansi.RESET_ALL
+            # There are positions 1 to 16. 16-14, 13-4, 3-2, 1
+            position = 1 + (week & 63)
+            firstRelegated = league.getFirstRelegated()
+            # The bar is one element short because the number is the final element.
+            bar = ''
+            if position <= firstRelegated:
+                bar = ansi.BACKGROUND_LIGHT_RED + '  ' * league.numRelegated
+                if position <= league.numPromoted:
+                    bar += ansi.BACKGROUND_LIGHT_MAGENTA + '  ' * (firstRelegated - league.numPromoted)
+                    bar += ansi.BACKGROUND_LIGHT_GREEN + '  ' * (league.numPromoted - position)
+                    if position == 1:
+                        bar += ansi.BACKGROUND_YELLOW
+                    else:
+                        bar += ansi.DARK_GRAY
+                else:
+                    bar += ansi.BACKGROUND_LIGHT_MAGENTA + '  ' * (firstRelegated - position)
+            else:
+                bar = ansi.BACKGROUND_LIGHT_RED + '  ' * (league.numTeams - position)
+
+            # Add the final element as the number.
+            bar = '{}{:>2}'.format(bar, 1 + week & 63)
+            print('{} {} {}{}'.format(homeAway, result, bar, ansi.RESET_ALL))
+
+
+
+    def renderHistory(self, view):
+        ''' Print the seasons of the career. '''
+        print()
+        print('Season Div Pos Pts  Cups')
+        for season in view.seasons:
+            cups = ', '.join(f'{cup.name} {cup.getRoundName()}' for cup in season.cups)
+            print(f'{season.season:>6}{season.division:>4}{season.position:>4}{season.pts:>4}  {cups}')
+
+
+
+    def renderProjection(self, view):
+        ''' Print the chance of the player's team winning the division, promotion and relegation. '''
+        result = view.result
+        print()
+        print('Projection from {} seasons.'.format(result.numSamples))
+        text = '{:>10} {:>9}'.format('Champions', 'Promotion' if view.isPromotion else '')
+        if view.isRelegation:
+            text += ' {:>10}'.format('Relegation')
+        print(text)
+        text = '{:>10.0%} {:>9}'.format(result.getPositions(view.teamName)[0], '{:.0%}'.format(result.getPromotion(view.teamName)) if view.isPromotion else '')
+        if view.isRelegation:
+            text += ' {:>10.0%}'.format(result.getRelegation(view.teamName))
+        print(text)
+
+
+
+class HtmlRenderer(Renderer):
+    '''
+    :ivar Game game: The game with the page to build.
+
+    Class to represent a renderer that adds the views to the html page of the game.
+    '''
+
+
+
+    def __init__(self, game):
+        ''' Class constructor. '''
+        self.game = game
+
+
+
+    def renderPage(self, view):
+        ''' Start a new page with the title. '''
+        if view.title == None:
+            self.game.html = ''
+        elif view.team == None:
+            self.game.html = f'<h1>{view.title}</h1>'
+        else:
+            self.game.html = f'<h1>{view.team.name}{view.title}</h1>'
+
+
+
+    def renderMessage(self, view):
+        ''' Add the message as a paragraph. '''
+        if view.team == None:
+            self.game.html += f'<p>{view.text}</p>'
+        else:
+            self.game.html += f'<p>{view.team.name}{view.text}</p>'
+
+
+
+    def renderBanner(self, view):
+        ''' Add the title. '''
+        self.game.html += '<pre>'
+        for line in BANNER:
+            self.game.html += f'{line}\n'
+        self.game.html += '</pre>'
+
+
+
+    def renderWait(self, view):
+        ''' Add the link to continue. '''
+        if view.isPrompt:
+            self.game.html += '<p style="color: yellow; background-color: blue;"><a href="app:?response=c">Click to continue</a></p>'
+
+
+
+    def renderTeamList(self, view):
+        ''' Add the title and the teams. '''
+        self.game.html += f'<h2>{view.title}</h2><p>'
+        for team in view.teams:
+            self.game.html += f'{team.name}<br />'
+        self.game.html += '</p>'
+
+
+
+    def renderLeagueTable(self, view):
+        ''' Add the league table. '''
+        self.game.html += '<h1>Division {}</h1>'.format(view.division)
+        self.game.html += '<table>'
+        self.game.html += '<tr><td></td><td>Team</td><td>Won</td><td>Draw</td><td>Lost</td><td>Pts</td><td>Dif</td><tr>'
+        for team in view.teams:
+            self.game.html += team.htmlTableRow(view.isDebug)
+        self.game.html += '</table>'
+        self.game.html += '<p style="margin-bottom: 0px;">Matches Played: {}</p>'.format(view.numMatches)
+        self.game.html += '<p style="margin-top: 0px;">{} position: {}</p>'.format(view.team.name, view.position)
+
+
+
+    def renderResults(self, view):
+        ''' Start a new page with the results of all the matches in the division. '''
+        self.game.html = '<table>'
+        self.game.html += '<tr><td style="text-align: right;">{}</td><td style="text-align: center;">{} - {}</td><td>{}</td></tr>'.format(view.homeTeam.name, view.homeScore, view.awayScore, view.awayTeam.name)
+        for home, away, homeGoals, awayGoals in view.fixtures:
+            self.game.html += '<tr><td style="text-align: right;">{}</td><td style="text-align: center;">{} - {}</td><td>{}</td></tr>'.format(home.name, homeGoals, awayGoals, away.name)
+        self.game.html += '</table>'
+
+
+
+    def getFinancialRow(self, title, profit, loss):
+        ''' Returns a html table row of financial information. '''
+        if profit - loss >= 0:
+            return '<tr style="color: green;"><td>{}</td><td style="text-align: right;">£{:,.0f}</td><tr>'.format(title, profit - loss)
+        return '<tr style="color: red;"><td>{}</td><td style="text-align: right;">(£{:,.0f})</td><tr>'.format(title, loss - profit)
+
+
+
+    def renderFinancialReport(self, view):
+        ''' Start a new page with the financial report. '''
+        self.game.html = '<h1>Financial Report</h1>'
+        self.game.html += '<table>'
+        for title, profit, loss in view.items:
+            self.game.html += self.getFinancialRow(title, profit, loss)
+        self.game.html += '<tr><td colspan="2"><hr /><td></tr>'
+        self.game.html += self.getFinancialRow(*view.balance)
+        self.game.html += '<tr><td colspan="2"><hr /><td></tr>'
+        self.game.html += '<tr style="color: green;"><td>Cash</td><td style="text-align: right;">£{:,.0f}</td><tr>'.format(view.cash)
+        self.game.html += '<tr style="color: red;"><td>Debt</td><td style="text-align: right;">£{:,.0f}</td><tr>'.format(view.debt)
+        self.game.html += '</table>'
+
+
+
+    def renderInjury(self, view):
+        ''' Add the injury. '''
+        if view.player == None:
+            self.game.html += 'No injuries.'
+        else:
+            self.game.html += '{} has been injured.'.format(view.player.name)
+
+
+
+    def renderAppearances(self, view):
+        ''' Start a new page with the appearances and the top scorers. '''
+        self.game.html = '<h1>Player Appearances</h1>'
+        self.game.html += '<table>'
+        self.game.html += '<tr><td style="border-top: 3px solid purple; border-left: 3px solid purple;"></td><td style="border-top: 3px solid purple;">Player</td><td style="border-top: 3px solid purple;">Position</td><td style="border-top: 3px solid purple;">Apperances</td><td style="border-top: 3px solid purple; border-right: 3px solid purple;">Goals</td></tr>'
+        for index, player in enumerate(view.byCaps):
+            if index == len(view.byCaps) - 1:
+                extraStyle = ' border-bottom: 3px solid purple; padding-bottom: 15px;'
+            else:
+                extraStyle = ''
+            self.game.html += self.getPlayerRow(index, player, extraStyle)
+
+        # Top Scorers.
+        for index, player in enumerate(view.byGoals):
+            if index == 0:
+                extraStyle = ' border-top: 3px solid purple; padding-top: 15px;'
+            elif index == len(view.byGoals) - 1:
+                extraStyle = ' border-bottom: 3px solid purple; padding-bottom: 15px;'
+            else:
+                extraStyle = ''
+            if player.goals > 0:
+                self.game.html += self.getPlayerRow(index, player, extraStyle)
+
+
+
+    def renderFitness(self, view):
+        ''' Add the injured players and finish the table. '''
+        for index, (count, name, isFit) in enumerate(view.rows):
+            extraStyle = ' border-top: 3px solid purple; padding-top: 15px;' if index == 0 else ''
+            if count == view.numInjured:
+                extraStyle += ' border-bottom: 3px solid purple; padding-bottom: 15px;'
+            if isFit:
+                message = '{} is fit.'.format(name)
+            else:
+                message = '{} is injured.'.format(name)
+            self.game.html += '<tr><td style="text-align: right; border-left: 3px solid purple;{}";>{}</td><td colspan="4" style="color: {}; border-right: 3px solid purple;{}";>{}</td></tr>'.format(extraStyle, count, 'green' if isFit else 'red', extraStyle, message)
+        self.game.html += '</table>'
+
+
+
+    def getPlayerRow(self, index, player, extraStyle):
+        ''' Returns a html table row of the appearances for the player. '''
+        if player.injured:
+            htmlColour = ' color: red;'
+        elif player.inTeam:
+            htmlColour = ' color: green;'
+        else:
+            htmlColour = ''
+        return '<tr><td style="text-align: right; border-left: 3px solid purple;{}">{}</td><td style="{}{}">{}</td><td style="{}{}">{}</td><td style="text-align: right;{}{}">{}</td><td style="text-align: right; border-right: 3px solid purple;{}{}">{}</td></tr>'.format(extraStyle, index + 1, extraStyle, htmlColour, player.name, extraStyle, htmlColour, player.getPosition(), extraStyle, htmlColour, player.caps, extraStyle, htmlColour, player.goals)
+
+
+
+    def renderSquad(self, view):
+        ''' Start a new page with the players in the squad.  The user clicks a player to select them. '''
+        self.game.html = '<table>'
+        self.game.html += '<tr><td colspan="2">Player</td><td>Skill</td><td>Energy</td>'
+        for player in view.players:
+            self.game.html += player.htmlRow()
+        self.game.html += '</table>'
+
+
+
+    def renderPickTeam(self, view):
+        ''' Add the size of the team and the link back to the match. '''
+        if view.numTeam <= 11:
+            self.game.html += '<p>{} Picked, {} Squad, {} Injured.</p>'.format(view.numTeam, view.numSquad, view.numInjured)
+            self.game.html += '<p><a href="app:?response=b">Back to Match</a></p>'
+        else:
+            self.game.html += '<p>Select Player to drop.</a>'
+
+
+
+    def renderSellPlayer(self, view):
+        ''' Add the link back to the menu. '''
+        self.game.html += '<p><a href="app:?response=c">Click Here to return to main menu.</a></p>'
+        self.game.html += '<p>Otherwise click player to be sold.</p>'
+
+
+
+    def renderOffer(self, view):
+        ''' Add the offer and the links to accept or reject it. '''
+        self.game.html += '<p>{}</p>'.format(view.player.name)
+        self.game.html += '<p>You are offered £{:,.2f}</p>'.format(view.price)
+        self.game.html += 'Do you accept ( <a href="app:?response=y">Yes</a> / <a href="app?response=n">No</a> ) ?'
+
+
+
+    def renderCupReport(self, view):
+        ''' Start a new page with the results in the cup. '''
+        self.game.html = f'<h1>{view.cup.name}</h1>'
+        self.game.html += view.cup.htmlResults()
+
+
+
+    def renderMatch(self, view):
+        ''' Add the two teams and the links to change the team or play the match. '''
+        homeTeam = view.homeTeam
+        awayTeam = view.awayTeam
+        self.game.html += '<table>'
+        self.game.html += '<tr><td style="text-align: center;"></td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.name, awayTeam.name)
+        if view.isLeague:
+            self.game.html += '<tr><td style="text-align: center;">Position</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.position, awayTeam.position)
+        self.game.html += '<tr><td style="text-align: center;">Energy</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.energy // 10, awayTeam.energy // 10)
+        self.game.html += '<tr><td style="text-align: center;">Moral</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.moral, awayTeam.moral)
+        self.game.html += '<tr><td style="text-align: center;">Formation</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.formation, awayTeam.formation)
+        self.game.html += '<tr><td style="text-align: center;">Defence</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.defence, awayTeam.defence)
+        self.game.html += '<tr><td style="text-align: center;">Midfield</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.midfield, awayTeam.midfield)
+        self.game.html += '<tr><td style="text-align: center;">Attack</td><td style="text-align: center;">{}</td><td style="text-align: center;">{}</td></tr>'.format(homeTeam.attack, awayTeam.attack)
+        self.game.html += '</table>'
+        self.game.html += '<p>{} Picked, {} Squad, {} Injured.</p>'.format(view.numTeam, view.numSquad, view.numInjured)
+        self.game.html += '<p style="color: yellow; background-color: green;"><a href="app:?response=c">Press C to change team.</a></p>'
+        self.game.html += '<p style="color: yellow; background-color: green;"><a href="app:?response=t">Press TAB to play match.</a></p>'
+
+
+
+    def renderKickOff(self, view):
+        ''' Nothing to do.  The match is on a new page. '''
+        pass
+
+
+
+    def renderMatchClock(self, view):
+        ''' Nothing to do.  The wx window plays the match from the timeline in the page. '''
+        pass
+
+
+
+    def renderFinalScore(self, view):
+        ''' Add the final score. '''
+        self.game.html += '<p>{} {} - {} {}</p>'.format(view.homeTeam.name, view.homeGoals, view.awayGoals, view.awayTeam.name)
+
+
+
+    def renderCupMatch(self, view):
+        ''' Start a new page with the round of the cup and the previous results in the cup. '''
+        self.game.html = '<h1 style="display: inline">{} </h1><p style="display: inline">{}</p>'.format(view.cup.name, view.cup.getRoundName())
+        self.game.html += view.cup.htmlResults()
+
+
+
+    def renderCupStatus(self, view):
+        ''' Add whether the player's team is in or out of each cup. '''
+        self.game.html += '<p>'
+        for cup in view.cups:
+            if cup.isIn:
+                self.game.html += '{}: <span style="color: green;">in {}</span><br />'.format(cup.name, cup.getRoundName())
+            else:
+                self.game.html += '{}: <span style="color: red;">out {}</span><br />'.format(cup.name, cup.getRoundName())
+        self.game.html += '</p>'
+
+
+
+    def renderTitles(self, view):
+        ''' Add the titles held by the team. '''
+        self.game.html += '<p>'
+        for title in getTitles(view.titles):
+            self.game.html += f'{title}<br />'
+        self.game.html += '</p>'
+
+
+
+    def renderMarket(self, view):
+        ''' Start a new page with the player for sale and the form for the bid. '''
+        if view.player == None:
+            self.game.html = '<p>F.A. rules state that one team may not have more that 18 players. You already have 18 players therefore you may not buy another.</p>'
+            return
+        self.game.html = '<p>{}</p>'.format(view.player.getPosition())
+        self.game.html += '<table>'
+        self.game.html += view.player.htmlRow(view.price)
+        self.game.html += '</table>'
+        self.game.html += '<p>You have £{:,.2f}</p>'.format(view.money)
+        self.game.html += '<form action="app:" method="get">'
+        self.game.html += '<p>Enter your bid <input type="text" name="bid" /></p>'
+        self.game.html += '<p><input type="submit" name="button" value="Bid" /></p>'
+        self.game.html += '</form>'
+
+
+
+    def renderBid(self, view):
+        ''' Add the result of the bid. '''
+        if not view.isEnoughMoney:
+            self.game.html += '<p>You do not have enough money</p>'
+        elif view.isAccepted:
+            self.game.html += '<p>{} is added to your squad.</p>'.format(view.player.name)
+        elif view.bid > 0:
+            self.game.html += '<p>Your bid of £{:,.2f} is turned down.</p>'.format(view.bid)
+
+
+
+    def renderBalance(self, view):
+        ''' Add the money and the debt. '''
+        self.game.html += '<p>You have £{:,.2f}</p>'.format(view.money)
+        if view.debt > 0:
+            self.game.html += '<p>You owe £{:,.2f}</p>'.format(view.debt)
+        else:
+            self.game.html += '<p>In Bank £{:,.2f}</p>'.format(-view.debt)
+
+
+
+    def renderTransaction(self, view):
+        ''' Add the form to deposit or withdraw money. '''
+        self.game.html += '<form action="app:" method="get">'
+        self.game.html += '<p>Do you want to Deposit or Withdraw? <select name="sign"><option value="0">Withdraw</option><option value="1">Deposit</option></select></p>'
+        self.game.html += '<p>Enter the amount <input type="text" name="amount" /></p>'
+        self.game.html += '<p><input type="submit" name="transact" value="Transact" /></p>'
+
+
+
+    def renderProgress(self, view):
+        ''' Add the results summary and the chart of the position after each week. '''
+        self.game.html += '<table>'
+        self.game.html += '<tr><td colspan="5" style="text-align: center; border: 2px solid purple;">Home</td><td colspan="5" style="text-align:center; border: 2px solid purple;">Away</td><td style="border-top: 2px solid purple; border-left: 2px solid purple; border-right: 2px solid purple;"></td></tr>'
+        self.game.html += '<tr><td style="text-align: right; border-left: 2px solid purple; border-bottom: 2px solid purple;">Win</td><td style="text-align: right; border-bottom: 2px solid purple;">Draw</td><td style="text-align: right; border-bottom: 2px solid purple;">Lose</td><td style="text-align: right; border-bottom: 2px solid purple;">For</td><td style="text-align: right; border-bottom: 2px solid purple; border-right: 2px solid purple;">Agn</td><td style="text-align: right; border-bottom: 2px solid purple; border-left: 2px solid purple;">Win</td><td style="text-align: right; border-bottom: 2px solid purple;">Draw</td><td style="text-align: right; border-bottom: 2px solid purple;">Lose</td><td style="text-align: right; border-bottom: 2px solid purple;">For</td><td style="text-align: right; border-bottom: 2px solid purple; border-right: 2px solid purple;">Agn</td><td style="text-align: right; border-bottom: 2px solid purple; border-left: 2px solid purple; border-right: 2px solid purple;">Points</td></tr>'
+        self.game.html += '<tr><td style="text-align: right; border-left: 2px solid purple; border-bottom: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple; border-right: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple; border-left: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple;">{}</td><td style="text-align: right; border-bottom: 2px solid purple; border-right: 2px solid purple;">{}</td><td style="text-align: right; border: 2px solid purple; padding-right: 10px;">{}</td></tr>'.format(*view.home, *view.away, view.pts)
+        self.game.html += '</table>'
+
+        # Show league progress.
+        league = view.league
+        size = 20
+        width = league.matchesPerSeason * size
+        height = league.numTeams * size
+        self.game.html += '<svg width="{}" height="{}" style="vertical-align:top;" xmlns="http://www.w3.org/2000/svg" version="1.1">'.format(width, height)
+        self.game.html += '<rect x="0" y="0" width="{}" height="{}" stroke="white" fill="none" />'.format(width-1, height-1)
+        self.game.html += '<line x1="0" y1="{}" x2="{}" y2="{}" stroke="white" stroke-dasharray="5,5" />'.format(size*league.numPromoted, width, size*league.numPromoted)
+        self.game.html += '<line x1="0" y1="{}" x2="{}" y2="{}" stroke="white" stroke-dasharray="5,5" />'.format(size*(league.numTeams // 2), width, size*(league.numTeams // 2))
+        self.game.html += '<line x1="0" y1="{}" x2="{}" y2="{}" stroke="white" stroke-dasharray="5,5" />'.format(size*league.getFirstRelegated(), width, size*league.getFirstRelegated())
+        for count, week in enumerate(view.weeks):
+            position = 0 + (week & 63)
+
+            x = count * size
+            y = position * size
+            if week & 192 == 0:
+                # Lost.
+                colour = 'red'
+            elif week & 192 == 128:
+                # Win.
+                colour = 'green'
+            else:
+                # Draw.
+                colour = 'yellow'
+
+            self.game.html += '<rect x="{}" y="{}" width="{}" height="{}" stroke="white" fill="{}" />'.format(x, y, size, size, colour)
+        self.game.html += '</svg>'
+
+
+
+    def renderHistory(self, view):
+        ''' Add the seasons of the career. '''
+        self.game.html += '<h2>Career</h2>'
+        self.game.html += '<table><tr><td>Season</td><td>Division</td><td style="text-align: right;">Position</td><td style="text-align: right;">Points</td><td>Cups</td></tr>'
+        for season in view.seasons:
+            cups = ', '.join(f'{cup.name} {cup.getRoundName()}' for cup in season.cups)
+            self.game.html += f'<tr><td>{season.season}</td><td>{season.division}</td><td style="text-align: right;">{season.position}</td><td style="text-align: right;">{season.pts}</td><td>{cups}</td></tr>'
+        self.game.html += '</table>'
+
+
+
+    def renderProjection(self, view):
+        ''' Add the chance of each team winning the division, promotion and relegation. '''
+        result = view.result
+        self.game.html += '<h2>Projection from {} seasons</h2>'.format(result.numSamples)
+        self.game.html += '<table>'
+        self.game.html += '<tr><td></td><td style="text-align: right;">Champions</td>'
+        if view.isPromotion:
+            self.game.html += '<td style="text-align: right;">Promotion</td>'
+        if view.isRelegation:
+            self.game.html += '<td style="text-align: right;">Relegation</td>'
+        self.game.html += '</tr>'
+        for name in result.names:
+            if name == view.teamName:
+                self.game.html += '<tr style="font-weight: bold;">'
+            else:
+                self.game.html += '<tr>'
+            self.game.html += '<td>{}</td><td style="text-align: right;">{:.0%}</td>'.format(name, result.getPositions(name)[0])
+            if view.isPromotion:
+                self.game.html += '<td style="text-align: right;">{:.0%}</td>'.format(result.getPromotion(name))
+            if view.isRelegation:
+                self.game.html += '<td style="text-align: right;">{:.0%}</td>'.format(result.getRelegation(name))
+            self.game.html += '</tr>'
+        self.game.html += '</table>'
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the save file format for the BBC Football Manager program.
+A save file is a header, a table of sections and the sections.
+The header has the magic bytes, the schema version, a CRC32 of the section table and the length of the section table.
+Each section is a list of records with its own CRC32.
+The hot section has the current season and is read when the game is loaded.
+The history section has the seasons that have finished and is only read when it is needed.
+Each record is a tag, the length of the fields and the fields packed with :py:mod:`struct`.
+Records with unknown tags are skipped and fields are only ever added to the end of a record.
+So a new field or a new record does not break the older save files.
+Version 1 save files are the header and the records of the hot section with a CRC32 of the records in the header.
+Older save files were json lines, these start without the magic bytes.
+'''
+
+# System libraries.
+import struct
+import zlib
+import array
+import sys
+import os
+
+
+
+# The start of every binary save file.
+MAGIC = b'BBCFM'
+
+# The version of the records.  Increase this when a record changes other than by adding fields to the end.
+VERSION = 2
+
+# The header is the magic bytes, the version, the CRC32 and the length of the section table.
+HEADER = struct.Struct('<5sHII')
+
+# Each entry in the section table is the section, the offset in the file, the length and the CRC32.
+SECTION = struct.Struct('<BQQI')
+
+# The sections.
+HOT_SECTION = 1
+HISTORY_SECTION = 2
+
+# Each record starts with the tag and the length of the fields.
+RECORD = struct.Struct('<BI')
+
+# The record tags.
+CONFIG = 1
+GAME = 2
+PLAYER = 3
+TEAM = 4
+CUP = 5
+CUP_RESULT = 6
+RANDOM = 7
+FIXTURES = 8
+DIVISION = 9
+SEASON = 10
+
+# The fields of each record as (attribute name, code) pairs.
+# The codes are struct format characters, 'S' for a utf-8 string and 'A' for a list of 16 bit numbers.
+FIELDS = {
+    CONFIG: (('numTeams', 'H'), ('numPromoted', 'H'), ('numRelegated', 'H'), ('matchesPerSeason', 'H')),
+    GAME: (
+        ('numMatches', 'H'), ('money', 'q'), ('debt', 'q'), ('numSquad', 'B'), ('numTeam', 'B'), ('numInjured', 'B'), ('division', 'B'),
+        ('teamName', 'S'), ('teamColour', 'S'), ('formation', 'A'),
+        ('homeWins', 'I'), ('homeDraws', 'I'), ('homeLoses', 'I'), ('homeFor', 'I'), ('homeAgainst', 'I'),
+        ('awayWins', 'I'), ('awayDraws', 'I'), ('awayLoses', 'I'), ('awayFor', 'I'), ('awayAgainst', 'I'),
+        ('titles', 'I'), ('weeks', 'A')
+    ),
+    PLAYER: (('name', 'S'), ('skill', 'B'), ('energy', 'B'), ('position', 'B'), ('index', 'H'), ('inSquad', '?'), ('inTeam', '?'), ('injured', '?'), ('caps', 'H'), ('goals', 'H')),
+    TEAM: (
+        ('name', 'S'), ('colour', 'S'), ('energy', 'h'), ('moral', 'h'), ('defence', 'h'), ('midfield', 'h'), ('attack', 'h'), ('position', 'H'),
+        ('pts', 'h'), ('difference', 'h'), ('isPlayedHome', '?'), ('isPlayedAway', '?'), ('formation', 'S'), ('fixture', 'h'),
+        ('win', 'H'), ('draw', 'H'), ('lost', 'H')
+    ),
+    CUP: (('name', 'S'), ('isIn', '?'), ('round', 'B'), ('mask', 'i'), ('notMask', 'i')),
+    CUP_RESULT: (('stage', 'S'), ('isHomeMatch', '?'), ('opponent', 'S'), ('homeGoals', 'B'), ('awayGoals', 'B')),
+    RANDOM: (('seed', 'S'), ('season', 'H')),
+    FIXTURES: (('names', 'S'), ('rounds', 'A')),
+    DIVISION: (('number', 'B'),),
+    SEASON: (
+        ('season', 'H'), ('division', 'B'), ('teamName', 'S'), ('position', 'H'), ('pts', 'h'), ('difference', 'h'),
+        ('homeWins', 'I'), ('homeDraws', 'I'), ('homeLoses', 'I'), ('homeFor', 'I'), ('homeAgainst', 'I'),
+        ('awayWins', 'I'), ('awayDraws', 'I'), ('awayLoses', 'I'), ('awayFor', 'I'), ('awayAgainst', 'I'),
+        ('money', 'q'), ('debt', 'q'), ('weeks', 'A')
+    )
+}
+
+# The struct format characters of the integer fields.
+INTEGER_CODES = 'bBhHiIlLqQ'
+
+# The length prefix of the strings and the lists.
+STRING_LENGTH = struct.Struct('<H')
+LIST_LENGTH = struct.Struct('<I')
+
+
+
+def compileFields(fields):
+    '''
+    :param tuple fields: The (attribute name, code) pairs of a record.
+    :returns: A list of parts.  Each part is a :py:class:`struct.Struct` for a run of fixed size fields and the number of fields, or the code 'S' or 'A' and 1.
+
+    The runs of fixed size fields are packed with one call.
+    '''
+    parts = []
+    run = ''
+    for _, code in fields:
+        if code in 'SA':
+            if run != '':
+                parts.append((struct.Struct('<' + run), len(run)))
+                run = ''
+            parts.append((code, 1))
+        else:
+            run += code
+    if run != '':
+        parts.append((struct.Struct('<' + run), len(run)))
+    return parts
+
+
+
+# The compiled fields of each record.
+PARTS = {tag: compileFields(fields) for tag, fields in FIELDS.items()}
+
+
+
+def isSaveFile(data):
+    ''' Returns True if the data starts like a binary save file.  Returns False for the older json lines save files. '''
+    return data[:len(MAGIC)] == MAGIC
+
+
+
+def packSections(sections):
+    '''
+    :param list sections: The (section, records) pairs.  The records are from :py:func:`SaveWriter.getBody`.
+    :returns: The whole save file.
+    '''
+    offset = HEADER.size + SECTION.size * len(sections)
+    table = []
+    for section, body in sections:
+        table.append(SECTION.pack(section, offset, len(body), zlib.crc32(body)))
+        offset += len(body)
+    table = b''.join(table)
+    return b''.join([HEADER.pack(MAGIC, VERSION, zlib.crc32(table), len(table)), table] + [body for _, body in sections])
+
+
+
+def checkBody(body, length, checksum):
+    ''' Returns the body.  Raises a ValueError if the body does not have the specified length and CRC32. '''
+    if len(body) != length or zlib.crc32(body) != checksum:
+        raise ValueError('The save file is damaged.')
+    return body
+
+
+
+def writeFile(fileName, data):
+    ''' Write the data into the specified file.  The data is written to a temporary file first and renamed so the file is never half written. '''
+    temporaryName = fileName + '.tmp'
+    with open(temporaryName, 'wb') as outputFile:
+        outputFile.write(data)
+    os.replace(temporaryName, fileName)
+
+
+
+def setFields(tag, item, values):
+    ''' Set the attributes of the item from the values of a record with the specified tag.  The fields that are not in the values are left alone. '''
+    for (name, _), value in zip(FIELDS[tag], values):
+        setattr(item, name, value)
+
+
+
+def packFields(tag, values):
+    ''' Returns the bytes of the fields for a record with the specified tag. '''
+    output = []
+    start = 0
+    for part, count in PARTS[tag]:
+        if part == 'S':
+            value = values[start].encode('utf-8')
+            output.append(STRING_LENGTH.pack(len(value)))
+            output.append(value)
+        elif part == 'A':
+            value = array.array('H', values[start])
+            if sys.byteorder == 'big':
+                value.byteswap()
+            output.append(LIST_LENGTH.pack(len(value)))
+            output.append(value.tobytes())
+        else:
+            # The integer fields might be floats, for example the money in an older json save file.
+            fields = [int(value) if isinstance(value, float) and code in INTEGER_CODES else value for code, value in zip(part.format[1:], values[start:start + count])]
+            output.append(part.pack(*fields))
+        start += count
+    return b''.join(output)
+
+
+
+def unpackFields(tag, data):
+    '''
+    Returns the list of the values of the fields in the data of a record with the specified tag.
+    The list is shorter than the fields when the record was written by an older version.
+    '''
+    values = []
+    offset = 0
+    for part, count in PARTS[tag]:
+        if offset >= len(data):
+            break
+        if part == 'S':
+            length, = STRING_LENGTH.unpack_from(data, offset)
+            offset += STRING_LENGTH.size
+            values.append(str(data[offset:offset + length], 'utf-8'))
+            offset += length
+        elif part == 'A':
+            length, = LIST_LENGTH.unpack_from(data, offset)
+            offset += LIST_LENGTH.size
+            value = array.array('H')
+            value.frombytes(data[offset:offset + 2 * length])
+            if sys.byteorder == 'big':
+                value.byteswap()
+            values.append(value.tolist())
+            offset += 2 * length
+        else:
+            values.extend(part.unpack_from(data, offset))
+            offset += part.size
+    return values
+
+
+
+class SaveWriter:
+    '''
+    :ivar list output: The packed records.
+
+    Class to build a binary save file in memory so that it can be written in one go.
+    '''
+
+
+
+    def __init__(self):
+        ''' Class constructor. '''
+        self.output = []
+
+
+
+    def add(self, tag, *values):
+        ''' Add a record with the specified values. '''
+        data = packFields(tag, values)
+        self.output.append(RECORD.pack(tag, len(data)))
+        self.output.append(data)
+
+
+
+    def addObject(self, tag, item):
+        ''' Add a record with the values of the fields taken from the attributes of the item. '''
+        self.add(tag, *[getattr(item, name) for name, _ in FIELDS[tag]])
+
+
+
+    def addBody(self, body):
+        ''' Add the records that were packed by another writer. '''
+        self.output.append(body)
+
+
+
+    def getBody(self):
+        ''' Returns the records. '''
+        return b''.join(self.output)
+
+
+
+class SaveFile:
+    '''
+    :ivar file inputFile: The open save file.
+    :ivar int version: The version of the save file.
+    :ivar int checksum: The CRC32 from the header.  This changes when anything in the file changes.
+    :ivar dict sections: The (offset, length, checksum) of each section.
+
+    Class to read the sections of a binary save file.
+    Only the header and the section table are read when the file is opened.
+    A version 1 save file has just the hot section.
+    '''
+
+
+
+    def __init__(self, inputFile):
+        ''' Class constructor.  Raises a ValueError if the file is not a good save file. '''
+        header = inputFile.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError('The save file is too short.')
+        magic, self.version, self.checksum, length = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError('The save file is not a BBC Football Manager save file.')
+        if self.version > VERSION:
+            raise ValueError(f'The save file is version {self.version}.  This program only reads up to version {VERSION}.')
+        self.inputFile = inputFile
+        if self.version == 1:
+            self.sections = {HOT_SECTION: (HEADER.size, length, self.checksum)}
+            return
+        table = checkBody(inputFile.read(length), length, self.checksum)
+        self.sections = {}
+        for offset in range(0, length, SECTION.size):
+            section, start, size, checksum = SECTION.unpack_from(table, offset)
+            self.sections[section] = (start, size, checksum)
+
+
+
+    def getSection(self, section):
+        ''' Returns the (offset, length, checksum) of the section or None if the file does not have the section. '''
+        return self.sections.get(section)
+
+
+
+    def read(self, section):
+        ''' Returns a :py:class:`SaveReader` for the records in the section.  Raises a ValueError if the section is missing or damaged. '''
+        if section not in self.sections:
+            raise ValueError(f'The save file does not have section {section}.')
+        offset, length, checksum = self.sections[section]
+        self.inputFile.seek(offset)
+        return SaveReader(checkBody(self.inputFile.read(length), length, checksum))
+
+
+
+class SaveReader:
+    '''
+    :ivar list records: The (tag, data) of each record that is still to be read.
+
+    Class to read the records from a section of a save file.
+    The caller checks the CRC32 of the records before they are read.
+    '''
+
+
+
+    def __init__(self, body):
+        ''' Class constructor.  Split the body into records.  The records with unknown tags are skipped. '''
+        body = memoryview(body)
+        self.records = []
+        offset = 0
+        while offset < len(body):
+            tag, size = RECORD.unpack_from(body, offset)
+            offset += RECORD.size
+            if tag in FIELDS:
+                self.records.append((tag, body[offset:offset + size]))
+            offset += size
+        self.records.reverse()
+
+
+
+    def isNext(self, tag):
+        ''' Returns True if the next record has the specified tag. '''
+        return len(self.records) > 0 and self.records[-1][0] == tag
+
+
+
+    def read(self, tag):
+        ''' Returns the values of the next record.  Raises a ValueError if the next record does not have the specified tag. '''
+        if not self.isNext(tag):
+            raise ValueError(f'Expected a record with tag {tag} in the save file.')
+        return unpackFields(tag, self.records.pop()[1])
+
+
+
+    def readObject(self, tag, item):
+        ''' Set the attributes of the item from the next record.  The fields that are not in the record are left alone. '''
+        setFields(tag, item, self.read(tag))
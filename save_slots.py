@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the SaveSlots class for the BBC Football Manager program.
+Each saved game is a file in the save folder.
+The index file has a few details of each saved game so the saved games can be listed without reading them.
+'''
+
+# System libraries.
+import os
+import json
+import time
+
+# Application Libraries.
+import save_format
+
+
+
+class SaveSlots:
+    '''
+    :ivar string directory: The folder for the save files.
+    :ivar dict index: The details of each saved game by slot name.  This is None until the index file is read.
+
+    Class to represent the saved games of the BBC Football Manager game.
+    '''
+    INDEX_FILE = 'index.json'
+    EXTENSION = '.game'
+    # The single save file of the older versions.  This is in the current folder.
+    OLD_SAVE_FILE = 'save.game'
+
+
+
+    def __init__(self, directory):
+        ''' Class constructor. '''
+        self.directory = directory
+        self.index = None
+
+
+
+    def getSlotName(self, name):
+        ''' Returns the specified name with only the characters that are safe in a file name. '''
+        slotName = ''.join(character if character.isalnum() or character in '-_' else '_' for character in name.strip())
+        if slotName == '':
+            slotName = 'save'
+        return slotName
+
+
+
+    def getFileName(self, slotName):
+        ''' Returns the name of the save file for the slot. '''
+        if slotName == SaveSlots.OLD_SAVE_FILE:
+            return SaveSlots.OLD_SAVE_FILE
+        return os.path.join(self.directory, slotName + SaveSlots.EXTENSION)
+
+
+
+    def getIndex(self):
+        ''' Returns the details of each saved game by slot name.  The index file is only read once. '''
+        if self.index == None:
+            self.index = {}
+            fileName = os.path.join(self.directory, SaveSlots.INDEX_FILE)
+            if os.path.exists(fileName):
+                try:
+                    with open(fileName, 'r', encoding='utf-8') as inputFile:
+                        self.index = json.load(inputFile)
+                except ValueError:
+                    print(f'Error reading {fileName}.')
+        return self.index
+
+
+
+    def getSlots(self):
+        '''
+        Returns a list of (slot name, details) for the saved games.  The newest is first.
+        The save file from the older versions is at the end with no details.
+        '''
+        index = self.getIndex()
+        slots = sorted(index.items(), key=lambda item: item[1].get('timestamp', 0), reverse=True)
+        if 'save' not in index and os.path.exists(SaveSlots.OLD_SAVE_FILE):
+            slots.append((SaveSlots.OLD_SAVE_FILE, None))
+        return slots
+
+
+
+    def getDescription(self, slotName, details):
+        ''' Returns a line of text that describes the saved game. '''
+        if details == None:
+            return f'{slotName} (older save file)'
+        timestamp = time.strftime('%d/%m/%Y %H:%M', time.localtime(details['timestamp']))
+        return f'{slotName}: {details["team"]} Division {details["division"]} Season {details["season"]} Week {details["week"]} £{details["money"]:,} ({timestamp})'
+
+
+
+    def write(self, slotName, data, details):
+        ''' Write the save file for the slot and update the index. '''
+        os.makedirs(self.directory, exist_ok=True)
+        save_format.writeFile(self.getFileName(slotName), data)
+        self.setDetails(slotName, details)
+
+
+
+    def setDetails(self, slotName, details):
+        ''' Update the details of the slot in the index file. '''
+        index = self.getIndex()
+        index[slotName] = details
+        os.makedirs(self.directory, exist_ok=True)
+        save_format.writeFile(os.path.join(self.directory, SaveSlots.INDEX_FILE), json.dumps(index, indent=1).encode('utf-8'))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the recording of sessions for the BBC Football Manager program.
+A recording is a json lines file.  The first line has the seed and the settings of the game.
+Each other line is an input from the user, a response to Game.getNextPage() from the wx window, a key or a line of text from the console.
+Replaying the inputs in a new game with the same seed plays the same session again without a user.
+'''
+
+# System libraries.
+import argparse
+import json
+
+
+
+class RecordingFinished(Exception):
+    '''
+    Class to represent the end of the inputs in a recording.
+    '''
+
+
+
+class SessionRecorder:
+    '''
+    :ivar file outputFile: The recording.  This is line buffered so the recording is complete when the program is stopped.
+
+    Class to write the inputs of a session into a recording.
+    '''
+    VERSION = 1
+
+
+
+    def __init__(self, fileName, frontend, game):
+        ''' Class constructor.  Write the seed and the settings of the game. '''
+        self.outputFile = open(fileName, 'w', encoding='utf-8', buffering=1)
+        header = {
+            'version': SessionRecorder.VERSION,
+            'frontend': frontend,
+            'seed': game.rng.seed,
+            'teams': game.args.teams,
+            'world': game.args.world,
+            'debug': game.args.debug,
+            'odds': game.args.odds
+        }
+        self.outputFile.write(json.dumps(header) + '\n')
+
+
+
+    def add(self, kind, value):
+        ''' Add an input to the recording.  The kind is 'response', 'key' or 'text'. '''
+        self.outputFile.write(json.dumps([kind, value]) + '\n')
+
+
+
+    def close(self):
+        ''' Close the recording. '''
+        self.outputFile.close()
+
+
+
+class SessionReplay:
+    '''
+    :ivar string fileName: The recording.
+    :ivar dict header: The seed and the settings of the game.
+    :ivar list inputs: The (kind, value) of each input.
+    :ivar int index: The index of the next input.
+
+    Class to read the inputs of a session from a recording.
+    '''
+
+
+
+    def __init__(self, fileName):
+        ''' Class constructor.  Read the whole recording. '''
+        self.fileName = fileName
+        with open(fileName, 'r', encoding='utf-8') as inputFile:
+            self.header = json.loads(inputFile.readline())
+            if self.header.get('version') != SessionRecorder.VERSION:
+                raise ValueError(f'{fileName} is not a version {SessionRecorder.VERSION} recording.')
+            self.inputs = [json.loads(line) for line in inputFile if line.strip() != '']
+        self.index = 0
+
+
+
+    @property
+    def frontend(self):
+        ''' The frontend of the session, 'graphical' or 'console'. '''
+        return self.header['frontend']
+
+
+
+    def getArgs(self, args, saves):
+        '''
+        :param Namespace args: The command line arguments.
+        :param string saves: The folder for the saved games during the replay.
+        :returns: The command line arguments for the game with the seed and the settings from the recording.
+        '''
+        replayArgs = argparse.Namespace(**vars(args))
+        replayArgs.seed = self.header['seed']
+        replayArgs.teams = self.header['teams']
+        replayArgs.world = self.header['world']
+        replayArgs.debug = self.header['debug']
+        replayArgs.odds = self.header['odds']
+        replayArgs.graphical = self.frontend == 'graphical'
+        replayArgs.saves = saves
+        replayArgs.record = None
+        return replayArgs
+
+
+
+    def getInput(self, kind):
+        '''
+        Returns the value of the next input.
+        Raises :py:class:`RecordingFinished` after the last input.
+        Raises ValueError if the game asks for a different kind of input than the recording has, because then the replay is not the same session.
+        '''
+        if self.index >= len(self.inputs):
+            raise RecordingFinished()
+        recordedKind, value = self.inputs[self.index]
+        if recordedKind != kind:
+            raise ValueError(f'{self.fileName} has a {recordedKind} at input {self.index + 1} but the game asked for a {kind}.')
+        self.index += 1
+        return value
@@ -11,16 +11,53 @@ import json
 
 # Application Libraries.
 import ansi
+import club_catalog
+import save_format
+from team_table import TeamTable, column, flagColumn, nameColumn
 
 
 
 class Team:
-    ''' Class to represent a team in the BBC Football Manager game. '''
-
-
-
-    def __init__(self):
-        ''' Class constructor. '''
+    '''
+    :ivar TeamTable table: The table that holds the values of the team.
+    :ivar int row: The row of the team in the table.
+
+    Class to represent a team in the BBC Football Manager game.
+    The values are stored in a row of a :py:class:`TeamTable`.
+    '''
+    __slots__ = ('table', 'row', '__weakref__')
+
+    name = nameColumn()
+    colour = column('colour')
+    energy = column('energy')
+    moral = column('moral')
+    defence = column('defence')
+    midfield = column('midfield')
+    attack = column('attack')
+    position = column('position')
+    pts = column('pts')
+    difference = column('difference')
+    isPlayedHome = flagColumn('isPlayedHome')
+    isPlayedAway = flagColumn('isPlayedAway')
+    formation = column('formation')
+    fixture = column('fixture')
+    win = column('win')
+    draw = column('draw')
+    lost = column('lost')
+    numHomeGames = column('numHomeGames')
+
+
+
+    def __init__(self, table=None):
+        '''
+        Class constructor.
+
+        :param TeamTable table: Optional table to add the team to.  A team without a table has a table of its own.  Teams that only last a while, such as cup opponents, should use a shared table and :py:meth:`release` their row.
+        '''
+        if table is None:
+            table = TeamTable()
+        self.table = table
+        self.row = table.addRow(self)
         self.name = 'Error'
         self.colour = ansi.WHITE
         self.energy = 1
@@ -42,18 +79,18 @@ class Team:
 
 
 
-    def initialise(self, division):
-        ''' Replacement for FNTEAM (Line 3750) in the BBC Basic version. '''
-        numDefence = 3 + random.randint(1, 2)
-        numMidfield = 2 + random.randint(1, 3)
+    def initialise(self, division, rng=random):
+        ''' Replacement for FNTEAM (Line 3750) in the BBC Basic version.  The rng defaults to the global random module. '''
+        numDefence = 3 + rng.randint(1, 2)
+        numMidfield = 2 + rng.randint(1, 3)
         numAttack = 11 - numMidfield - numDefence
         bonus = 1 + (1 if division < 4 else 0) + (1 if division == 1 else 0)
         skill = 4 - (division & 1)
-        self.energy = multiRandomInt(20, 11)
-        self.moral = 9 + random.randint(1, 11)
-        self.defence = numDefence * bonus + multiRandomInt(skill, numDefence)
-        self.midfield = numMidfield * bonus + multiRandomInt(skill, numMidfield)
-        self.attack = numAttack * bonus + multiRandomInt(skill, numAttack)
+        self.energy = multiRandomInt(20, 11, rng)
+        self.moral = 9 + rng.randint(1, 11)
+        self.defence = numDefence * bonus + multiRandomInt(skill, numDefence, rng)
+        self.midfield = numMidfield * bonus + multiRandomInt(skill, numMidfield, rng)
+        self.attack = numAttack * bonus + multiRandomInt(skill, numAttack, rng)
         self.formation = f'{numDefence-1}-{numMidfield}-{numAttack}'
 
         self.pts = 0
@@ -108,6 +145,12 @@ class Team:
 
 
 
+    def release(self):
+        ''' Give the row of the team back to its table.  The team must not be used afterwards. '''
+        self.table.releaseRow(self.row)
+
+
+
     def getColouredName(self):
         ''' Returns the team name wrapped in the colour code. '''
         return f'{self.colour}{self.name}{ansi.RESET_ALL}'
@@ -115,313 +158,42 @@ class Team:
 
 
     def getTeam(self, division, index):
-        ''' This is the replacement for FNGETTEAM(). Populate the object with a prebuilt team. '''
-        if division == 1:
-            if index == 1:
-                self.name = 'Liverpool'
-                self.colour = ansi.RED
-            elif index == 2:
-                self.name = 'Man United'
-                self.colour = ansi.RED
-            elif index == 3:
-                self.name = 'Leeds United'
-                self.colour = ansi.YELLOW
-            elif index == 4:
-                self.name = 'Arsenal'
-                self.colour = ansi.RED
-            elif index == 5:
-                self.name = 'Spurs'
-                self.colour = ansi.WHITE
-            elif index == 6:
-                self.name = 'Aston Villa'
-                self.colour = ansi.MAGENTA
-            elif index == 7:
-                self.name = 'Everton'
-                self.colour = ansi.LIGHT_BLUE
-            elif index == 8:
-                self.name = 'Nottm Forest'
-                self.colour = ansi.RED
-            elif index == 9:
-                self.name = 'Millwall'
-                self.colour = ansi.WHITE
-            elif index == 10:
-                self.name = 'Coventry'
-                self.colour = ansi.CYAN
-            elif index == 11:
-                self.name = 'West Ham'
-                self.colour = ansi.MAGENTA
-            elif index == 12:
-                self.name = 'Norwich'
-                self.colour = ansi.YELLOW
-            elif index == 13:
-                self.name = 'Sheff Wed'
-                self.colour = ansi.YELLOW
-            elif index == 14:
-                self.name = 'Derby'
-                self.colour = ansi.WHITE
-            elif index == 15:
-                self.name = 'Chelsea'
-                self.colour = ansi.LIGHT_BLUE
-            elif index == 16:
-                self.name = 'Newcastle'
-                self.colour = ansi.WHITE
-            elif index > 16:
-                self.getTeam(division + 1, index - 16)
-        elif division == 2:
-            if index == 1:
-                self.name = 'Watford'
-                self.colour = ansi.YELLOW
-            elif index == 2:
-                self.name = 'Stoke City'
-                self.colour = ansi.RED
-            elif index == 3:
-                self.name = 'Brighton'
-                self.colour = ansi.LIGHT_BLUE
-            elif index == 4:
-                self.name = 'Barnsley'
-                self.colour = ansi.RED
-            elif index == 5:
-                self.name = 'Plymouth'
-                self.colour = ansi.LIGHT_BLUE
-            elif index == 6:
-                self.name = 'Hull City'
-                self.colour = ansi.MAGENTA
-            elif index == 7:
-                self.name = 'Notts Co'
-                self.colour = ansi.WHITE
-            elif index == 8:
-                self.name = 'Man City'
-                self.colour = ansi.CYAN
-            elif index == 9:
-                self.name = 'Shrewsbury'
-                self.colour = ansi.RED
-            elif index == 10:
-                self.name = 'Burnley'
-                self.colour = ansi.MAGENTA
-            elif index == 11:
-                self.name = 'Charlton'
-                self.colour = ansi.RED
-            elif index == 12:
-                self.name = 'Sunderland'
-                self.colour = ansi.RED
-            elif index == 13:
-                self.name = 'Bradford'
-                self.colour = ansi.RED
-            elif index == 14:
-                self.name = 'Bury'
-                self.colour = ansi.LIGHT_BLUE
-            elif index == 15:
-                self.name = 'Sheff United'
-                self.colour = ansi.RED
-            elif index == 16:
-                self.name = 'Huddersfield'
-                self.colour = ansi.LIGHT_BLUE
-            elif index > 16:
-                self.getTeam(division + 1, index - 16)
-        elif division == 3:
-            if index == 1:
-                self.name = 'Wolves'
-                self.colour = ansi.YELLOW
-            elif index == 2:
-                self.name = 'Oxford'
-                self.colour = ansi.RED
-            elif index == 3:
-                self.name = 'Swindon'
-                self.colour = ansi.RED
-            elif index == 4:
-                self.name = 'Walsall'
-                self.colour = ansi.RED
-            elif index == 5:
-                self.name = 'Newport'
-                self.colour = ansi.GREEN
-            elif index == 6:
-                self.name = 'Wigan'
-                self.colour = ansi.RED
-            elif index == 7:
-                self.name = 'Wimbledon'
-                self.colour = ansi.RED
-            elif index == 8:
-                self.name = 'Mansfield'
-                self.colour = ansi.GREEN
-            elif index == 9:
-                self.name = 'Southend'
-                self.colour = ansi.RED
-            elif index == 10:
-                self.name = 'Grimsby'
-                self.colour = ansi.GREEN
-            elif index == 11:
-                self.name = 'Blackburn'
-                self.colour = ansi.MAGENTA
-            elif index == 12:
-                self.name = 'Reading'
-                self.colour = ansi.RED
-            elif index == 13:
-                self.name = 'Crewe'
-                self.colour = ansi.YELLOW
-            elif index == 14:
-                self.name = 'Darlington'
-                self.colour = ansi.RED
-            elif index == 15:
-                self.name = 'Port Value'
-                self.colour = ansi.LIGHT_BLUE
-            elif index == 16:
-                self.name = 'Stockport'
-                self.colour = ansi.RED
-            elif index > 16:
-                self.getTeam(division + 1, index - 16)
-        elif division == 4:
-            if index == 1:
-                self.name = 'Scunthorpe'
-                self.colour = ansi.RED
-            elif index == 2:
-                self.name = 'York'
-                self.colour = ansi.GREEN
-            elif index == 3:
-                self.name = 'Bournemouth'
-                self.colour = ansi.LIGHT_BLUE
-            elif index == 4:
-                self.name = 'Doncaster'
-                self.colour = ansi.CYAN
-            elif index == 5:
-                self.name = 'Lincoln'
-                self.colour = ansi.MAGENTA
-            elif index == 6:
-                self.name = 'Rochdale'
-                self.colour = ansi.RED
-            elif index == 7:
-                self.name = 'Hereford'
-                self.colour = ansi.YELLOW
-            elif index == 8:
-                self.name = 'Hartlepool'
-                self.colour = ansi.LIGHT_BLUE
-            elif index == 9:
-                self.name = 'Halifax'
-                self.colour = ansi.RED
-            elif index == 10:
-                self.name = 'Tranmere'
-                self.colour = ansi.RED
-            elif index == 11:
-                self.name = 'Aldershot'
-                self.colour = ansi.YELLOW
-            elif index == 12:
-                self.name = 'Bristol'
-                self.colour = ansi.LIGHT_BLUE
-            elif index == 13:
-                self.name = 'Wrexham'
-                self.colour = ansi.RED
-            elif index == 14:
-                self.name = 'Torquay'
-                self.colour = ansi.GREEN
-            elif index == 15:
-                self.name = 'Gillingham'
-                self.colour = ansi.GREEN
-            elif index == 16:
-                self.name = 'Exeter'
-                self.colour = ansi.RED
-            elif index > 16:
-                self.getTeam(division - 1, index - 16)
-        elif division > 4:
-            if index == 1:
-                self.name = 'Glasgow Rangers'
-                self.colour = ansi.BLUE
-            elif index == 2:
-                self.name = 'Glasgow Celtic'
-                self.colour = ansi.GREEN
-            elif index == 3:
-                self.name = 'Juventus'
-                self.colour = ansi.WHITE
-            elif index == 4:
-                self.name = 'AC Milan'
-                self.colour = ansi.RED
-            elif index == 5:
-                self.name = 'Inter Milan'
-                self.colour = ansi.BLUE
-            elif index == 6:
-                self.name = 'Roma'
-                self.colour = ansi.RED
-            elif index == 7:
-                self.name = 'Real Madrid'
-                self.colour = ansi.WHITE
-            elif index == 8:
-                self.name = 'Barcelona'
-                self.colour = ansi.BLUE
-            elif index == 9:
-                self.name = 'Bayern Munich'
-                self.colour = ansi.RED
-            elif index == 10:
-                self.name = 'Borussia Dortmund'
-                self.colour = ansi.RED
-            elif index == 11:
-                self.name = 'Hamburg'
-                self.colour = ansi.RED
-            elif index == 12:
-                self.name = 'Ajax'
-                self.colour = ansi.GREEN
-            elif index == 13:
-                self.name = 'PSV Eindhoven'
-                self.colour = ansi.BLUE
-            elif index == 14:
-                self.name = 'Paris SG'
-                self.colour = ansi.BLUE
-            elif index == 15:
-                self.name = 'Monaco'
-                self.colour = ansi.RED
-            elif index == 16:
-                self.name = 'Benfica'
-                self.colour = ansi.RED
-            elif index > 16:
-                self.getTeam(1, index - 16)
-        else:
-            # Don't really expect this.
-            self.name = f'D{division}T{index}'
-            self.colour = ansi.WHITE
-
-
-
-
-
-
-    def dump(self, outputFile):
-        ''' Write the team into the specified file. '''
-        json.dump(self.name, outputFile)
-        outputFile.write('\n')
-        json.dump(self.colour, outputFile)
-        outputFile.write('\n')
-        json.dump(self.energy, outputFile)
-        outputFile.write('\n')
-        json.dump(self.moral, outputFile)
-        outputFile.write('\n')
-        json.dump(self.defence, outputFile)
-        outputFile.write('\n')
-        json.dump(self.midfield, outputFile)
-        outputFile.write('\n')
-        json.dump(self.attack, outputFile)
-        outputFile.write('\n')
-        json.dump(self.position, outputFile)
-        outputFile.write('\n')
-        json.dump(self.pts, outputFile)
-        outputFile.write('\n')
-        json.dump(self.difference, outputFile)
-        outputFile.write('\n')
-        json.dump(self.isPlayedHome, outputFile)
-        outputFile.write('\n')
-        json.dump(self.isPlayedAway, outputFile)
-        outputFile.write('\n')
-        json.dump(self.formation, outputFile)
-        outputFile.write('\n')
-        json.dump(self.fixture, outputFile)
-        outputFile.write('\n')
-        json.dump(self.win, outputFile)
-        outputFile.write('\n')
-        json.dump(self.draw, outputFile)
-        outputFile.write('\n')
-        json.dump(self.lost, outputFile)
-        outputFile.write('\n')
-
-
-
-    def load(self, inputFile):
-        ''' load the team from the specified file. '''
+        ''' This is the replacement for FNGETTEAM(). Populate the object with a prebuilt team from the club catalog. '''
+        club = club_catalog.getClub(division, index)
+        if club is not None:
+            self.name, self.colour = club
+
+
+
+    def getUniqueTeam(self, division, index, existingNames):
+        '''
+        :param int division: The division to take the team from.
+        :param int index: The first index to try in :py:meth:`getTeam`.
+        :param set existingNames: The names that are already used.
+        :returns: The index of the team that was used.
+
+        Populate the object with the first club in the division's pool from index onward that is not already used.
+        The pool has made up clubs after the prebuilt clubs.
+        '''
+        index, self.name, self.colour = club_catalog.getUniqueClub(division, index, existingNames)
+        return index
+
+
+
+    def dump(self, writer):
+        ''' Write the team into the specified :py:class:`SaveWriter`. '''
+        writer.addObject(save_format.TEAM, self)
+
+
+
+    def load(self, reader):
+        ''' Read the team from the specified :py:class:`SaveReader`. '''
+        reader.readObject(save_format.TEAM, self)
+
+
+
+    def loadText(self, inputFile):
+        ''' Read the team from the specified json lines file.  This is the format of the older save files. '''
         line = inputFile.readline()
         self.name = json.loads(line)
         line = inputFile.readline()
@@ -459,9 +231,9 @@ class Team:
 
 
 
-def multiRandomInt(rndRange, rndNumber):
+def multiRandomInt(rndRange, rndNumber, rng=random):
     ''' Replacement for FNRND() (Line 6640) in the BBC Basic version. '''
     numTotal = 0
     for _ in range(rndNumber):
-        numTotal += random.randint(1, rndRange)
+        numTotal += rng.randint(1, rndRange)
     return numTotal
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the TeamTable class for the the BBC Football Manager program.
+The values for many teams are stored in columns rather than in one object per team.
+A :py:class:`Team` object is a view of one row in a table.
+'''
+
+# System libraries.
+import array
+import weakref
+
+# NumPy is optional.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+
+class TeamTable:
+    '''
+    :ivar dict columns: The columns by name.  The numbers are in arrays and the text is in lists.
+    :ivar int numRows: The number of rows (teams) in the table.  This includes the released rows.
+    :ivar list teams: A weak reference to the :py:class:`Team` object for each row or None for a released row.  The teams refer to the table so the table does not keep them alive.
+    :ivar dict names: The row of each team by name.  This is kept up to date when a team is renamed.
+    :ivar list freeRows: The released rows that :py:meth:`addRow` uses again.
+
+    Class to represent the values of many teams in the BBC Football Manager game.
+    '''
+    NUMBER_COLUMNS = ('energy', 'moral', 'defence', 'midfield', 'attack', 'position', 'pts', 'difference', 'fixture', 'win', 'draw', 'lost', 'numHomeGames')
+    FLAG_COLUMNS = ('isPlayedHome', 'isPlayedAway')
+    TEXT_COLUMNS = ('name', 'colour', 'formation')
+
+
+
+    def __init__(self):
+        ''' Class constructor. '''
+        self.columns = {}
+        for name in TeamTable.NUMBER_COLUMNS:
+            self.columns[name] = array.array('q')
+        for name in TeamTable.FLAG_COLUMNS:
+            self.columns[name] = array.array('b')
+        for name in TeamTable.TEXT_COLUMNS:
+            self.columns[name] = []
+        self.numRows = 0
+        self.teams = []
+        self.names = {}
+        self.freeRows = []
+
+
+
+    def addRow(self, team):
+        ''' Add an empty row to the table for the specified :py:class:`Team`.  A released row is used again before the table grows.  Returns the index of the row. '''
+        if len(self.freeRows) > 0:
+            row = self.freeRows.pop()
+            self.teams[row] = weakref.ref(team)
+            return row
+        for name in TeamTable.NUMBER_COLUMNS + TeamTable.FLAG_COLUMNS:
+            self.columns[name].append(0)
+        for name in TeamTable.TEXT_COLUMNS:
+            self.columns[name].append('')
+        self.teams.append(weakref.ref(team))
+        self.numRows += 1
+        return self.numRows - 1
+
+
+
+    def releaseRow(self, row):
+        ''' Empty the specified row so that :py:meth:`addRow` can use it again.  The :py:class:`Team` of the row must not be used afterwards. '''
+        self.setName(row, '')
+        for name in TeamTable.NUMBER_COLUMNS + TeamTable.FLAG_COLUMNS:
+            self.columns[name][row] = 0
+        for name in TeamTable.TEXT_COLUMNS:
+            self.columns[name][row] = ''
+        self.teams[row] = None
+        self.freeRows.append(row)
+
+
+
+    def setName(self, row, name):
+        ''' Rename the team in the specified row and keep the name index up to date. '''
+        names = self.columns['name']
+        if self.names.get(names[row]) == row:
+            del self.names[names[row]]
+        names[row] = name
+        if name != '':
+            self.names[name] = row
+
+
+
+    def getTeam(self, name):
+        ''' Returns the :py:class:`Team` with the specified name or None.  If two teams have the same name this is the last one named. '''
+        row = self.names.get(name)
+        if row is None or self.teams[row] is None:
+            return None
+        return self.teams[row]()
+
+
+
+    def getColumns(self, names, rows):
+        '''
+        :param tuple names: The names of the number columns.
+        :param list rows: The rows to take from each column.
+        :returns: A dictionary of the values by column name.  These are NumPy arrays when NumPy is available.
+        '''
+        if numpy is None:
+            return {name: [self.columns[name][row] for row in rows] for name in names}
+        rows = numpy.asarray(rows, dtype=numpy.intp)
+        return {name: numpy.frombuffer(self.columns[name], dtype=numpy.int64)[rows] for name in names}
+
+
+
+def getColumns(teams, names):
+    '''
+    :param list teams: The :py:class:`Team` objects.
+    :param tuple names: The names of the number columns.
+    :returns: A dictionary of the values by column name in the order of the teams.
+
+    The values are taken straight from the columns when all the teams are in the same table.
+    '''
+    if len(teams) > 0:
+        table = teams[0].table
+        if all(team.table is table for team in teams):
+            return table.getColumns(names, [team.row for team in teams])
+    return {name: [getattr(team, name) for team in teams] for name in names}
+
+
+
+def column(name):
+    ''' Returns a property for a :py:class:`Team` that reads and writes the named column of the team's row. '''
+    def getValue(self):
+        return self.table.columns[name][self.row]
+    def setValue(self, value):
+        self.table.columns[name][self.row] = value
+    return property(getValue, setValue, doc=f'The {name} column of the team.')
+
+
+
+def nameColumn():
+    ''' Returns the property for the name of a :py:class:`Team`.  Setting the name updates the name index of the table. '''
+    def getValue(self):
+        return self.table.columns['name'][self.row]
+    def setValue(self, value):
+        self.table.setName(self.row, value)
+    return property(getValue, setValue, doc='The name of the team.')
+
+
+
+def flagColumn(name):
+    ''' Returns a property for a :py:class:`Team` that reads and writes the named True / False column of the team's row. '''
+    def getValue(self):
+        return self.table.columns[name][self.row] != 0
+    def setValue(self, value):
+        self.table.columns[name][self.row] = 1 if value else 0
+    return property(getValue, setValue, doc=f'The {name} column of the team.')
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the views for the BBC Football Manager program.
+A view has the values that the game wants to show without any formatting.
+The game passes each view to its :py:class:`renderers.Renderer` which formats it for the frontend.
+'''
+
+
+
+class Page:
+    '''
+    :ivar string title: The title of the page or None for a page without a title.
+    :ivar Team team: The optional team that the page is about.  The name of the team goes before the title.
+
+    Class to represent the start of a new page.
+    '''
+
+
+
+    def __init__(self, title, team=None):
+        ''' Class constructor. '''
+        self.title = title
+        self.team = team
+
+
+
+class Message:
+    '''
+    :ivar string text: The message.
+    :ivar Team team: The optional team that the message is about.  The name of the team goes before the text.
+
+    Class to represent a line of text.
+    '''
+
+
+
+    def __init__(self, text, team=None):
+        ''' Class constructor. '''
+        self.text = text
+        self.team = team
+
+
+
+class Banner:
+    '''
+    Class to represent the title of the game.
+    '''
+
+
+
+class Wait:
+    '''
+    :ivar bool isPrompt: True to ask the user to continue.  False to remove the prompt after the user has continued.
+
+    Class to represent the pause until the user is ready to continue.
+    '''
+
+
+
+    def __init__(self, isPrompt=True):
+        ''' Class constructor. '''
+        self.isPrompt = isPrompt
+
+
+
+class TeamList:
+    '''
+    :ivar string title: The title of the list.
+    :ivar list teams: The :py:class:`Team` objects.
+
+    Class to represent a list of teams, for example the promoted teams.
+    '''
+
+
+
+    def __init__(self, title, teams):
+        ''' Class constructor. '''
+        self.title = title
+        self.teams = teams
+
+
+
+class LeagueTable:
+    '''
+    :ivar int division: The division.
+    :ivar list teams: The :py:class:`Team` objects in the order of the table.
+    :ivar int numMatches: The number of matches played.
+    :ivar Team team: The player's team.
+    :ivar int position: The position of the player's team.
+    :ivar bool isDebug: True to show the debug information for each team.
+
+    Class to represent the league table of the player's division.
+    '''
+
+
+
+    def __init__(self, division, teams, numMatches, team, position, isDebug):
+        ''' Class constructor. '''
+        self.division = division
+        self.teams = teams
+        self.numMatches = numMatches
+        self.team = team
+        self.position = position
+        self.isDebug = isDebug
+
+
+
+class Results:
+    '''
+    :ivar Team homeTeam: The home team in the player's match.
+    :ivar Team awayTeam: The away team in the player's match.
+    :ivar int homeScore: The goals of the home team in the player's match.
+    :ivar int awayScore: The goals of the away team in the player's match.
+    :ivar list fixtures: The (home team, away team, home goals, away goals) of the other matches in the division.
+
+    Class to represent the results of the week in the player's division.
+    '''
+
+
+
+    def __init__(self, homeTeam, awayTeam, homeScore, awayScore, fixtures):
+        ''' Class constructor. '''
+        self.homeTeam = homeTeam
+        self.awayTeam = awayTeam
+        self.homeScore = homeScore
+        self.awayScore = awayScore
+        self.fixtures = fixtures
+
+
+
+class FinancialReport:
+    '''
+    :ivar list items: The (title, profit, loss) of each line of the report.
+    :ivar tuple balance: The (title, profit, loss) of the profit or loss for the season so far.
+    :ivar int cash: The money in the bank.
+    :ivar int debt: The money owed to the bank.
+
+    Class to represent the financial report after a week.
+    '''
+
+
+
+    def __init__(self, items, balance, cash, debt):
+        ''' Class constructor. '''
+        self.items = items
+        self.balance = balance
+        self.cash = cash
+        self.debt = debt
+
+
+
+class Injury:
+    '''
+    :ivar Player player: The player in the squad that has been injured or None when there are no injuries.
+
+    Class to represent the injury after a match.
+    '''
+
+
+
+    def __init__(self, player):
+        ''' Class constructor. '''
+        self.player = player
+
+
+
+class Fitness:
+    '''
+    :ivar list rows: The (number, player name, is fit) of each injured player in the squad.
+    :ivar int numInjured: The number of injured players in the squad before the players recovered.
+
+    Class to represent the recovery of the injured players.
+    This finishes the table of the :py:class:`Appearances`.
+    '''
+
+
+
+    def __init__(self, rows, numInjured):
+        ''' Class constructor. '''
+        self.rows = rows
+        self.numInjured = numInjured
+
+
+
+class Appearances:
+    '''
+    :ivar list byCaps: The :py:class:`Player` objects with the most appearances.
+    :ivar list byGoals: The :py:class:`Player` objects with the most goals.
+
+    Class to represent the appearances and goals of the players.
+    The :py:class:`Fitness` of the players follows in the same table.
+    '''
+
+
+
+    def __init__(self, byCaps, byGoals):
+        ''' Class constructor. '''
+        self.byCaps = byCaps
+        self.byGoals = byGoals
+
+
+
+class Squad:
+    '''
+    :ivar list players: The :py:class:`Player` objects in the squad.
+
+    Class to represent the skill and energy of the players in the squad.
+    '''
+
+
+
+    def __init__(self, players):
+        ''' Class constructor. '''
+        self.players = players
+
+
+
+class PickTeam:
+    '''
+    :ivar int numTeam: The number of players picked for the player's team.
+    :ivar int numSquad: The number of players in the squad.
+    :ivar int numInjured: The number of injured players in the squad.
+
+    Class to represent the choice of players after the :py:class:`Squad`.
+    The user adds or drops players until there are no more than 11 in the team.
+    '''
+
+
+
+    def __init__(self, numTeam, numSquad, numInjured):
+        ''' Class constructor. '''
+        self.numTeam = numTeam
+        self.numSquad = numSquad
+        self.numInjured = numInjured
+
+
+
+class SellPlayer:
+    '''
+    Class to represent the choice of a player to sell after the :py:class:`Squad`.
+    '''
+
+
+
+class Offer:
+    '''
+    :ivar Player player: The player to sell.
+    :ivar int price: The money offered for the player.
+
+    Class to represent the offer for a player that the user wants to sell.
+    '''
+
+
+
+    def __init__(self, player, price):
+        ''' Class constructor. '''
+        self.player = player
+        self.price = price
+
+
+
+class CupReport:
+    '''
+    :ivar CupCompetition cup: The cup competition.
+
+    Class to represent the results of the player's team in a cup competition.
+    '''
+
+
+
+    def __init__(self, cup):
+        ''' Class constructor. '''
+        self.cup = cup
+
+
+
+class Match:
+    '''
+    :ivar bool isLeague: True for a league match.  The positions of the teams are shown for a league match.
+    :ivar Team homeTeam: The home team.
+    :ivar Team awayTeam: The away team.
+    :ivar int numTeam: The number of players picked for the player's team.
+    :ivar int numSquad: The number of players in the squad.
+    :ivar int numInjured: The number of injured players in the squad.
+
+    Class to represent the two teams before the player's match.
+    The user can change the team or play the match.
+    '''
+
+
+
+    def __init__(self, isLeague, homeTeam, awayTeam, numTeam, numSquad, numInjured):
+        ''' Class constructor. '''
+        self.isLeague = isLeague
+        self.homeTeam = homeTeam
+        self.awayTeam = awayTeam
+        self.numTeam = numTeam
+        self.numSquad = numSquad
+        self.numInjured = numInjured
+
+
+
+class KickOff:
+    '''
+    Class to represent the kick off of the player's league match.
+    The choices of the :py:class:`Match` are no longer needed.
+    '''
+
+
+
+class MatchClock:
+    '''
+    :ivar Team homeTeam: The home team.
+    :ivar Team awayTeam: The away team.
+    :ivar int homeScore: The goals of the home team so far.
+    :ivar int awayScore: The goals of the away team so far.
+    :ivar int minute: The minute of the match from 0 to 90.
+    :ivar list goals: The (is home team, minute, scorer) of each goal so far.  The scorer is None for the goals of the other team.
+    :ivar bool isHalfTime: True to show half time instead of the minute.
+
+    Class to represent the state of the player's match after each minute.
+    '''
+
+
+
+    def __init__(self, homeTeam, awayTeam, homeScore, awayScore, minute, goals, isHalfTime=False):
+        ''' Class constructor. '''
+        self.homeTeam = homeTeam
+        self.awayTeam = awayTeam
+        self.homeScore = homeScore
+        self.awayScore = awayScore
+        self.minute = minute
+        self.goals = goals
+        self.isHalfTime = isHalfTime
+
+
+
+class FinalScore:
+    '''
+    :ivar Team homeTeam: The home team.
+    :ivar Team awayTeam: The away team.
+    :ivar int homeGoals: The goals of the home team.
+    :ivar int awayGoals: The goals of the away team.
+
+    Class to represent the final score of the player's match.
+    '''
+
+
+
+    def __init__(self, homeTeam, awayTeam, homeGoals, awayGoals):
+        ''' Class constructor. '''
+        self.homeTeam = homeTeam
+        self.awayTeam = awayTeam
+        self.homeGoals = homeGoals
+        self.awayGoals = awayGoals
+
+
+
+class CupMatch:
+    '''
+    :ivar CupCompetition cup: The cup competition.
+    :ivar int division: The division of the opponent.
+
+    Class to represent the start of a page for a cup match.
+    The :py:class:`Match` follows.
+    '''
+
+
+
+    def __init__(self, cup, division):
+        ''' Class constructor. '''
+        self.cup = cup
+        self.division = division
+
+
+
+class CupStatus:
+    '''
+    :ivar list cups: The :py:class:`CupCompetition` objects that the player's team has entered this season.
+
+    Class to represent whether the player's team is still in each cup competition.
+    '''
+
+
+
+    def __init__(self, cups):
+        ''' Class constructor. '''
+        self.cups = cups
+
+
+
+class Titles:
+    '''
+    :ivar int titles: The bit flags of the titles held by the player's team.
+
+    Class to represent the titles held by the player's team.
+    '''
+
+
+
+    def __init__(self, titles):
+        ''' Class constructor. '''
+        self.titles = titles
+
+
+
+class Market:
+    '''
+    :ivar Player player: The player for sale or None when the squad is full.
+    :ivar int price: The value of a skill point.
+    :ivar int money: The money that the user has.
+
+    Class to represent the player for sale in the market.
+    '''
+
+
+
+    def __init__(self, player, price, money):
+        ''' Class constructor. '''
+        self.player = player
+        self.price = price
+        self.money = money
+
+
+
+class Bid:
+    '''
+    :ivar Player player: The player for sale.
+    :ivar int bid: The bid of the user.
+    :ivar bool isEnoughMoney: True when the user has the money for the bid.
+    :ivar bool isAccepted: True when the player has been added to the squad.
+
+    Class to represent the result of a bid in the market.
+    '''
+
+
+
+    def __init__(self, player, bid, isEnoughMoney, isAccepted):
+        ''' Class constructor. '''
+        self.player = player
+        self.bid = bid
+        self.isEnoughMoney = isEnoughMoney
+        self.isAccepted = isAccepted
+
+
+
+class Balance:
+    '''
+    :ivar int money: The money that the user has.
+    :ivar int debt: The money owed to the bank.  A negative debt is money in the bank.
+
+    Class to represent the money in the bank.
+    '''
+
+
+
+    def __init__(self, money, debt):
+        ''' Class constructor. '''
+        self.money = money
+        self.debt = debt
+
+
+
+class Transaction:
+    '''
+    Class to represent the choice to deposit money in the bank or withdraw money from the bank.
+    '''
+
+
+
+class Progress:
+    '''
+    :ivar tuple home: The (wins, draws, loses, for, against) of the home matches.
+    :ivar tuple away: The (wins, draws, loses, for, against) of the away matches.
+    :ivar int pts: The points of the player's team.
+    :ivar list weeks: The result and the position of the player's team after each week.  See :py:meth:`Game.playWeek`.
+    :ivar LeagueConfig league: The size of the league.
+
+    Class to represent the progress of the player's team this season.
+    '''
+
+
+
+    def __init__(self, home, away, pts, weeks, league):
+        ''' Class constructor. '''
+        self.home = home
+        self.away = away
+        self.pts = pts
+        self.weeks = weeks
+        self.league = league
+
+
+
+class History:
+    '''
+    :ivar list seasons: The :py:class:`SeasonHistory` objects with the most recent season first.
+
+    Class to represent the seasons of the career that have finished.
+    '''
+
+
+
+    def __init__(self, seasons):
+        ''' Class constructor. '''
+        self.seasons = seasons
+
+
+
+class Projection:
+    '''
+    :ivar ProjectionResult result: The result of the projection.
+    :ivar string teamName: The name of the player's team.
+    :ivar bool isPromotion: True when teams are promoted from the division.
+    :ivar bool isRelegation: True when teams are relegated from the division.
+
+    Class to represent the chance of each team winning the division, promotion and relegation.
+    '''
+
+
+
+    def __init__(self, result, teamName, isPromotion, isRelegation):
+        ''' Class constructor. '''
+        self.result = result
+        self.teamName = teamName
+        self.isPromotion = isPromotion
+        self.isRelegation = isRelegation
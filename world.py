@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the World class for the the BBC Football Manager program.
+The world holds all four divisions.
+The divisions that the player's team is not in are played in the background each week.
+'''
+
+# System libraries.
+import json
+
+# Application Libraries.
+from team import Team
+from fixtures import FixtureSchedule
+from league_table import LeagueTable
+import club_catalog
+import player_catalog
+import save_format
+
+
+
+class Division:
+    '''
+    :ivar int number: The number of the division.  1 is the top division.
+    :ivar list teams: The teams in the division in table order.
+    :ivar FixtureSchedule fixtures: The fixtures for the season.
+    :ivar LeagueTable leagueTable: The league table for the division.
+    :ivar dict squads: The squads that have been made up this season by club name.
+
+    Class to represent a division that the player's team is not in.
+    '''
+
+
+
+    def __init__(self, number, teams):
+        ''' Class constructor. '''
+        self.number = number
+        self.teams = teams
+        self.fixtures = FixtureSchedule()
+        self.leagueTable = LeagueTable()
+        self.leagueTable.rebuild(self.teams)
+        self.squads = {}
+
+
+
+    def getSquad(self, team, rng, season):
+        '''
+        :param Team team: A club in this division.
+        :param RandomStreams rng: The random streams of the game.
+        :param int season: The season of the squad.
+        :returns: The list of :py:class:`Player` objects in the club's squad.
+
+        The squad is made up from a random stream for the club and the season.
+        So it is the same every time it is made up and it does not need to be saved.
+        Only the squads that are asked for are kept.
+        '''
+        squad = self.squads.get(team.name)
+        if squad is None:
+            squad = player_catalog.generateSquad(self.number, rng.getStream('squad', season, team.name))
+            self.squads[team.name] = squad
+        return squad
+
+
+
+class World:
+    '''
+    :ivar Game game: The game that the world belongs to.
+    :ivar dict divisions: The :py:class:`Division` objects by number.  The player's division is not included, those teams are in game.teams.
+    :ivar Division playerDivision: Holds the squads of the other clubs in the player's division.  None until a squad is asked for.
+
+    Class to represent all the divisions in the BBC Football Manager game.
+    The size of the divisions is from the game's :py:class:`LeagueConfig`.
+    '''
+    NUM_DIVISIONS = 4
+
+
+
+    def __init__(self, game):
+        ''' Class constructor. '''
+        self.game = game
+        self.divisions = {}
+        self.playerDivision = None
+
+
+
+    def newGame(self):
+        '''
+        Put the clubs from :py:func:`Team.getTeam` into the divisions.
+        The player's team starts in division 4.  The club with the same name is left out, otherwise the last club is left out.
+        The names are decided first so that only the clubs that are kept get a row in the game's team table.
+        '''
+        numTeams = self.game.league.numTeams
+        existingNames = {self.game.teamName}
+        names = []
+        for division in range(1, World.NUM_DIVISIONS + 1):
+            index = 1
+            for _ in range(numTeams):
+                index, name, colour = club_catalog.getUniqueClub(division, index, existingNames)
+                index += 1
+                existingNames.add(name)
+                names.append((name, colour))
+        clubs = []
+        for name, colour in names[:World.NUM_DIVISIONS * numTeams - 1]:
+            team = Team(self.game.teamTable)
+            team.name = name
+            team.colour = colour
+            clubs.append(team)
+
+        player = Team(self.game.teamTable)
+        player.name = self.game.teamName
+        player.colour = self.game.teamColour
+        player.zero()
+
+        self.divisions = {}
+        for division in range(1, World.NUM_DIVISIONS + 1):
+            teams = clubs[(division - 1) * numTeams:division * numTeams]
+            for team in teams:
+                team.initialise(division, self.game.rng.team)
+            if division == self.game.division:
+                self.game.teams = [player] + teams
+            else:
+                self.divisions[division] = Division(division, teams)
+
+
+
+    def newSeason(self):
+        ''' Decide the fixtures for the other divisions. '''
+        self.playerDivision = None
+        for division in self.divisions.values():
+            division.squads = {}
+            division.leagueTable.rebuild(division.teams)
+            division.fixtures.create([team.name for team in division.teams], None, self.game.rng.getStream('fixtures', self.game.season, division.number), self.game.league.matchesPerSeason)
+
+
+
+    def playWeek(self):
+        ''' Play this week's fixtures in the other divisions. '''
+        week = self.game.numMatches
+        numTeams = self.game.league.numTeams
+        for division in self.divisions.values():
+            table = division.leagueTable
+            teamTable = self.game.teamTable
+            fixtures = [(teamTable.getTeam(home), teamTable.getTeam(away)) for home, away in division.fixtures.getRound(week)]
+
+            # Each division has its own fixture numbers so each fixture has its own random numbers.
+            results = self.game.matchBatch(fixtures, 0.5, 0, numTeams * division.number + 1)
+            for (home, away), (homeGoals, awayGoals) in zip(fixtures, results):
+                self.game.applyPoints(home, away, homeGoals, awayGoals, table)
+            table.update()
+
+
+
+    def endSeason(self, oldDivision):
+        '''
+        :param int oldDivision: The division that the player's team has just played in.
+
+        Promote and relegate the teams in every division.
+        The top teams go up a division and the bottom teams go down a division.
+        The number promoted must be the same as the number relegated so the divisions keep their size.
+        game.division must already be the player's division for next season.
+        '''
+        league = self.game.league
+        tables = {number: division.teams for number, division in self.divisions.items()}
+        tables[oldDivision] = self.game.teams
+        newTeams = {number: [] for number in range(1, World.NUM_DIVISIONS + 1)}
+        for number in range(1, World.NUM_DIVISIONS + 1):
+            for index, team in enumerate(tables[number]):
+                if number != 1 and index < league.numPromoted:
+                    newTeams[number - 1].append(team)
+                elif number != World.NUM_DIVISIONS and index >= league.getFirstRelegated():
+                    newTeams[number + 1].append(team)
+                else:
+                    newTeams[number].append(team)
+
+        self.divisions = {}
+        for number, teams in newTeams.items():
+            for team in teams:
+                if team.name == self.game.teamName:
+                    team.zero()
+                else:
+                    team.initialise(number, self.game.rng.team)
+            if number == self.game.division:
+                self.game.teams = teams
+            else:
+                self.divisions[number] = Division(number, teams)
+
+
+
+    def getDivision(self, team):
+        ''' Returns the :py:class:`Division` that the team is in.  The player's division is returned when the team is not in another division. '''
+        for division in self.divisions.values():
+            if division.leagueTable.getIndex(team.name) is not None:
+                return division
+        if self.playerDivision is None or self.playerDivision.number != self.game.division:
+            self.playerDivision = Division(self.game.division, [])
+        return self.playerDivision
+
+
+
+    def getSquad(self, team):
+        '''
+        :param Team team: A club that the player does not manage.
+        :returns: The list of :py:class:`Player` objects in the club's squad.
+
+        The squad is the same for the whole season and it is made up again for the next season.
+        The match results do not use the squads yet.
+        '''
+        return self.getDivision(team).getSquad(team, self.game.rng, self.game.season)
+
+
+
+    def dump(self, writer):
+        ''' Write the other divisions into the specified :py:class:`SaveWriter`. '''
+        for number in sorted(self.divisions):
+            division = self.divisions[number]
+            writer.add(save_format.DIVISION, number)
+            for team in division.teams:
+                team.dump(writer)
+            division.fixtures.dump(writer)
+
+
+
+    def load(self, reader):
+        ''' Load the other divisions from the specified :py:class:`SaveReader`. '''
+        self.divisions = {}
+        while reader.isNext(save_format.DIVISION):
+            number, = reader.read(save_format.DIVISION)
+            teams = []
+            while reader.isNext(save_format.TEAM):
+                team = Team(self.game.teamTable)
+                team.load(reader)
+                teams.append(team)
+            division = Division(number, teams)
+            division.fixtures.load(reader)
+            self.divisions[number] = division
+
+
+
+    def loadText(self, inputFile):
+        ''' Load the other divisions from the specified json lines file.  This is the format of the older save files. '''
+        line = inputFile.readline()
+        self.divisions = {}
+        for number in json.loads(line):
+            teams = []
+            for index in range(self.game.league.numTeams):
+                team = Team(self.game.teamTable)
+                team.loadText(inputFile)
+                teams.append(team)
+            division = Division(number, teams)
+            division.fixtures.loadText(inputFile)
+            self.divisions[number] = division